@@ -1,5 +1,7 @@
+import threading
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from types import SimpleNamespace
 import streamlit as st
 import pandas as pd
 
@@ -12,7 +14,11 @@ from controllers import (
     OverDraftController,
     EmployeeController,
     ReportController,
+    OverviewController,
+    InterestController,
 )
+from infra.db import warm_up_pool
+from infra.migrations import verify_schema
 
 
 st.set_page_config(page_title="Portsaid International Bank", page_icon="assets/PIB.jpg", layout="wide")
@@ -40,20 +46,148 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-auth_controller = AuthController()
-account_controller = AccountController()
-transaction_controller = TransactionController()
-transfer_controller = TransferController()
-loan_controller = LoanController()
-overdraft_controller = OverDraftController()
-employee_controller = EmployeeController()
-report_controller = ReportController()
+HISTORY_PAGE_SIZE = 50
+VIEW_CACHE_TTL_SECONDS = 60
+
+
+@st.cache_resource
+def get_controllers() -> SimpleNamespace:
+    """
+    Build the controllers (and their DAOs) once per process instead of on every script rerun.
+    """
+    verify_schema()
+    built = SimpleNamespace(
+        auth=AuthController(),
+        account=AccountController(),
+        transaction=TransactionController(),
+        transfer=TransferController(),
+        loan=LoanController(),
+        overdraft=OverDraftController(),
+        employee=EmployeeController(),
+        report=ReportController(),
+        overview=OverviewController(),
+        interest=InterestController(),
+    )
+    warm_up_pool()  # POOL_MIN_IDLE connections opened now, not by the first users
+    built.overdraft.flush_buffered()  # writes any overdraft events a crashed process left in the spill files
+    return built
+
+
+try:
+    controllers = get_controllers()
+except RuntimeError as exc:
+    st.error(f"Database schema check failed: {exc}")
+    st.stop()
+
+auth_controller = controllers.auth
+account_controller = controllers.account
+transaction_controller = controllers.transaction
+transfer_controller = controllers.transfer
+loan_controller = controllers.loan
+overdraft_controller = controllers.overdraft
+employee_controller = controllers.employee
+report_controller = controllers.report
+overview_controller = controllers.overview
+interest_controller = controllers.interest
+
+
+class DataVersions:
+    """
+    Process-wide version counters for cached view data. Cached queries take the current version of
+    what they read as an argument, so a write bumps a version and only the affected entries go stale.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict = {}
+
+    def get(self, key) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def bump(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+
+@st.cache_resource
+def data_versions() -> DataVersions:
+    return DataVersions()
+
+
+def bust_data(*keys):
+    data_versions().bump(*keys)
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_history_page(account_number, start_date, end_date, transaction_type, page_size, after, version):
+    return transaction_controller.history_page_columns(
+        account_number=account_number,
+        start_date=start_date,
+        end_date=end_date,
+        transaction_type=transaction_type,
+        page_size=page_size,
+        after=after,
+    )
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_loans(account_number, version):
+    return loan_controller.with_projections(loan_controller.list_loans_columns(account_number))
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_loan_schedule(loan_id, version):
+    return loan_controller.schedule(loan_id)
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_all_loans(version):
+    return employee_controller.list_all_loans_columns()
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_overdraft_events(account_number, version):
+    return overdraft_controller.list_events_columns(account_number)
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_overview(account_numbers, version):
+    # Loans and overdraft events for every account, fetched concurrently.
+    return overview_controller.load(list(account_numbers))
+
+
+@st.cache_data(ttl=VIEW_CACHE_TTL_SECONDS)
+def cached_account_summary(account_number, version):
+    return report_controller.account_summary(account_number)
 
 
 def format_currency(amount: Decimal, currency: str = "USD") -> str:
     return f"{currency} {amount:,.2f}"
 
 
+def column_frame(columns: dict[str, list], spec: dict[str, tuple[str, str]]) -> pd.DataFrame:
+    """
+    Build a display table from DAO column arrays, formatting whole columns at once.
+    `spec` maps each label to (source column, kind), kind being money, date, datetime, text or raw.
+    """
+    source = pd.DataFrame(columns)
+    table = {}
+    for label, (name, kind) in spec.items():
+        values = source[name]
+        if kind == "money":
+            values = values.astype(float)
+        elif kind == "date":
+            values = pd.to_datetime(values).dt.strftime("%Y-%m-%d").fillna("")
+        elif kind == "datetime":
+            values = pd.to_datetime(values).dt.strftime("%Y-%m-%d %H:%M").fillna("")
+        elif kind == "text":
+            values = values.fillna("")
+        table[label] = values
+    return pd.DataFrame(table)
+
+
 def require_session():
     if "session" not in st.session_state:
         st.stop()
@@ -93,6 +227,12 @@ def account_overview():
     if not session.accounts:
         st.info("No accounts found.")
         return
+    numbers = tuple(a.account_number for a in session.accounts)
+    versions = data_versions()
+    overview = cached_overview(
+        numbers,
+        (versions.get("loans"), versions.get("overdrafts"), *(versions.get(("account", n)) for n in numbers)),
+    )
     data = [
         {
             "Account": a.account_number,
@@ -101,6 +241,8 @@ def account_overview():
             "Currency": a.currency,
             "Status": a.status,
             "Opened": a.date_opened.strftime("%Y-%m-%d"),
+            "Loans": len(overview[a.account_number]["loans"]["loan_id"]),
+            "Overdraft Events": len(overview[a.account_number]["overdraft_events"]["event_id"]),
         }
         for a in session.accounts
     ]
@@ -123,32 +265,53 @@ def transaction_history():
         if st.checkbox("Filter by end date", key="end-filter"):
             end = st.date_input("End date")
     with col3:
-        txn_type = st.selectbox("Type", ["All", "DEPOSIT", "WITHDRAWAL", "TRANSFER_IN", "TRANSFER_OUT"])
+        txn_type = st.selectbox("Type", ["All", "DEPOSIT", "WITHDRAWAL", "TRANSFER_IN", "TRANSFER_OUT", "INTEREST"])
 
     start_dt = datetime.combine(start, datetime.min.time()) if start else None
     end_dt = datetime.combine(end, datetime.max.time()) if end else None
-    txns = transaction_controller.history(
-        account_number=account_number,
-        start_date=start_dt,
-        end_date=end_dt,
-        transaction_type=txn_type if txn_type != "All" else None,
+    # Keyset paging: keep the cursor that starts each visited page; reset when the filter changes.
+    filter_key = (account_number, start_dt, end_dt, txn_type)
+    if st.session_state.get("history_filter") != filter_key:
+        st.session_state["history_filter"] = filter_key
+        st.session_state["history_cursors"] = [None]
+    cursors = st.session_state["history_cursors"]
+    txns, next_cursor = cached_history_page(
+        account_number,
+        start_dt,
+        end_dt,
+        txn_type if txn_type != "All" else None,
+        HISTORY_PAGE_SIZE,
+        cursors[-1],
+        data_versions().get(("account", account_number)),
     )
-    if not txns:
+    if not txns["transaction_id"]:
         st.info("No transactions found for this filter.")
         return
-    rows = [
-        {
-            "ID": t.transaction_id,
-            "When": t.timestamp.strftime("%Y-%m-%d %H:%M"),
-            "Type": t.transaction_type,
-            "Amount": float(t.amount),
-            "Balance After": float(t.balance_after),
-            "Note": t.note or "",
-            "Ref": t.reference_code or "",
-        }
-        for t in txns
-    ]
-    st.dataframe(pd.DataFrame(rows))
+    st.dataframe(
+        column_frame(
+            txns,
+            {
+                "ID": ("transaction_id", "raw"),
+                "When": ("timestamp", "datetime"),
+                "Type": ("transaction_type", "raw"),
+                "Amount": ("amount", "money"),
+                "Balance After": ("balance_after", "money"),
+                "Note": ("note", "text"),
+                "Ref": ("reference_code", "text"),
+            },
+        )
+    )
+    col_prev, col_page, col_next = st.columns(3)
+    with col_prev:
+        if st.button("Previous page", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(cursors)}")
+    with col_next:
+        if st.button("Next page", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
 
 
 def cash_movement():
@@ -176,6 +339,8 @@ def cash_movement():
             st.error(str(exc))
         except Exception as exc:  # noqa: BLE001
             st.error(f"Operation failed: {exc}")
+        finally:
+            bust_data(("account", account_number))
 
 
 def transfer_view():
@@ -198,6 +363,8 @@ def transfer_view():
             st.error(str(exc))
         except Exception as exc:  # noqa: BLE001
             st.error(f"Transfer failed: {exc}")
+        finally:
+            bust_data(("account", from_acct), ("account", to_acct))
 
 
 def loan_view():
@@ -205,22 +372,46 @@ def loan_view():
     session = st.session_state["session"]
     st.subheader("Loans")
     account_number = st.selectbox("Account", [a.account_number for a in session.accounts])
-    loans = loan_controller.list_loans(account_number)
-    if loans:
-        data = [
-            {
-                "Loan ID": l.loan_id,
-                "Principal": float(l.principal),
-                "Remaining": float(l.balance_remaining),
-                "Rate": float(l.rate),
-                "Term (months)": l.term_months,
-                "Status": l.status,
-                "Start": l.start_date.strftime("%Y-%m-%d"),
-                "Next Due": l.next_due_date.strftime("%Y-%m-%d") if l.next_due_date else "",
-            }
-            for l in loans
-        ]
-        st.table(pd.DataFrame(data))
+    loans = cached_loans(account_number, data_versions().get("loans"))
+    if loans["loan_id"]:
+        st.table(
+            column_frame(
+                loans,
+                {
+                    "Loan ID": ("loan_id", "raw"),
+                    "Principal": ("principal", "money"),
+                    "Remaining": ("balance_remaining", "money"),
+                    "Rate": ("rate", "money"),
+                    "Term (months)": ("term_months", "raw"),
+                    "Status": ("status", "raw"),
+                    "Start": ("start_date", "date"),
+                    "Next Due": ("next_due_date", "date"),
+                    "Installment": ("installment", "money"),
+                    "Payoff": ("payoff_date", "date"),
+                    "Interest Left": ("interest_remaining", "money"),
+                },
+            )
+        )
+        with st.expander("Repayment schedule"):
+            loan_id = st.selectbox("Loan", loans["loan_id"])
+            try:
+                schedule = cached_loan_schedule(loan_id, data_versions().get("loans"))
+            except ValueError as exc:
+                st.info(str(exc))
+            else:
+                st.dataframe(
+                    column_frame(
+                        schedule,
+                        {
+                            "Period": ("period", "raw"),
+                            "Due": ("due_date", "date"),
+                            "Payment": ("payment", "money"),
+                            "Interest": ("interest", "money"),
+                            "Principal": ("principal", "money"),
+                            "Balance": ("balance", "money"),
+                        },
+                    )
+                )
     else:
         st.info("No loans for this account.")
 
@@ -234,6 +425,7 @@ def loan_view():
             principal = Decimal(principal_str)
             rate = Decimal(rate_str)
             loan_controller.request_loan(account_number, principal=principal, rate=rate, term_months=int(term))
+            bust_data("loans")
             st.success("Loan request submitted.")
         except (InvalidOperation, ValueError) as exc:
             st.error(str(exc))
@@ -249,20 +441,22 @@ def overdraft_view():
         st.info("No accounts.")
         return
     account_number = st.selectbox("Account", accounts)
-    events = overdraft_controller.list_events(account_number)
-    if not events:
+    versions = data_versions()
+    events = cached_overdraft_events(account_number, (versions.get(("account", account_number)), versions.get("overdrafts")))
+    if not events["event_id"]:
         st.info("No overdraft events for this account.")
         return
-    data = [
-        {
-            "When": e.occurred_at.strftime("%Y-%m-%d %H:%M"),
-            "Amount": float(e.amount),
-            "Balance": float(e.balance_after),
-            "Note": e.note or "",
-        }
-        for e in events
-    ]
-    st.table(pd.DataFrame(data))
+    st.table(
+        column_frame(
+            events,
+            {
+                "When": ("occurred_at", "datetime"),
+                "Amount": ("amount", "money"),
+                "Balance": ("balance_after", "money"),
+                "Note": ("note", "text"),
+            },
+        )
+    )
 
 
 def employee_create_customer_view():
@@ -311,36 +505,44 @@ def employee_cash_ops_view():
             st.error(str(exc))
         except Exception as exc:  # noqa: BLE001
             st.error(f"Operation failed: {exc}")
+        finally:
+            bust_data(("account", account_number))
 
 
 def employee_review_loans_view():
     st.subheader("Review Loans")
-    loans = employee_controller.list_all_loans()
-    if not loans:
+    loans = cached_all_loans(data_versions().get("loans"))
+    if not loans["loan_id"]:
         st.info("No loans found.")
         return
-    df = pd.DataFrame(
-        [
+    if st.button("Run amortization"):
+        stats = loan_controller.run_amortization()
+        bust_data("loans")
+        st.success(f"Amortized {stats['loans']} approved loans in {stats['seconds']}s ({stats['loans_per_sec']} loans/s).")
+        if stats["skipped"]:
+            st.warning(f"Skipped loans without a term: {', '.join(map(str, stats['skipped']))}")
+    st.dataframe(
+        column_frame(
+            loans,
             {
-                "Loan ID": l.loan_id,
-                "Account": l.account_number,
-                "Principal": float(l.principal),
-                "Remaining": float(l.balance_remaining),
-                "Rate": float(l.rate),
-                "Term": l.term_months,
-                "Status": l.status,
-                "Start": l.start_date.strftime("%Y-%m-%d"),
-            }
-            for l in loans
-        ]
+                "Loan ID": ("loan_id", "raw"),
+                "Account": ("account_number", "raw"),
+                "Principal": ("principal", "money"),
+                "Remaining": ("balance_remaining", "money"),
+                "Rate": ("rate", "money"),
+                "Term": ("term_months", "raw"),
+                "Status": ("status", "raw"),
+                "Start": ("start_date", "date"),
+            },
+        )
     )
-    st.dataframe(df)
     st.markdown("Update loan status")
     loan_id = st.text_input("Loan ID to update")
     new_status = st.selectbox("Status", ["PENDING", "APPROVED", "REJECTED", "CLOSED"])
     if st.button("Update Loan Status"):
         try:
             employee_controller.update_loan_status(int(loan_id), new_status)
+            bust_data("loans")
             st.success("Loan status updated.")
         except ValueError as exc:
             st.error(str(exc))
@@ -355,6 +557,7 @@ def employee_update_account_status_view():
     if st.button("Apply Status Update"):
         try:
             employee_controller.update_account_status(account_number, new_status)
+            bust_data(("account", account_number))
             st.success("Account status updated.")
         except Exception as exc:  # noqa: BLE001
             st.error(f"Failed to update account: {exc}")
@@ -367,7 +570,8 @@ def employee_reports_view():
         if not account_number:
             st.error("Enter an account number")
             return
-        summary = report_controller.account_summary(account_number)
+        versions = data_versions()
+        summary = cached_account_summary(account_number, (versions.get(("account", account_number)), versions.get("overdrafts")))
         if not summary:
             st.info("No data for that account.")
             return
@@ -380,10 +584,110 @@ def employee_reports_view():
                         "Total In": float(summary["total_in"] or 0),
                         "Total Out": float(summary["total_out"] or 0),
                         "Overdraft Events": int(summary["overdraft_events"] or 0),
+                        "Last Activity": summary["last_activity"].strftime("%Y-%m-%d %H:%M") if summary["last_activity"] else "",
+                    }
+                ]
+            )
+        )
+
+    st.subheader("Portfolio Reports")
+    report = st.selectbox(
+        "Report",
+        ["Overdraft counts per customer", "Accounts above average balance", "Loans above approved average", "Customer transaction history"],
+    )
+    # Served from ReportController's cache, which re-reads only what changed since its data watermark.
+    if report == "Overdraft counts per customer":
+        rows = report_controller.overdraft_counts()
+        spec = {"Customer ID": ("customer_id", "raw"), "Customer": ("name", "text"), "Overdraft Events": ("overdraft_events", "raw")}
+    elif report == "Accounts above average balance":
+        rows = report_controller.accounts_above_average()
+        spec = {"Account": ("account_number", "raw"), "Balance": ("balance", "money")}
+    elif report == "Loans above approved average":
+        rows = report_controller.loans_above_approved_average()
+        spec = {
+            "Loan ID": ("loan_id", "raw"),
+            "Account": ("account_number", "raw"),
+            "Customer": ("customer_name", "text"),
+            "Status": ("status", "raw"),
+            "Remaining": ("balance_remaining", "money"),
+        }
+    else:
+        customer_id = st.number_input("Customer ID", min_value=1, step=1)
+        rows = report_controller.customer_history(int(customer_id))
+        spec = {
+            "Transaction ID": ("transaction_id", "raw"),
+            "Date": ("timestamp", "datetime"),
+            "Type": ("transaction_type", "raw"),
+            "Amount": ("amount", "money"),
+            "Account": ("account_number", "raw"),
+            "Customer": ("customer_name", "text"),
+        }
+    if not rows:
+        st.info("No rows.")
+        return
+    st.dataframe(column_frame({name: [r[name] for r in rows] for name, _ in spec.values()}, spec))
+
+
+def employee_interest_view():
+    st.subheader("Savings Interest")
+    period = st.text_input("Period (YYYY-MM)", value=datetime.utcnow().strftime("%Y-%m"))
+    status = interest_controller.run_status(period)
+    if status:
+        state = "completed" if status["completed_at"] else f"in progress (after {status['last_account_number'] or 'start'})"
+        st.caption(f"{period}: {status['accounts_posted']} accounts credited, {format_currency(status['interest_total'])} at {status['rate']}%; {state}")
+    if st.button("Post monthly interest"):
+        try:
+            stats = interest_controller.accrue(period)
+            st.cache_data.clear()  # balances, histories and summaries of every savings account changed
+            st.success(
+                f"Credited {stats['accounts_posted']} accounts ({format_currency(stats['interest_posted'])}) "
+                f"in {stats['chunks']} chunks, {stats['accounts_per_sec']} accounts/s."
+            )
+        except ValueError as exc:
+            st.error(str(exc))
+        except Exception as exc:  # noqa: BLE001
+            st.error(f"Interest run failed: {exc}")
+
+
+def employee_db_metrics_view():
+    st.subheader("Database Metrics")
+    snapshot = report_controller.db_metrics()
+    pool = snapshot["pool"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Connections in use", pool.get("in_use", 0))
+    col2.metric("Idle connections", pool.get("idle", 0))
+    col3.metric("Pool timeouts", pool["timeouts"])
+    col4.metric("Mean checkout wait (ms)", pool["checkout_wait"]["mean_ms"] or 0)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Min idle", pool["min_idle"])
+    col2.metric("Opened by warm-up / top-up", pool["warmed"] + pool["topped_up"])
+    col3.metric("Evicted idle", pool["evicted"])
+    col4.metric("Warm-up (ms)", round((pool["warm_up_seconds"] or 0) * 1000, 1))
+    buffer = snapshot["overdraft_buffer"]
+    if buffer:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Overdraft events pending", buffer["pending"])
+        col2.metric("Overdraft events flushed", buffer["flushed"])
+        col3.metric("Buffer flush failures", buffer["failures"])
+        col4.metric("Mean flush (ms)", buffer["flush_seconds"]["mean_ms"] or 0)
+    statements = snapshot["statements"]
+    if statements:
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Statement": tag,
+                        "Calls": h["count"],
+                        "Mean (ms)": h["mean_ms"],
+                        "Slow": snapshot["slow_queries"].get(tag, 0),
                     }
+                    for tag, h in statements.items()
                 ]
             )
         )
+    with st.expander("JSON snapshot"):
+        st.json(snapshot)
+    st.download_button("Download Prometheus metrics", report_controller.db_metrics_prometheus(), file_name="metrics.prom")
 
 
 def employee_delete_ops_view():
@@ -394,6 +698,7 @@ def employee_delete_ops_view():
         if st.button("Delete Pending Loan"):
             try:
                 employee_controller.delete_pending_loan(int(loan_id))
+                bust_data("loans")
                 st.success("Pending loan deleted (if status was PENDING).")
             except ValueError:
                 st.error("Enter a valid loan ID.")
@@ -402,9 +707,17 @@ def employee_delete_ops_view():
     with col2:
         days = st.number_input("Delete overdraft events older than (days)", min_value=1, value=30)
         if st.button("Delete Old Overdraft Events"):
+            bar = st.progress(0.0, text="Archiving and deleting...")
+
+            def report(stats):
+                done = min(stats["deleted"] / stats["total"], 1.0) if stats["total"] else 1.0
+                bar.progress(done, text=f"{stats['deleted']} of ~{stats['total']} deleted ({stats['archived']} archived)")
+
             try:
-                employee_controller.delete_overdraft_events(int(days))
-                st.success("Old overdraft events deleted.")
+                stats = employee_controller.delete_overdraft_events(int(days), progress=report)
+                bar.progress(1.0, text="Done")
+                bust_data("overdrafts")
+                st.success(f"Deleted {stats['deleted']} old overdraft events; archived to {len(stats['files'])} file(s).")
             except Exception as exc:  # noqa: BLE001
                 st.error(f"Failed to delete overdraft events: {exc}")
 
@@ -430,7 +743,7 @@ def main():
         else:
             page = st.sidebar.radio(
                 "Go to",
-                ["Create Customer", "Cash Ops", "Review Loans", "Update Account Status", "Reports", "Delete Ops"],
+                ["Create Customer", "Cash Ops", "Review Loans", "Update Account Status", "Reports", "Interest", "Delete Ops", "DB Metrics"],
             )
 
         if st.sidebar.button("Logout"):
@@ -461,8 +774,12 @@ def main():
                 employee_update_account_status_view()
             elif page == "Reports":
                 employee_reports_view()
+            elif page == "Interest":
+                employee_interest_view()
             elif page == "Delete Ops":
                 employee_delete_ops_view()
+            elif page == "DB Metrics":
+                employee_db_metrics_view()
     else:
         login_view()
 
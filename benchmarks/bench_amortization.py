@@ -0,0 +1,111 @@
+"""
+Vectorized amortization engine (controllers/amortization.py): throughput over a synthetic book
+and agreement with the Decimal reference, plus an end-to-end run on the benchmark database.
+
+    python -m benchmarks.bench_amortization --loans 1000000 --check 500 --db-loans 100000
+
+--check schedules that many random loans both ways and fails on any cent of difference.
+--db-loans seeds that many APPROVED loans and times LoanController.run_amortization (read,
+compute, bulk write back); 0 skips it.
+"""
+import argparse
+import time
+from datetime import datetime
+from decimal import Decimal
+import numpy as np
+from sqlalchemy import text
+
+from benchmarks.database import add_arguments, configure, seed
+from controllers import amortization
+from infra.db import get_engine
+
+
+TERMS = np.array([6, 12, 18, 24, 36, 60, 120, 240, 360])
+
+
+def _book(count: int, seed: int = 7) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {
+        "principal_cents": rng.integers(50_000, 50_000_000, count),
+        "rate_bp": rng.integers(0, 2500, count),
+        "term_months": rng.choice(TERMS, count),
+        "start": np.datetime64("2015-01-01T09:00", "us") + rng.integers(0, 10 * 365 * 24 * 60, count).astype("timedelta64[m]"),
+    }
+
+
+def _check(book: dict[str, np.ndarray], amortized: dict[str, np.ndarray], sample: int):
+    rng = np.random.default_rng(11)
+    picked = rng.choice(len(book["principal_cents"]), min(sample, len(book["principal_cents"])), replace=False)
+    schedules = amortization.schedule(book["principal_cents"][picked], book["rate_bp"][picked], book["term_months"][picked])
+    for row, i in enumerate(picked):
+        reference = amortization.reference_schedule(
+            Decimal(int(book["principal_cents"][i])).scaleb(-2), Decimal(int(book["rate_bp"][i])).scaleb(-2), int(book["term_months"][i])
+        )
+        for period, expected in enumerate(reference):
+            for name in ("payment", "interest", "principal", "balance"):
+                if int(expected[name] * 100) != schedules[name][row, period]:
+                    raise SystemExit(f"loan {i} period {period + 1} {name}: {expected[name]} != {schedules[name][row, period] / 100}")
+        paid = int(amortized["payments_made"][i])
+        expected_balance = reference[paid - 1]["balance"] if paid else Decimal(int(book["principal_cents"][i])).scaleb(-2)
+        if int(expected_balance * 100) != amortized["balance"][i]:
+            raise SystemExit(f"loan {i}: balance after {paid} payments {expected_balance} != {amortized['balance'][i] / 100}")
+    print(f"reference check: {len(picked)} schedules match the Decimal implementation to the cent")
+
+
+def _run_db(count: int, as_of: datetime, args: argparse.Namespace):
+    from controllers import LoanController
+
+    configure(args.sqlite, args.database)
+    seed([])
+    book = _book(count, seed=3)
+    rows = [
+        {
+            "account_number": f"{n % 100 + 1:06d}1",
+            "principal": Decimal(int(p)).scaleb(-2),
+            "rate": Decimal(int(r)).scaleb(-2),
+            "term_months": int(t),
+            "start_date": s,
+        }
+        for n, (p, r, t, s) in enumerate(
+            zip(book["principal_cents"], book["rate_bp"], book["term_months"], book["start"].tolist())
+        )
+    ]
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO Loans (account_number, principal, balance_remaining, rate, term_months, start_date, status) "
+                "VALUES (:account_number, :principal, :principal, :rate, :term_months, :start_date, 'APPROVED')"
+            ),
+            rows,
+        )
+    stats = LoanController().run_amortization(as_of=as_of)
+    print(f"run_amortization: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=1_000_000)
+    parser.add_argument("--check", type=int, default=500)
+    parser.add_argument("--db-loans", type=int, default=0)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    as_of = datetime(2026, 1, 1)
+    book = _book(args.loans)
+    started = time.perf_counter()
+    amortized = amortization.amortize(book["principal_cents"], book["rate_bp"], book["term_months"], book["start"], as_of)
+    amortize_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    amortization.project_payoff(
+        amortized["balance"], book["rate_bp"], amortized["installment"], book["term_months"] - amortized["payments_made"]
+    )
+    payoff_seconds = time.perf_counter() - started
+    print(f"{args.loans} loans: amortize {amortize_seconds:.2f}s, payoff projection {payoff_seconds:.2f}s")
+    if args.check:
+        _check(book, amortized, args.check)
+    if args.db_loans:
+        _run_db(args.db_loans, as_of, args)
+
+
+if __name__ == "__main__":
+    main()
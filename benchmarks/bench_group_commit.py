@@ -0,0 +1,76 @@
+"""
+Hot-account deposits: many threads depositing into one merchant account, each deposit its own
+transaction vs. group-committed (GROUP_COMMIT_ENABLED).
+
+    python -m benchmarks.bench_group_commit --threads 16 --deposits 1000 --latency-ms 2
+
+Runs against the benchmark database (see benchmarks/database.py). When the server is local,
+--latency-ms adds a sleep to every statement to model the network round trip, which is what
+concurrent deposits queue behind while one holds the account's row.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from sqlalchemy import event, text
+
+from benchmarks.database import add_arguments, configure, seed
+from infra.db import get_engine
+
+
+MERCHANT = "0000011"
+
+
+def _burst(threads: int, deposits: int) -> tuple[float, list]:
+    from controllers import TransactionController
+
+    controller = TransactionController()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        txns = list(pool.map(lambda i: controller.deposit(MERCHANT, Decimal("1.00"), "bench", note=f"sale {i}"), range(deposits)))
+    return time.perf_counter() - started, txns
+
+
+def _check_ledger(txns: list) -> bool:
+    # Every deposit got its own row, and each row's balance_after follows from the one before it.
+    with get_engine().connect() as conn:
+        balance = conn.execute(text("SELECT balance FROM Accounts WHERE account_number = :a"), {"a": MERCHANT}).scalar()
+    ordered = sorted(txns, key=lambda t: t.transaction_id)
+    chained = all(b.balance_after == a.balance_after + b.amount for a, b in zip(ordered, ordered[1:]))
+    return len({t.transaction_id for t in txns}) == len(txns) and chained and ordered[-1].balance_after == balance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--deposits", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="extra simulated round-trip latency per statement")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ["POOL_MAX_SIZE"] = str(args.threads)
+    configure(args.sqlite, args.database)
+    seed([])
+    if args.latency_ms:
+        delay = args.latency_ms / 1000
+        event.listen(get_engine(), "before_cursor_execute", lambda *a: time.sleep(delay))
+
+    from daos import TransactionDAO
+
+    results = {}
+    for mode, enabled in (("per-deposit", "false"), ("group commit", "true")):
+        os.environ["GROUP_COMMIT_ENABLED"] = enabled
+        seconds, txns = _burst(args.threads, args.deposits)
+        results[mode] = args.deposits / seconds
+        print(f"{mode:<13} {args.deposits} deposits in {seconds:6.2f}s  {results[mode]:9.1f} deposits/s  ledger ok {_check_ledger(txns)}")
+    stats = TransactionDAO.group_commit_stats()
+    print(
+        f"\n{args.threads} threads, {args.latency_ms} ms/statement: {results['per-deposit']:.0f} -> "
+        f"{results['group commit']:.0f} deposits/s ({results['group commit'] / results['per-deposit']:.1f}x), "
+        f"{stats['commits']} commits, mean batch {stats['mean_batch']}, max {stats['max_batch']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
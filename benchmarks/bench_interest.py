@@ -0,0 +1,52 @@
+"""
+Interest accrual throughput on the benchmark database: seeds N SAVINGS accounts and runs
+InterestController.accrue over them, reporting accounts/sec per chunk size.
+
+    python -m benchmarks.bench_interest --accounts 200000 --chunk-sizes 500,2000,10000
+"""
+import argparse
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import text
+
+from benchmarks.database import add_arguments, configure, seed
+from infra.db import get_engine
+
+
+def _seed_savings(count: int):
+    opened = datetime(2020, 1, 1)
+    accounts = [{"account_number": f"SAV{n:08d}", "balance": Decimal(1000 + n % 50_000) + Decimal("0.37")} for n in range(count)]
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO Accounts (account_number, customer_id, account_type, balance, currency, status, date_opened) "
+                "VALUES (:account_number, 1, 'SAVINGS', :balance, 'USD', 'ACTIVE', :date_opened)"
+            ),
+            [{**a, "date_opened": opened} for a in accounts],
+        )
+        conn.execute(text("INSERT INTO AccountSummary (account_number) VALUES (:account_number)"), accounts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--chunk-sizes", default="500,2000,10000")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    configure(args.sqlite, args.database)
+    seed([])
+    _seed_savings(args.accounts)
+    from controllers import InterestController
+
+    controller = InterestController()
+    for month, size in enumerate(int(s) for s in args.chunk_sizes.split(",")):
+        stats = controller.accrue(f"2030-{month + 1:02d}", Decimal("1.50"), chunk_size=size)
+        print(
+            f"chunk {size:>6}: {stats['accounts_posted']} accounts in {stats['chunks']} chunks, "
+            f"{stats['seconds']}s, {stats['accounts_per_sec']} accounts/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Burst of declined withdrawals: overdraft events written synchronously (one transaction per
+attempt) vs. through the write-behind buffer (spilled locally, flushed in batches).
+
+    python -m benchmarks.bench_overdraft_buffer --attempts 2000 --latency-ms 2
+
+Runs against the benchmark database (see benchmarks/database.py). When the server is local,
+--latency-ms adds a sleep to every statement to model the network hop. Both runs must leave the same number of events and consistent AccountSummary
+counters.
+"""
+import argparse
+import os
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from sqlalchemy import event, text
+
+from benchmarks.database import add_arguments, configure, seed
+from infra.db import get_engine
+from infra.metrics import metrics
+
+
+def _burst(attempts: int) -> dict:
+    from controllers import TransactionController
+
+    controller = TransactionController()
+    statements_before = sum(h.count for h in metrics.statements.values())
+    started = time.perf_counter()
+    for n in range(attempts):
+        try:
+            controller.withdraw(f"{n % 100 + 1:06d}1", Decimal("10000000"), "bench")
+        except ValueError:
+            pass
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "statements": sum(h.count for h in metrics.statements.values()) - statements_before}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="extra simulated round-trip latency per statement")
+    parser.add_argument("--max-events", type=int, default=500, help="OVERDRAFT_BUFFER_MAX_EVENTS")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(args.sqlite, args.database)
+        seed([])
+        os.environ["OVERDRAFT_SPILL_DIR"] = str(Path(tmp) / "spill")
+        os.environ["OVERDRAFT_BUFFER_MAX_EVENTS"] = str(args.max_events)
+        if args.latency_ms:
+            delay = args.latency_ms / 1000
+            event.listen(get_engine(), "before_cursor_execute", lambda *a: time.sleep(delay))
+
+        from controllers import ReportController
+        from daos.overdraft_event_dao import OverDraftEventDAO, close_overdraft_buffer
+
+        with get_engine().connect() as conn:
+            seeded = conn.execute(text("SELECT COUNT(*) FROM OverDraftEvents")).scalar()
+        os.environ["OVERDRAFT_BUFFER_ENABLED"] = "false"
+        sync = _burst(args.attempts)
+        os.environ["OVERDRAFT_BUFFER_ENABLED"] = "true"
+        buffered = _burst(args.attempts)
+        started = time.perf_counter()
+        buffer_stats = OverDraftEventDAO.buffer_stats()
+        close_overdraft_buffer()  # drain what is still pending, as at shutdown
+        drain = time.perf_counter() - started
+
+        with get_engine().connect() as conn:
+            events = conn.execute(text("SELECT COUNT(*) FROM OverDraftEvents")).scalar()
+            summary = conn.execute(text("SELECT SUM(overdraft_events) FROM AccountSummary")).scalar()
+        if events != seeded + 2 * args.attempts or summary != events:
+            raise SystemExit(f"expected {seeded + 2 * args.attempts} events, found {events} (AccountSummary says {summary})")
+        ReportController().rebuild_summaries()
+        with get_engine().connect() as conn:
+            if conn.execute(text("SELECT SUM(overdraft_events) FROM AccountSummary")).scalar() != summary:
+                raise SystemExit("AccountSummary overdraft counters drifted from the table")
+
+        for name, run in (("synchronous", sync), ("write-behind", buffered)):
+            print(
+                f"{name:<13} {args.attempts} declined attempts in {run['seconds']:.2f}s "
+                f"({args.attempts / run['seconds']:.0f}/s), {run['statements']} statements"
+            )
+        print(f"drain at shutdown {drain * 1000:.1f} ms; flushes by trigger {buffer_stats['flushes']}, largest batch {buffer_stats['max_batch']}")
+
+
+if __name__ == "__main__":
+    main()
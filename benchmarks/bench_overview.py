@@ -0,0 +1,79 @@
+"""
+Customer overview load: loans and overdraft events for every account of one customer,
+two queries per account one after another vs. one batched query per table, gathered concurrently
+through the async DAO layer.
+
+    python -m benchmarks.bench_overview --accounts 40 --latency-ms 2
+
+Runs against the benchmark database (see benchmarks/database.py). A local server has almost no
+round-trip cost, so --latency-ms adds a sleep to every statement to model the network hop.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+
+from benchmarks.database import add_arguments, configure, seed
+from benchmarks.suite import measure
+from infra.db import get_engine
+
+
+def _seed_customer(accounts: int) -> list[str]:
+    numbers = [f"OVR{n:05d}" for n in range(accounts)]
+    opened = datetime(2020, 1, 1)
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO Accounts (account_number, customer_id, account_type, balance, currency, status, date_opened) "
+                "VALUES (:account_number, 1, 'CHECKING', 100, 'USD', 'ACTIVE', :date_opened)"
+            ),
+            [{"account_number": n, "date_opened": opened} for n in numbers],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO Loans (account_number, principal, balance_remaining, rate, term_months, start_date, status) "
+                "VALUES (:account_number, 1000, 1000, 5, 12, :start_date, 'APPROVED')"
+            ),
+            [{"account_number": n, "start_date": opened + timedelta(days=i)} for i, n in enumerate(numbers)],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after) "
+                "VALUES (:account_number, 10, :occurred_at, 'bench', 0)"
+            ),
+            [{"account_number": n, "occurred_at": opened + timedelta(days=i)} for i, n in enumerate(numbers)],
+        )
+    return numbers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="extra simulated round-trip latency per statement")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--max-seconds", type=float, default=5.0)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    configure(args.sqlite, args.database)
+    seed([])
+    numbers = _seed_customer(args.accounts)
+    if args.latency_ms:
+        delay = args.latency_ms / 1000
+        event.listen(get_engine(), "before_cursor_execute", lambda *a: time.sleep(delay))
+
+    from controllers import OverviewController
+
+    overview = OverviewController()
+    assert overview.load(numbers) == overview.load_serial(numbers)
+    serial = measure("overview per-account", lambda i: overview.load_serial(numbers), args.iterations, args.max_seconds)
+    gathered = measure("overview batched", lambda i: overview.load(numbers), args.iterations, args.max_seconds)
+    print(
+        f"\n{args.accounts} accounts, {args.latency_ms} ms/statement: "
+        f"{serial['mean_ms']:.1f} ms -> {gathered['mean_ms']:.1f} ms "
+        f"({serial['mean_ms'] / gathered['mean_ms']:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
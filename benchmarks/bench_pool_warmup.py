@@ -0,0 +1,108 @@
+"""
+Cold start: latency of the first concurrent requests after startup with an empty pool vs. a pool
+warmed to POOL_MIN_IDLE, then idle eviction back down to the floor.
+
+    python -m benchmarks.bench_pool_warmup --users 4 --connect-ms 150 --latency-ms 2
+
+Runs against the benchmark database (see benchmarks/database.py). Against a local server opening a
+connection is cheap, so --connect-ms adds a sleep to every new connection to model ODBC setup plus
+the TLS handshake to a remote one, and --latency-ms adds one to every statement for the round trip.
+"""
+import argparse
+import os
+import threading
+import time
+from sqlalchemy import event
+
+from benchmarks.database import add_arguments, configure, seed
+from infra.db import get_engine, pool_stats, reset_engine, warm_up_pool
+
+
+def _start(connect_ms: float, latency_ms: float):
+    reset_engine()
+    engine = get_engine()
+    if connect_ms:
+        event.listen(engine, "connect", lambda *a: time.sleep(connect_ms / 1000))
+    if latency_ms:
+        event.listen(engine, "before_cursor_execute", lambda *a: time.sleep(latency_ms / 1000))
+    return engine
+
+
+def _first_requests(users: int) -> list[float]:
+    # Every user issues one history read at the same moment, as right after a deploy.
+    from daos import TransactionDAO
+
+    dao, barrier, latencies = TransactionDAO(), threading.Barrier(users), []
+
+    def user(n: int):
+        barrier.wait()
+        started = time.perf_counter()
+        dao.list_page(f"{n % 100 + 1:06d}1", limit=20)
+        latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=user, args=(n,)) for n in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=4, help="concurrent first requests; also POOL_MIN_IDLE")
+    parser.add_argument("--connect-ms", type=float, default=0.0, help="extra simulated connection setup per new connection")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="extra simulated round-trip latency per statement")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--idle-timeout-ms", type=int, default=300)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ["POOL_MAX_SIZE"] = str(max(args.users * 2, 2))
+    os.environ["POOL_MIN_IDLE"] = str(args.users)
+    os.environ["POOL_IDLE_TIMEOUT_MS"] = str(args.idle_timeout_ms)
+    configure(args.sqlite, args.database)
+    seed([])
+
+    results = {}
+    for mode in ("cold", "warm"):
+        first, slowest, startup = [], [], []
+        for _ in range(args.trials):
+            _start(args.connect_ms, args.latency_ms)
+            started = time.perf_counter()
+            if mode == "warm":
+                warm_up_pool()
+            startup.append(time.perf_counter() - started)
+            latencies = _first_requests(args.users)
+            first.append(sum(latencies) / len(latencies))
+            slowest.append(latencies[-1])
+        results[mode] = {
+            "startup_ms": sum(startup) / len(startup) * 1000,
+            "mean_ms": sum(first) / len(first) * 1000,
+            "max_ms": sum(slowest) / len(slowest) * 1000,
+        }
+        print(
+            f"{mode:<5} startup {results[mode]['startup_ms']:>8.1f} ms   first request mean "
+            f"{results[mode]['mean_ms']:>8.1f} ms  slowest {results[mode]['max_ms']:>8.1f} ms"
+        )
+    cold, warm = results["cold"], results["warm"]
+    print(
+        f"\n{args.users} users, {args.connect_ms} ms/connect: first-request mean "
+        f"{cold['mean_ms']:.1f} ms -> {warm['mean_ms']:.1f} ms ({cold['mean_ms'] / warm['mean_ms']:.1f}x)"
+    )
+
+    # Burst to the pool's size, then go idle: eviction should bring it back to the floor, not below.
+    engine = _start(0, 0)
+    warm_up_pool()
+    held = [engine.connect() for _ in range(engine.pool.size())]
+    for conn in held:
+        conn.close()
+    burst = pool_stats()["idle_open"]
+    time.sleep(args.idle_timeout_ms / 1000 * 3)
+    stats = pool_stats()
+    print(f"idle eviction: {burst} idle after a burst -> {stats['idle_open']} after {args.idle_timeout_ms * 3} ms (min_idle {stats['min_idle']}, evicted {stats['evicted']})")
+    reset_engine()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Deposit/withdraw throughput: legacy read-modify-write path vs. the single-batch posting path.
+
+Run from the repo root against a scratch database (it writes ledger rows):
+    python -m benchmarks.bench_postings 10000001 --iterations 500
+Each iteration deposits and then withdraws the same amount, so the balance is left unchanged.
+"""
+import argparse
+import time
+from decimal import Decimal
+
+from infra.db import get_engine
+from daos import AccountDAO, TransactionDAO
+from controllers import TransactionController
+
+
+def _legacy_post(account_dao: AccountDAO, transaction_dao: TransactionDAO, account_number: str, delta: Decimal, txn_type: str):
+    # Mirrors the pre-batch controller: read, update + insert, read back (three checkouts, four round trips).
+    account = account_dao.get_one(account_number)
+    new_balance = account.balance + delta
+    with get_engine().begin() as conn:
+        account_dao.update_balance(account_number, new_balance, conn=conn)
+        txn_id = transaction_dao.add(
+            account_number=account_number,
+            transaction_type=txn_type,
+            amount=abs(delta),
+            performed_by="bench",
+            note="benchmark",
+            balance_after=new_balance,
+            conn=conn,
+        )
+    return transaction_dao.get_by_id(txn_id)
+
+
+def _run(label: str, iterations: int, deposit, withdraw) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        deposit()
+        withdraw()
+    elapsed = time.perf_counter() - started
+    ops = (iterations * 2) / elapsed if elapsed else float("inf")
+    print(f"{label:<8} {iterations * 2:>7} ops  {elapsed:8.3f}s  {ops:10.1f} ops/sec")
+    return ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("account_number")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--amount", type=Decimal, default=Decimal("1.00"))
+    args = parser.parse_args()
+
+    account_dao = AccountDAO()
+    transaction_dao = TransactionDAO()
+    controller = TransactionController()
+    acct, amount = args.account_number, args.amount
+
+    before = _run(
+        "legacy",
+        args.iterations,
+        lambda: _legacy_post(account_dao, transaction_dao, acct, amount, "DEPOSIT"),
+        lambda: _legacy_post(account_dao, transaction_dao, acct, -amount, "WITHDRAWAL"),
+    )
+    after = _run(
+        "batched",
+        args.iterations,
+        lambda: controller.deposit(acct, amount, performed_by="bench", note="benchmark"),
+        lambda: controller.withdraw(acct, amount, performed_by="bench", note="benchmark"),
+    )
+    print(f"speedup  {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Per-call statement overhead: building text() inline on every call (the old DAO style, with the
+history WHERE clause assembled by f-string) vs. the prebuilt statements in daos/statements.py.
+
+    python -m benchmarks.bench_statements --iterations 20000
+
+The "build" cases measure statement construction alone; the "execute" cases run a primary-key
+lookup and a filtered history page on the benchmark database so the saving is shown against a real
+round trip. SQLAlchemy's compiled cache is warm in both variants, so the difference is the
+text() parse, bind typing and cache-key hashing that the registry does once.
+"""
+import argparse
+from datetime import datetime
+from sqlalchemy import text
+
+from benchmarks.database import add_arguments, configure, seed
+from benchmarks.suite import measure
+from infra.db import get_engine
+
+
+GET_ONE_SQL = """
+    SELECT account_number, customer_id, account_type, balance, currency, status, date_opened
+    FROM Accounts
+    WHERE account_number = :account_number
+    """
+
+
+def _inline_history(filters: list[str]):
+    where_clause = " AND ".join(filters)
+    return text(
+        f"""
+        SELECT TOP (:limit) transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code
+        FROM Transactions
+        WHERE {where_clause}
+        ORDER BY timestamp DESC, transaction_id DESC
+        """
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--max-seconds", type=float, default=3.0)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    configure(args.sqlite, args.database)
+    seed([1000])
+    from daos.statements import statement
+    from daos.transaction_dao import LIST_PAGE
+
+    acct = "HIST1000"
+    history_filters = ["account_number = :account_number", "timestamp >= :start_date", "transaction_type = :transaction_type"]
+    params = {"account_number": acct, "start_date": datetime(2000, 1, 1), "transaction_type": "DEPOSIT", "limit": 51}
+    variant = (True, False, True, False)
+    n, budget = args.iterations, args.max_seconds
+
+    results = [
+        measure("build get_one inline", lambda i: text(GET_ONE_SQL), n, budget),
+        measure("build get_one registry", lambda i: statement("AccountDAO.get_one", GET_ONE_SQL), n, budget),
+        measure("build history inline", lambda i: _inline_history(list(history_filters)), n, budget),
+        measure("build history prebuilt", lambda i: LIST_PAGE[variant + (False,)], n, budget),
+    ]
+    with get_engine().connect() as conn:
+        results += [
+            measure(
+                "execute get_one inline",
+                lambda i: conn.execute(text(GET_ONE_SQL), {"account_number": acct}).fetchone(),
+                n,
+                budget,
+            ),
+            measure(
+                "execute get_one registry",
+                lambda i: conn.execute(statement("AccountDAO.get_one", GET_ONE_SQL), {"account_number": acct}).fetchone(),
+                n,
+                budget,
+            ),
+            measure(
+                "execute history inline",
+                lambda i: conn.execute(_inline_history(list(history_filters)), params).fetchall(),
+                n,
+                budget,
+            ),
+            measure("execute history prebuilt", lambda i: conn.execute(LIST_PAGE[variant + (False,)], params).fetchall(), n, budget),
+        ]
+    by_name = {r["name"]: r for r in results}
+    print()
+    for case in ("build get_one", "build history", "execute get_one", "execute history"):
+        inline = by_name[f"{case} inline"]["mean_ms"]
+        prebuilt = by_name.get(f"{case} registry", by_name.get(f"{case} prebuilt"))["mean_ms"]
+        print(f"{case:<20} saved {(inline - prebuilt) * 1000:9.2f} us/call  ({inline / prebuilt:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
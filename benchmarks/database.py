@@ -0,0 +1,170 @@
+"""
+The scratch database the benchmarks run on: the local SQLite stand-in (infra/standin.py) by default, or a
+database on the SQL Server configured in .env. Either way it is dropped and recreated from
+scripts/create_tables.sql plus the migrations by create_schema(), so it is never the configured app database.
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+
+from config import load_config
+from infra.db import build_connection_url, get_engine, reset_engine
+from infra.migrations import migrate, split_batches
+
+
+STANDIN_PATH = "bench.db"
+BENCH_DATABASE = "BankBench"
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "scripts" / "create_tables.sql"
+# Created with the schema; a non-empty database without it is not a benchmark database and is left alone.
+MARKER_TABLE = "BenchmarkMarker"
+CUSTOMERS = 100
+OPENING_BALANCE = Decimal("1000000.00")
+HISTORY_INSERT_CHUNK = 50_000
+_SYSTEM_DATABASES = ("master", "model", "msdb", "tempdb")
+
+_app_database: str | None = None  # DB_NAME before configure() first replaced it
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """
+    --sqlite PATH / --database NAME: which benchmark database configure() points at.
+    """
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--sqlite", metavar="PATH", help=f"stand-in database file to (re)create (default: {STANDIN_PATH})")
+    target.add_argument("--database", metavar="NAME", help="scratch database to (re)create on the configured SQL Server instead")
+
+
+def configure(sqlite_path: str | None = None, database: str | None = None):
+    """
+    Point the app at the benchmark database and rebuild the shared engine: the stand-in file at
+    `sqlite_path` (STANDIN_PATH by default), or `database` on the configured SQL Server, created on first use.
+    """
+    global _app_database
+    if _app_database is None:
+        _app_database = load_config()["database"]
+    if database is None:
+        os.environ["DB_BACKEND"] = "sqlite"
+        os.environ["DB_SQLITE_PATH"] = sqlite_path or STANDIN_PATH
+    else:
+        cfg = load_config()
+        if database.lower() in (*_SYSTEM_DATABASES, _app_database.lower()):
+            raise ValueError(f"Refusing to benchmark against {database}; its tables are dropped on every run")
+        server = create_engine(build_connection_url({**cfg, "database": "master"}), isolation_level="AUTOCOMMIT")
+        try:
+            with server.connect() as conn:
+                conn.execute(
+                    text("IF DB_ID(:name) IS NULL EXEC('CREATE DATABASE ' + QUOTENAME(:name))"), {"name": database}
+                )
+        finally:
+            server.dispose()
+        os.environ["DB_BACKEND"] = "mssql"
+        os.environ["DB_NAME"] = database
+    reset_engine()
+
+
+def create_schema():
+    """
+    Drop and recreate every table from scripts/create_tables.sql (skipping its CREATE/USE DATABASE
+    batches), then apply the migrations, leaving the configured database empty and fully indexed.
+    Refuses the app database and any non-empty database that create_schema() did not create.
+    """
+    cfg = load_config()
+    if cfg["backend"] != "sqlite" and cfg["database"].lower() in (*_SYSTEM_DATABASES, (_app_database or "").lower()):
+        raise ValueError(f"Refusing to drop the tables of {cfg['database']}")
+    engine = get_engine()
+    tables = inspect(engine).get_table_names()
+    if tables and MARKER_TABLE not in tables:
+        raise ValueError(f"Refusing to drop the tables of a database without {MARKER_TABLE}; use an empty database")
+    with engine.begin() as conn:
+        conn.execute(text(f"IF OBJECT_ID('{MARKER_TABLE}', 'U') IS NULL CREATE TABLE {MARKER_TABLE} (created_at DATETIME2 NOT NULL)"))
+        conn.execute(text(f"INSERT INTO {MARKER_TABLE} (created_at) VALUES (SYSUTCDATETIME())"))
+    with engine.begin() as conn:
+        for batch in split_batches(SCHEMA_PATH.read_text(encoding="utf-8")):
+            if "DB_ID(" in batch or batch.upper().startswith("USE "):
+                continue
+            conn.execute(text(batch))
+    migrate(engine)
+
+
+def seed(sizes: list[int]):
+    """
+    Recreate the schema and load the benchmark fixtures: CUSTOMERS customers with a checking and a savings
+    account each, a teller, one overdraft event per checking account and a HIST<size> account with `size`
+    transactions for each of `sizes`.
+    """
+    from daos import ReportingDAO
+
+    engine = get_engine()
+    create_schema()
+    opened = datetime(2020, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO Employees (username, pin, name, email, phone, role, status) "
+                "VALUES ('bench_teller', '1111', 'Bench Teller', 'teller@example.com', NULL, 'TELLER', 'ACTIVE')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO Customers (username, pin, name, email, phone, address, national_id, status) "
+                "VALUES (:username, :pin, :name, :email, NULL, NULL, :national_id, 'ACTIVE')"
+            ),
+            [
+                {
+                    "username": f"bench{n}",
+                    "pin": f"{n:04d}",
+                    "name": f"Bench Customer {n}",
+                    "email": f"bench{n}@example.com",
+                    "national_id": f"BENCH-{n:06d}",
+                }
+                for n in range(1, CUSTOMERS + 1)
+            ],
+        )
+        accounts = [
+            {"account_number": f"{n:06d}{kind}", "customer_id": n, "account_type": account_type}
+            for n in range(1, CUSTOMERS + 1)
+            for kind, account_type in (("1", "CHECKING"), ("2", "SAVINGS"))
+        ]
+        accounts += [{"account_number": f"HIST{size}", "customer_id": 1, "account_type": "CHECKING"} for size in sizes]
+        conn.execute(
+            text(
+                "INSERT INTO Accounts (account_number, customer_id, account_type, balance, currency, status, date_opened) "
+                "VALUES (:account_number, :customer_id, :account_type, :balance, 'USD', 'ACTIVE', :date_opened)"
+            ),
+            [{**a, "balance": OPENING_BALANCE, "date_opened": opened} for a in accounts],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after) "
+                "VALUES (:account_number, 10, :occurred_at, 'Seed overdraft event', 0)"
+            ),
+            [{"account_number": f"{n:06d}1", "occurred_at": opened + timedelta(days=n)} for n in range(1, CUSTOMERS + 1)],
+        )
+
+    insert_sql = text(
+        "INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code) "
+        "VALUES (:account_number, :transaction_type, :amount, :timestamp, 'seed', NULL, :balance_after, NULL)"
+    )
+    for size in sizes:
+        account_number, balance = f"HIST{size}", Decimal("0.00")
+        for start in range(0, size, HISTORY_INSERT_CHUNK):
+            rows = []
+            for i in range(start, min(start + HISTORY_INSERT_CHUNK, size)):
+                amount = Decimal(10 + i % 90)
+                kind = "DEPOSIT" if i % 3 else "WITHDRAWAL"
+                balance += amount if kind == "DEPOSIT" else -amount
+                rows.append(
+                    {
+                        "account_number": account_number,
+                        "transaction_type": kind,
+                        "amount": amount,
+                        "timestamp": opened + timedelta(minutes=i),
+                        "balance_after": balance,
+                    }
+                )
+            with engine.begin() as conn:
+                conn.execute(insert_sql, rows)
+    ReportingDAO().rebuild_account_summaries()
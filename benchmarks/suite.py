@@ -0,0 +1,152 @@
+"""
+Benchmark suite for the DAO and controller hot paths, run against a scratch database that is recreated
+from scripts/create_tables.sql plus the migrations on every run: the local SQLite stand-in (bench.db) by
+default, or --database on the SQL Server configured in .env.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --sizes 1000,100000 --compare bench.json
+    python -m benchmarks.suite --database BankBench --output bench-mssql.json
+
+Stand-in numbers are for comparing commits with each other, not with SQL Server (see infra/standin.py).
+
+Each case reports ops/sec and p50/p99 latency; results are written as JSON (with the git commit)
+so regressions can be compared across commits.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks.database import CUSTOMERS, add_arguments, configure, seed
+from infra.db import get_engine, reset_engine
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def measure(name: str, fn, iterations: int, max_seconds: float) -> dict:
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+        if len(samples) >= 3 and time.perf_counter() > deadline:
+            break
+    samples.sort()
+    total = sum(samples)
+    result = {
+        "name": name,
+        "iterations": len(samples),
+        "ops_per_sec": round(len(samples) / total, 2) if total else None,
+        "mean_ms": round(total / len(samples) * 1000, 4),
+        "p50_ms": round(_percentile(samples, 50) * 1000, 4),
+        "p99_ms": round(_percentile(samples, 99) * 1000, 4),
+    }
+    print(f"{name:<32} {result['iterations']:>7} it  {result['ops_per_sec']:>12} ops/s  p50 {result['p50_ms']:>9} ms  p99 {result['p99_ms']:>9} ms")
+    return result
+
+
+def run_cases(sizes: list[int], iterations: int, max_seconds: float) -> list[dict]:
+    from controllers import AuthController, ReportController, TransactionController, TransferController
+
+    transactions = TransactionController()
+    transfers = TransferController()
+    reports = ReportController()
+    auth = AuthController()
+    amount = Decimal("1.00")
+
+    def account(i: int) -> str:
+        return f"{i % CUSTOMERS + 1:06d}1"
+
+    results = [
+        measure("deposit", lambda i: transactions.deposit(account(i), amount, performed_by="bench"), iterations, max_seconds),
+        measure("withdraw", lambda i: transactions.withdraw(account(i), amount, performed_by="bench"), iterations, max_seconds),
+        measure(
+            "transfer",
+            lambda i: transfers.transfer(account(i), f"{i % CUSTOMERS + 1:06d}2", amount, performed_by="bench"),
+            iterations,
+            max_seconds,
+        ),
+    ]
+    for size in sizes:
+        results.append(
+            measure(f"list_for_account[{size}]", lambda i, s=size: transactions.history(f"HIST{s}"), iterations, max_seconds)
+        )
+        results.append(
+            measure(f"history_page[{size}]", lambda i, s=size: transactions.history_page(f"HIST{s}"), iterations, max_seconds)
+        )
+    results += [
+        measure("account_summary", lambda i: reports.account_summary(account(i)), iterations, max_seconds),
+        measure("login[customer]", lambda i: auth.login(f"bench{i % CUSTOMERS + 1}", f"{i % CUSTOMERS + 1:04d}"), iterations, max_seconds),
+        measure("login[employee]", lambda i: auth.login("bench_teller", "1111"), iterations, max_seconds),
+    ]
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(previous: dict, current: dict):
+    before = {r["name"]: r for r in previous["results"]}
+    print(f"\n{'case':<32} {'before ops/s':>14} {'after ops/s':>14} {'change':>9}")
+    for r in current["results"]:
+        old = before.get(r["name"])
+        if not old or not old["ops_per_sec"] or not r["ops_per_sec"]:
+            continue
+        change = (r["ops_per_sec"] / old["ops_per_sec"] - 1) * 100
+        print(f"{r['name']:<32} {old['ops_per_sec']:>14} {r['ops_per_sec']:>14} {change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="history sizes for list_for_account")
+    parser.add_argument("--iterations", type=int, default=500, help="max iterations per case")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="time budget per case")
+    add_arguments(parser)
+    parser.add_argument("--output", type=Path, help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="previous JSON results to compare against")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    configure(args.sqlite, args.database)
+    started = time.perf_counter()
+    seed(sizes)
+    print(f"seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    results = run_cases(sizes, args.iterations, args.max_seconds)
+    dialect = get_engine().dialect
+    server = f"{dialect.name} {'.'.join(map(str, dialect.server_version_info or ()))}"
+    reset_engine()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": platform.python_version(),
+            "server": server,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        _compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+
+
+if __name__ == "__main__":
+    main()
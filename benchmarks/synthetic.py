@@ -0,0 +1,429 @@
+"""
+Synthetic data at capacity-test scale: customers, accounts, transactions, transfers, loans and
+overdraft events whose ledgers hold together, bulk-loaded into the configured database.
+
+    python -m benchmarks.synthetic --customers 100000 --transactions 100000000
+    python -m benchmarks.synthetic --sqlite bench.db --customers 2000 --transactions 1000000
+    python -m benchmarks.synthetic --database BankBench --customers 2000 --transactions 1000000
+
+Customers are generated in shards, each from its own seeded RNG, so a run is reproducible and memory
+stays flat at any scale: a shard's balances evolve in memory while its events stream out in time
+order. Every account's balance_after chain runs from zero to its final balance, every transfer has
+its TRANSFER_OUT/TRANSFER_IN pair (reference_code = transfer_id), declined withdrawals become
+overdraft events, and savings accounts earn monthly interest.
+
+Each table has its own loader thread and connection, inserting one chunk per executemany
+(fast_executemany on SQL Server); the generator waits whenever a loader falls behind. Customers and
+Transfers keep their generated ids, so load into an empty schema: create_tables.sql plus migrations,
+or --sqlite / --database, which recreate the stand-in file or a scratch SQL Server database as the
+other benchmarks do (benchmarks/database.py). The stand-in takes one writer at a time, so its
+loaders commit in turn. AccountSummary is rebuilt at the end.
+"""
+import argparse
+import bisect
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from benchmarks.database import add_arguments, configure, create_schema
+from daos.statements import statement
+from infra.db import get_engine
+
+
+SHARD_CUSTOMERS = 1000
+QUEUE_CHUNKS = 4  # chunks buffered per loader before the generator waits
+MAX_CENTS = 5_000_000
+
+INSERTS = {
+    "Customers": (
+        """
+        INSERT INTO Customers (customer_id, username, pin, name, email, phone, address, national_id, status)
+        VALUES (:customer_id, :username, :pin, :name, :email, :phone, :address, :national_id, :status)
+        """,
+        True,
+    ),
+    "Accounts": (
+        """
+        INSERT INTO Accounts (account_number, customer_id, account_type, balance, currency, status, date_opened)
+        VALUES (:account_number, :customer_id, :account_type, 0, :currency, :status, :date_opened)
+        """,
+        False,
+    ),
+    "Balances": (
+        "UPDATE Accounts SET balance = :balance WHERE account_number = :account_number",
+        False,
+    ),
+    "Transactions": (
+        """
+        INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+        VALUES (:account_number, :transaction_type, :amount, :timestamp, :performed_by, :note, :balance_after, :reference_code)
+        """,
+        False,
+    ),
+    "Transfers": (
+        """
+        INSERT INTO Transfers (transfer_id, from_account, to_account, amount, timestamp, status, note)
+        VALUES (:transfer_id, :from_account, :to_account, :amount, :timestamp, 'COMPLETED', :note)
+        """,
+        True,
+    ),
+    "Loans": (
+        """
+        INSERT INTO Loans (account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date)
+        VALUES (:account_number, :principal, :balance_remaining, :rate, :term_months, :start_date, :status, :next_due_date)
+        """,
+        False,
+    ),
+    "OverDraftEvents": (
+        """
+        INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after)
+        VALUES (:account_number, :amount, :occurred_at, :note, :balance_after)
+        """,
+        False,
+    ),
+}
+
+FIRST_NAMES = ("Amina", "Omar", "Layla", "Youssef", "Sara", "Karim", "Nour", "Hassan", "Mona", "Ali", "Dina", "Tarek")
+LAST_NAMES = ("Hassan", "Mahmoud", "Ibrahim", "Farouk", "Saleh", "Nasser", "Khalil", "Mansour", "Fathy", "Ezzat")
+STREETS = ("Nile St", "Tahrir Sq", "Corniche Rd", "Pyramids Rd", "Garden City", "Zamalek Ave", "Heliopolis Blvd")
+CHANNELS = ("online", "online", "online", "atm", "atm", "teller1", "teller2")
+
+
+def _money(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def _amount(rng: random.Random, mu: float) -> int:
+    # Log-normal cents: mostly small amounts with a long tail, as real ledgers have.
+    return max(100, min(MAX_CENTS, int(rng.lognormvariate(mu, 1.1))))
+
+
+class _Loader(threading.Thread):
+    """
+    Inserts chunks for one table on its own connection, one transaction per chunk.
+    """
+
+    def __init__(self, table: str):
+        super().__init__(name=f"synthetic-{table}", daemon=True)
+        sql, identity = INSERTS[table]
+        self.table = table
+        self.stmt = statement(f"Synthetic.load.{table}", sql)
+        self.identity = identity
+        self.queue: queue.Queue = queue.Queue(QUEUE_CHUNKS)
+        self.rows = 0
+        self.error: BaseException | None = None
+
+    def run(self):
+        # Keep draining after a failure so the generator never blocks on a dead loader.
+        while (chunk := self.queue.get()) is not None:
+            if self.error is not None:
+                continue
+            try:
+                self._load(chunk)
+            except BaseException as exc:  # noqa: BLE001 - re-raised by the generator
+                self.error = exc
+
+    def _load(self, chunk: list[dict]):
+        with get_engine().begin() as conn:
+            if not self.identity:
+                conn.execute(self.stmt, chunk)
+            else:
+                # IDENTITY_INSERT is session state and pooled connections are not reset on checkin, so switch
+                # it back off before the connection is reused (only one table per session may have it on).
+                conn.execute(statement(f"Synthetic.identity_on.{self.table}", f"SET IDENTITY_INSERT {self.table} ON"))
+                try:
+                    conn.execute(self.stmt, chunk)
+                finally:
+                    conn.execute(statement(f"Synthetic.identity_off.{self.table}", f"SET IDENTITY_INSERT {self.table} OFF"))
+        self.rows += len(chunk)
+
+
+class _Sinks:
+    """
+    Per-table row buffers feeding one loader thread each.
+    """
+
+    def __init__(self, tables: list[str], chunk_size: int):
+        self.chunk_size = chunk_size
+        self.loaders = {table: _Loader(table) for table in tables}
+        self.buffers: dict[str, list[dict]] = {table: [] for table in tables}
+        for loader in self.loaders.values():
+            loader.start()
+
+    def add(self, table: str, row: dict):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self._put(table)
+
+    def _put(self, table: str):
+        loader = self.loaders[table]
+        if loader.error is not None:
+            raise RuntimeError(f"Loading {table} failed") from loader.error
+        loader.queue.put(self.buffers[table])
+        self.buffers[table] = []
+
+    def close(self) -> dict[str, int]:
+        for table, loader in self.loaders.items():
+            if self.buffers[table] and loader.error is None:
+                loader.queue.put(self.buffers[table])
+            self.buffers[table] = []
+            loader.queue.put(None)
+        for loader in self.loaders.values():
+            loader.join()
+        for loader in self.loaders.values():
+            if loader.error is not None:
+                raise RuntimeError(f"Loading {loader.table} failed") from loader.error
+        return {table: loader.rows for table, loader in self.loaders.items()}
+
+
+class SyntheticDataset:
+    def __init__(self, customers: int, transactions: int, days: int = 365, seed: int = 1, end: datetime | None = None):
+        if customers <= 0 or transactions < 0 or days <= 0:
+            raise ValueError("Customers and days must be positive, transactions non-negative")
+        self.customers = customers
+        self.transactions = transactions
+        self.seed = seed
+        self.end = (end or datetime.utcnow()).replace(microsecond=0)
+        self.start = self.end - timedelta(days=days)
+        self.shards = range(0, (customers + SHARD_CUSTOMERS - 1) // SHARD_CUSTOMERS)
+        self.next_transfer_id = 1
+
+    def _rng(self, kind: str, shard: int) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}:{shard}")
+
+    def _customer_ids(self, shard: int) -> range:
+        return range(shard * SHARD_CUSTOMERS + 1, min((shard + 1) * SHARD_CUSTOMERS, self.customers) + 1)
+
+    def customers_of(self, shard: int):
+        rng = self._rng("customers", shard)
+        for customer_id in self._customer_ids(shard):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                "customer_id": customer_id,
+                "username": f"user{customer_id}",
+                "pin": f"{customer_id % 10000:04d}",  # legacy plaintext, hashed on first login
+                "name": f"{first} {last}",
+                "email": f"user{customer_id}@example.com",
+                "phone": f"+20 1{rng.randrange(10**9):09d}",
+                "address": f"{rng.randint(1, 250)} {rng.choice(STREETS)}, Cairo",
+                "national_id": f"SYN-{customer_id:010d}",
+                "status": "ACTIVE" if rng.random() < 0.98 else "INACTIVE",
+            }
+
+    def accounts_of(self, shard: int) -> list[dict]:
+        rng = self._rng("accounts", shard)
+        accounts = []
+        for customer_id in self._customer_ids(shard):
+            for k in range(1, rng.choices((1, 2, 3), (45, 40, 15))[0] + 1):
+                accounts.append(
+                    {
+                        "account_number": f"{customer_id:08d}{k}",
+                        "customer_id": customer_id,
+                        "account_type": "CHECKING" if k == 1 else rng.choice(("SAVINGS", "SAVINGS", "CHECKING")),
+                        "currency": rng.choices(("USD", "EUR", "GBP"), (90, 7, 3))[0],
+                        "status": "ACTIVE" if rng.random() < 0.98 else "FROZEN",
+                        "date_opened": self.start - timedelta(days=rng.randint(0, 3 * 365), seconds=rng.randrange(86400)),
+                    }
+                )
+        return accounts
+
+    def _shard_rows(self, shard: int) -> int:
+        # Ledger rows are split across shards in proportion to their customers.
+        ids = self._customer_ids(shard)
+        return self.transactions * ids[-1] // self.customers - self.transactions * (ids[0] - 1) // self.customers
+
+    def events_of(self, shard: int, sinks: _Sinks) -> int:
+        """
+        Stream one shard's ledger in time order into `sinks`; returns the Transactions rows emitted.
+        """
+        rng = self._rng("events", shard)
+        accounts = self.accounts_of(shard)
+        balances = {a["account_number"]: 0 for a in accounts}
+        savings = [a["account_number"] for a in accounts if a["account_type"] == "SAVINGS"]
+        by_currency: dict[str, list[str]] = {}
+        for a in accounts:
+            by_currency.setdefault(a["currency"], []).append(a["account_number"])
+        currency = {a["account_number"]: a["currency"] for a in accounts}
+        # Pareto activity weights: a few busy accounts, a long tail of quiet ones.
+        numbers = [a["account_number"] for a in accounts]
+        cum_weights, total = [], 0.0
+        for _ in numbers:
+            total += rng.paretovariate(1.2)
+            cum_weights.append(total)
+
+        def post(account: str, kind: str, cents: int, ts: datetime, performed_by: str, note=None, reference=None):
+            balances[account] += cents if kind in ("DEPOSIT", "TRANSFER_IN", "INTEREST") else -cents
+            sinks.add(
+                "Transactions",
+                {
+                    "account_number": account,
+                    "transaction_type": kind,
+                    "amount": _money(cents),
+                    "timestamp": ts,
+                    "performed_by": performed_by,
+                    "note": note,
+                    "balance_after": _money(balances[account]),
+                    "reference_code": reference,
+                },
+            )
+
+        target, emitted = self._shard_rows(shard), 0
+        span = (self.end - self.start).total_seconds()
+        month = (self.start.year, self.start.month)
+        ts = self.start
+        while emitted < target:
+            ts = max(ts, self.start + timedelta(seconds=span * (emitted + rng.random()) / max(target, 1)))
+            if (ts.year, ts.month) != month:
+                # Month end: savings accounts earn 1.25% a year, posted at the start of the new month.
+                month = (ts.year, ts.month)
+                posted_at, period = datetime(ts.year, ts.month, 1), f"{ts.year}-{ts.month:02d}"
+                for account in savings:
+                    interest = balances[account] * 125 // 120_000
+                    if interest > 0 and emitted < target:
+                        post(account, "INTEREST", interest, posted_at, "interest-accrual", f"Monthly interest {period}", f"INT-{period}")
+                        emitted += 1
+                continue
+            account = numbers[bisect.bisect_left(cum_weights, rng.random() * total)]
+            roll = rng.random()
+            if roll < 0.45:
+                post(account, "DEPOSIT", _amount(rng, 10.0), ts, rng.choice(CHANNELS))
+                emitted += 1
+                continue
+            is_transfer = roll >= 0.85 and len(by_currency[currency[account]]) > 1 and emitted + 2 <= target
+            cents = _amount(rng, 9.6 if is_transfer else 9.2)
+            if cents > balances[account]:
+                sinks.add(
+                    "OverDraftEvents",
+                    {
+                        "account_number": account,
+                        "amount": _money(cents),
+                        "occurred_at": ts,
+                        "note": "Overdraft attempt",
+                        "balance_after": _money(balances[account]),
+                    },
+                )
+                continue
+            if not is_transfer:
+                post(account, "WITHDRAWAL", cents, ts, rng.choice(CHANNELS))
+                emitted += 1
+                continue
+            peers = by_currency[currency[account]]
+            to_account = account
+            while to_account == account:
+                to_account = rng.choice(peers)
+            transfer_id, self.next_transfer_id = self.next_transfer_id, self.next_transfer_id + 1
+            note = rng.choice((None, None, "Rent", "Invoice", "Family support", "Savings"))
+            sinks.add(
+                "Transfers",
+                {"transfer_id": transfer_id, "from_account": account, "to_account": to_account, "amount": _money(cents), "timestamp": ts, "note": note},
+            )
+            post(account, "TRANSFER_OUT", cents, ts, "online", note, str(transfer_id))
+            post(to_account, "TRANSFER_IN", cents, ts, "online", note, str(transfer_id))
+            emitted += 2
+
+        for account, cents in balances.items():
+            sinks.add("Balances", {"account_number": account, "balance": _money(cents)})
+        for account in numbers:
+            if rng.random() < 0.12:
+                sinks.add("Loans", self._loan(rng, account))
+        return emitted
+
+    def _loan(self, rng: random.Random, account: str) -> dict:
+        principal = rng.randrange(1_000, 50_001, 500)
+        term = rng.choice((12, 24, 36, 60))
+        start_date = self.start + timedelta(seconds=rng.randrange(int((self.end - self.start).total_seconds())))
+        status = rng.choices(("APPROVED", "PENDING", "REJECTED", "CLOSED"), (60, 20, 10, 10))[0]
+        remaining, next_due = principal, None
+        if status == "APPROVED":
+            paid = min((self.end - start_date).days // 30, term)
+            remaining = principal * (term - paid) // term
+            next_due = start_date + timedelta(days=30 * (paid + 1)) if remaining else None
+            status = "APPROVED" if remaining else "CLOSED"
+        elif status == "CLOSED":
+            remaining = 0
+        return {
+            "account_number": account,
+            "principal": Decimal(principal),
+            "balance_remaining": Decimal(remaining),
+            "rate": _money(rng.randrange(350, 1201, 25)),
+            "term_months": term,
+            "start_date": start_date,
+            "status": status,
+            "next_due_date": next_due,
+        }
+
+
+def load(dataset: SyntheticDataset, chunk_size: int = 10_000, progress=None) -> dict:
+    """
+    Generate and bulk-load `dataset`; returns per-table row counts and timings.
+    """
+    from daos import ReportingDAO
+
+    with get_engine().connect() as conn:
+        for table in ("Customers", "Accounts", "Transactions", "Transfers"):
+            if conn.execute(statement(f"Synthetic.count.{table}", f"SELECT COUNT(*) FROM {table}")).scalar():
+                raise RuntimeError(f"{table} is not empty; load synthetic data into a fresh schema")
+
+    started = time.perf_counter()
+    rows: dict[str, int] = {}
+    # Accounts reference Customers, so the two load one after the other; the ledger tables then
+    # load side by side while the generator walks the shards.
+    for table, produce in (("Customers", dataset.customers_of), ("Accounts", dataset.accounts_of)):
+        sinks = _Sinks([table], chunk_size)
+        try:
+            for shard in dataset.shards:
+                for row in produce(shard):
+                    sinks.add(table, row)
+        finally:
+            rows.update(sinks.close())
+
+    sinks = _Sinks(["Transactions", "Transfers", "OverDraftEvents", "Loans", "Balances"], chunk_size)
+    try:
+        emitted = 0
+        for shard in dataset.shards:
+            emitted += dataset.events_of(shard, sinks)
+            if progress:
+                progress(emitted, dataset.transactions, time.perf_counter() - started)
+    finally:
+        rows.update(sinks.close())
+    loaded = time.perf_counter() - started
+
+    ReportingDAO().rebuild_account_summaries()
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "load_seconds": round(loaded, 2),
+        "seconds": round(seconds, 2),
+        "transactions_per_sec": round(rows["Transactions"] / loaded) if loaded else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--transactions", type=int, default=1_000_000, help="ledger rows to generate (up to 100M)")
+    parser.add_argument("--days", type=int, default=365, help="history window ending now")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="rows per executemany")
+    add_arguments(parser)  # without either option, loads the configured database as it is
+    args = parser.parse_args()
+
+    if args.sqlite or args.database:
+        configure(args.sqlite, args.database)
+        create_schema()
+
+    def progress(done: int, total: int, elapsed: float):
+        print(f"\r{done:,}/{total:,} transactions  {done / elapsed if elapsed else 0:,.0f} rows/s", end="", flush=True)
+
+    stats = load(SyntheticDataset(args.customers, args.transactions, args.days, args.seed), args.chunk_size, progress)
+    print()
+    print(", ".join(f"{table} {count:,}" for table, count in stats["rows"].items() if table != "Balances"))
+    print(f"loaded in {stats['load_seconds']}s ({stats['transactions_per_sec']:,} transactions/s), {stats['seconds']}s with AccountSummary rebuild")
+
+
+if __name__ == "__main__":
+    main()
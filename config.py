@@ -13,6 +13,9 @@ def load_config(env_path: Path | None = None) -> dict:
         load_dotenv(env_file)
 
     return {
+        # "mssql" (default), or "sqlite" for the local stand-in (infra/standin.py) that benchmarks/ can run on
+        "backend": os.getenv("DB_BACKEND", "mssql").lower(),
+        "sqlite_path": os.getenv("DB_SQLITE_PATH", "bank_local.db"),
         "server": os.getenv("DB_SERVER", "localhost"),
         "port": int(os.getenv("DB_PORT", "1433")),
         "database": os.getenv("DB_NAME", "BankDB"),
@@ -25,5 +28,69 @@ def load_config(env_path: Path | None = None) -> dict:
             "idle_timeout_ms": int(os.getenv("POOL_IDLE_TIMEOUT_MS", "300000")),
             "max_lifetime_ms": int(os.getenv("POOL_MAX_LIFETIME_MS", "1800000")),
             "connection_timeout_ms": int(os.getenv("POOL_CONNECTION_TIMEOUT_MS", "10000")),
+            # threads for async DAO calls; 0 means a quarter of POOL_MAX_SIZE, and never more than half of it
+            "async_workers": int(os.getenv("POOL_ASYNC_WORKERS", "0")),
+        },
+        "metrics": {
+            "enabled": os.getenv("DB_METRICS_ENABLED", "true").lower() in ("1", "true", "yes"),
+            "slow_query_ms": int(os.getenv("DB_SLOW_QUERY_MS", "500")),
+        },
+        "cache": {
+            # 0 disables the in-process AccountDAO read cache
+            "account_max_entries": int(os.getenv("ACCOUNT_CACHE_MAX_ENTRIES", "1024")),
+            "account_ttl_ms": int(os.getenv("ACCOUNT_CACHE_TTL_MS", "30000")),
+        },
+        "auth": {
+            # PBKDF2-SHA256 work factor for PIN hashes; stored hashes with another count are rehashed on login
+            "pin_hash_iterations": int(os.getenv("AUTH_PIN_HASH_ITERATIONS", "120000")),
+            # successful logins remembered in-process, so repeats skip the lookup and the hash (0 disables)
+            "cache_max_entries": int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000")),
+            "cache_ttl_ms": int(os.getenv("AUTH_CACHE_TTL_MS", "300000")),
+        },
+        "group_commit": {
+            # concurrent deposits to one account are committed together, up to max_batch per transaction
+            "enabled": os.getenv("GROUP_COMMIT_ENABLED", "true").lower() in ("1", "true", "yes"),
+            "max_batch": int(os.getenv("GROUP_COMMIT_MAX_BATCH", "100")),
+        },
+        "interest": {
+            # annual % credited monthly to SAVINGS accounts by InterestController.accrue
+            "savings_rate": os.getenv("SAVINGS_INTEREST_RATE", "1.50"),
+            "chunk_size": int(os.getenv("INTEREST_CHUNK_SIZE", "1000")),
+        },
+        "overdraft_buffer": {
+            # declined-attempt events are spilled locally and written in batches (one process per spill dir)
+            "enabled": os.getenv("OVERDRAFT_BUFFER_ENABLED", "true").lower() in ("1", "true", "yes"),
+            "max_events": int(os.getenv("OVERDRAFT_BUFFER_MAX_EVENTS", "500")),
+            "flush_ms": int(os.getenv("OVERDRAFT_BUFFER_FLUSH_MS", "1000")),
+            "spill_dir": os.getenv("OVERDRAFT_SPILL_DIR", "spill"),
+            "fsync": os.getenv("OVERDRAFT_SPILL_FSYNC", "true").lower() in ("1", "true", "yes"),
+        },
+        "retention": {
+            # purges archive to <archive_dir>/<table>/*.parquet, then delete batch_size rows per transaction
+            "batch_size": int(os.getenv("RETENTION_BATCH_SIZE", "1000")),
+            "pause_ms": int(os.getenv("RETENTION_PAUSE_MS", "0")),
+            "rows_per_file": int(os.getenv("RETENTION_ROWS_PER_FILE", "100000")),
+            "archive_dir": os.getenv("RETENTION_ARCHIVE_DIR", "archive"),
+        },
+        "statements": {
+            "out_dir": os.getenv("STATEMENT_DIR", "statements"),
+            # 0 uses one worker process per CPU
+            "workers": int(os.getenv("STATEMENT_WORKERS", "0")),
+            "range_size": int(os.getenv("STATEMENT_RANGE_SIZE", "500")),
+        },
+        "tiering": {
+            # transactions older than hot_days move to TransactionsArchive, chunk_size rows per transaction
+            "hot_days": int(os.getenv("TRANSACTION_HOT_DAYS", "365")),
+            "chunk_size": int(os.getenv("TIERING_CHUNK_SIZE", "5000")),
+            # readers cache the archive watermark this long; the mover waits as long after raising it
+            "watermark_ttl_ms": int(os.getenv("TIERING_WATERMARK_TTL_MS", "30000")),
+        },
+        "reports": {
+            # portfolio reports are cached per data watermark (newest ids, row counts, loan totals), read at
+            # most this often; the loan totals scan Loans, so keep this in seconds rather than milliseconds
+            "watermark_ttl_ms": int(os.getenv("REPORT_WATERMARK_TTL_MS", "30000")),
+            "cache_max_entries": int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "1000")),
+            # entries are rebuilt from scratch at least this often, whatever the watermark says
+            "cache_ttl_ms": int(os.getenv("REPORT_CACHE_TTL_MS", "3600000")),
         },
     }
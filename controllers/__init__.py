@@ -6,6 +6,13 @@ from .loan_controller import LoanController
 from .overdraft_controller import OverDraftController
 from .employee_controller import EmployeeController
 from .report_controller import ReportController
+from .overview_controller import OverviewController
+from .interest_controller import InterestController
+from .statement_controller import StatementController
+from .retention_controller import RetentionController
+from .tiering_controller import TieringController
+from .admin_controller import AdminController
+from .portfolio import AccountWithLoans, CustomerPortfolio
 
 __all__ = [
     "AuthController",
@@ -16,4 +23,12 @@ __all__ = [
     "OverDraftController",
     "EmployeeController",
     "ReportController",
+    "OverviewController",
+    "InterestController",
+    "StatementController",
+    "RetentionController",
+    "TieringController",
+    "AdminController",
+    "AccountWithLoans",
+    "CustomerPortfolio",
 ]
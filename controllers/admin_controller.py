@@ -1,4 +1,5 @@
 from daos import AuthDAO, AccountDAO, LoanDAO
+from controllers.portfolio import CustomerPortfolio, load_portfolios
 
 
 class AdminController:
@@ -13,6 +14,12 @@ class AdminController:
     def list_accounts_for_customer(self, customer_id: int):
         return self.account_dao.get_by_customer(customer_id)
 
+    def list_accounts_for_customers(self, customer_ids: list[int]):
+        return self.account_dao.get_by_customers(customer_ids)
+
+    def customer_portfolios(self, customer_ids: list[int] | None = None) -> list[CustomerPortfolio]:
+        return load_portfolios(self.auth_dao, self.account_dao, self.loan_dao, customer_ids)
+
     def update_account_status(self, account_number: str, status: str):
         self.account_dao.update_status(account_number, status)
 
@@ -21,3 +28,6 @@ class AdminController:
 
     def list_loans(self, account_number: str):
         return self.loan_dao.list_for_account(account_number)
+
+    def list_loans_for_accounts(self, account_numbers: list[str]):
+        return self.loan_dao.list_for_accounts(account_numbers)
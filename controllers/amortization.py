@@ -0,0 +1,219 @@
+"""
+Vectorized loan amortization over NumPy arrays, one element per loan.
+
+Money is carried as integer cents (int64) and rates as basis points of the annual
+percentage (4.50% -> 450), so every per-period step is exact integer arithmetic with
+half-up rounding to the cent. Only the level installment needs a power, computed in
+float64; the rare results that land within float error of a half cent are recomputed
+with Decimal. reference_schedule() is the Decimal implementation the arrays must match.
+
+Schedule rules: monthly rate = annual % / 1200; installment = P*r / (1 - (1+r)^-n) rounded
+half-up (P / n at 0%); each period's interest is rounded half-up on the opening balance;
+the final period pays whatever balance is left. Due dates fall on the start date's day of
+month (clamped to month end), the first one month after the start. Every loan needs a term of
+at least one month; the schema allows 0, so callers filter those out (see LoanController).
+"""
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+import numpy as np
+
+
+CENT = Decimal("0.01")
+RATE_SCALE = 120_000  # basis points of an annual % -> monthly fraction: rate_bp / 120000
+
+
+def _div_half_up(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    # Half-up integer division for non-negative numerators.
+    return (numerator * 2 + denominator) // (denominator * 2)
+
+
+def monthly_interest(balance_cents: np.ndarray, rate_bp: np.ndarray) -> np.ndarray:
+    return _div_half_up(balance_cents * rate_bp, RATE_SCALE)
+
+
+def _check_terms(term_months: np.ndarray):
+    if np.any(term_months <= 0):
+        raise ValueError("Loan term must be at least one month")
+
+
+def _reference_installment(principal: Decimal, rate: Decimal, term_months: int) -> Decimal:
+    if term_months <= 0:
+        raise ValueError("Loan term must be at least one month")
+    with localcontext() as ctx:
+        ctx.prec = 34
+        if rate == 0:
+            return (principal / term_months).quantize(CENT, ROUND_HALF_UP)
+        r = rate / Decimal(1200)
+        return (principal * r / (1 - (1 + r) ** -term_months)).quantize(CENT, ROUND_HALF_UP)
+
+
+def installments(principal_cents: np.ndarray, rate_bp: np.ndarray, term_months: np.ndarray) -> np.ndarray:
+    """
+    Level monthly installment in cents for each loan; raises ValueError for a term under one month.
+    """
+    _check_terms(term_months)
+    principal = principal_cents.astype(np.float64)
+    r = rate_bp.astype(np.float64) / RATE_SCALE
+    n = term_months.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.where(r > 0, principal * r / -np.expm1(-n * np.log1p(r)), principal / n)
+    result = np.floor(raw + 0.5).astype(np.int64)
+    # Too close to a half cent for float64 to round reliably: settle those in Decimal.
+    ambiguous = np.flatnonzero(np.abs(raw - np.floor(raw) - 0.5) < 1e-6 + raw * 1e-12)
+    for i in ambiguous:
+        exact = _reference_installment(
+            Decimal(int(principal_cents[i])) / 100, Decimal(int(rate_bp[i])) / 100, int(term_months[i])
+        )
+        result[i] = int(exact * 100)
+    return result
+
+
+def _by_periods_desc(periods: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Loan order by periods descending, and for each period p the number of loans with more than p
+    periods; stepping period p then only touches that prefix of the sorted arrays.
+    """
+    order = np.argsort(-periods, kind="stable")
+    descending = periods[order]
+    active = np.searchsorted(-descending, -np.arange(int(descending[0]) if len(descending) else 0), side="left")
+    return order, active
+
+
+def balances_after(
+    principal_cents: np.ndarray,
+    rate_bp: np.ndarray,
+    term_months: np.ndarray,
+    installment_cents: np.ndarray,
+    payments_made: np.ndarray,
+) -> np.ndarray:
+    """
+    Scheduled balance in cents after `payments_made` installments (0..term) of each loan.
+    Steps all loans one period at a time, so the loop runs max(payments_made) times, not once per loan.
+    """
+    order, active = _by_periods_desc(payments_made)
+    balance = principal_cents[order].astype(np.int64)
+    rate, term, installment = rate_bp[order], term_months[order], installment_cents[order]
+    for period, count in enumerate(active):
+        b = balance[:count]
+        interest = monthly_interest(b, rate[:count])
+        final = term[:count] == period + 1
+        b -= np.where(final, b, np.minimum(installment[:count] - interest, b))
+    result = np.empty_like(balance)
+    result[order] = balance
+    return result
+
+
+def project_payoff(
+    balance_cents: np.ndarray,
+    rate_bp: np.ndarray,
+    installment_cents: np.ndarray,
+    periods_left: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Months until each balance is paid off and the interest (cents) paid on the way, following the
+    schedule: the installment each month and whatever is left in the last of `periods_left` months.
+    """
+    order, active = _by_periods_desc(periods_left)
+    balance = balance_cents[order].astype(np.int64)
+    rate, installment, left = rate_bp[order], installment_cents[order], periods_left[order]
+    months = np.zeros(balance.shape, dtype=np.int64)
+    interest_total = np.zeros(balance.shape, dtype=np.int64)
+    for period, count in enumerate(active):
+        b = balance[:count]
+        owing = b > 0
+        interest = monthly_interest(b, rate[:count])
+        final = left[:count] == period + 1
+        b -= np.where(final, b, np.minimum(installment[:count] - interest, b))
+        interest_total[:count] += np.where(owing, interest, 0)
+        months[:count] += owing
+    result_months, result_interest = np.empty_like(months), np.empty_like(interest_total)
+    result_months[order], result_interest[order] = months, interest_total
+    return result_months, result_interest
+
+
+def schedule(principal_cents: np.ndarray, rate_bp: np.ndarray, term_months: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Full schedules as (loans, max term) arrays of payment, interest, principal and closing balance
+    in cents; periods past a loan's term are zero. Memory grows with loans x term, so callers
+    schedule large books in slices.
+    """
+    count, width = len(principal_cents), int(term_months.max(initial=0))
+    installment = installments(principal_cents, rate_bp, term_months)
+    out = {name: np.zeros((count, width), dtype=np.int64) for name in ("payment", "interest", "principal", "balance")}
+    balance = principal_cents.astype(np.int64).copy()
+    for period in range(width):
+        active = period < term_months
+        interest = np.where(active, monthly_interest(balance, rate_bp), 0)
+        final = period == term_months - 1
+        principal_part = np.where(active, np.where(final, balance, np.minimum(installment - interest, balance)), 0)
+        balance = balance - principal_part
+        out["payment"][:, period] = principal_part + interest
+        out["interest"][:, period] = interest
+        out["principal"][:, period] = principal_part
+        out["balance"][:, period] = np.where(active, balance, 0)
+    return out
+
+
+def reference_schedule(principal: Decimal, rate: Decimal, term_months: int) -> list[dict]:
+    """
+    Decimal implementation of the same schedule, one dict per period, for checking the arrays.
+    """
+    installment = _reference_installment(principal, rate, term_months)
+    balance = principal
+    rows = []
+    for period in range(1, term_months + 1):
+        interest = (balance * rate / Decimal(1200)).quantize(CENT, ROUND_HALF_UP)
+        principal_part = balance if period == term_months else min(installment - interest, balance)
+        balance -= principal_part
+        rows.append(
+            {
+                "period": period,
+                "payment": principal_part + interest,
+                "interest": interest,
+                "principal": principal_part,
+                "balance": balance,
+            }
+        )
+    return rows
+
+
+def add_months(start: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """
+    datetime64 start + whole months, keeping the day of month (clamped to month end) and time of day.
+    """
+    start = start.astype("datetime64[us]")
+    start_day = start.astype("datetime64[D]")
+    start_month = start.astype("datetime64[M]")
+    target_month = start_month + months.astype("timedelta64[M]")
+    month_length = ((target_month + 1).astype("datetime64[D]") - target_month.astype("datetime64[D]")).astype(np.int64)
+    day = np.minimum((start_day - start_month.astype("datetime64[D]")).astype(np.int64), month_length - 1)
+    return target_month.astype("datetime64[D]") + day.astype("timedelta64[D]") + (start - start_day)
+
+
+def payments_due(start: np.ndarray, term_months: np.ndarray, as_of: datetime) -> np.ndarray:
+    """
+    Installments falling due on or before `as_of` (0..term) for loans starting at `start`.
+    """
+    start = start.astype("datetime64[us]")
+    as_of64 = np.datetime64(as_of, "us")
+    months = (as_of64.astype("datetime64[M]") - start.astype("datetime64[M]")).astype(np.int64)
+    months = np.where(add_months(start, months) > as_of64, months - 1, months)
+    return np.clip(months, 0, term_months)
+
+
+def amortize(
+    principal_cents: np.ndarray,
+    rate_bp: np.ndarray,
+    term_months: np.ndarray,
+    start: np.ndarray,
+    as_of: datetime,
+) -> dict[str, np.ndarray]:
+    """
+    Installment, scheduled balance and next due date (NaT once paid off) of every loan as of `as_of`.
+    """
+    installment = installments(principal_cents, rate_bp, term_months)
+    paid = payments_due(start, term_months, as_of)
+    balance = balances_after(principal_cents, rate_bp, term_months, installment, paid)
+    next_due = add_months(start, paid + 1)
+    next_due[paid >= term_months] = np.datetime64("NaT")
+    return {"installment": installment, "payments_made": paid, "balance": balance, "next_due_date": next_due}
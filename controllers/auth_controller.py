@@ -1,7 +1,13 @@
-from dataclasses import dataclass
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass, replace
 from typing import Optional
-from daos import AuthDAO, EmployeeDAO, AccountDAO
+from config import load_config
+from daos import AuthDAO, EmployeeDAO
 from entities import Customer, Account, Employee
+from infra.cache import TTLCache
+from infra.pin_hash import hash_pin, needs_rehash, verify_pin
 
 
 @dataclass
@@ -12,20 +18,102 @@ class SessionContext:
     accounts: list[Account]
 
 
+_cache: TTLCache | None = None
+_CACHE_SECRET = os.urandom(32)  # per process: cache keys cannot be matched against guessed PINs elsewhere
+
+
+def _login_cache() -> TTLCache:
+    """
+    Bounded cache of verified sign-ins: HMAC(username, pin) -> (role, id, pin_hash). A repeated login
+    (a storm of retries after an outage, say) still runs the one-query principal lookup but skips the PIN
+    hash when the principal is still ACTIVE with the same pin_hash; only successes are cached. Entries are
+    tagged (role, id) so a credential or status change made here can drop them; one made elsewhere no
+    longer matches the lookup.
+    """
+    global _cache
+    if _cache is None:
+        cfg = load_config()["auth"]
+        _cache = TTLCache(cfg["cache_max_entries"], cfg["cache_ttl_ms"] / 1000)
+    return _cache
+
+
+def invalidate_logins(*principals: tuple[str, int]):
+    """
+    Forget cached sign-ins of these (role, id) principals, e.g. ("customer", 42).
+    """
+    _login_cache().invalidate_tags(*principals)
+
+
+def _principal_id(candidate: dict) -> int:
+    principal = candidate["principal"]
+    return principal.customer_id if candidate["role"] == "customer" else principal.employee_id
+
+
+def _session(candidate: dict) -> SessionContext:
+    if candidate["role"] == "customer":
+        customer = replace(candidate["principal"], pin="")  # credentials stay out of the session
+        return SessionContext(role="customer", customer=customer, employee=None, accounts=candidate["accounts"])
+    return SessionContext(role="employee", customer=None, employee=candidate["principal"], accounts=[])
+
+
 class AuthController:
     def __init__(self):
         self.customer_auth = AuthDAO()
         self.employee_auth = EmployeeDAO()
-        self.account_dao = AccountDAO()
+        self.pin_hash_iterations = load_config()["auth"]["pin_hash_iterations"]
+
+    def _verify(self, candidate: dict, pin: str) -> str | None:
+        """
+        The principal's pin_hash when `pin` matches (after any upgrade), else None.
+        """
+        # Legacy rows still hold a plaintext pin; a successful login replaces it with a salted hash,
+        # as it does a hash made with an outdated work factor.
+        stored = candidate["pin_hash"]
+        if stored:
+            matched = verify_pin(pin, stored)
+        else:
+            matched = bool(candidate["pin"]) and hmac.compare_digest(candidate["pin"].encode("utf-8"), pin.encode("utf-8"))
+        if not matched:
+            return None
+        if not stored or needs_rehash(stored, self.pin_hash_iterations):
+            stored = hash_pin(pin, self.pin_hash_iterations)
+            if candidate["role"] == "customer":
+                principal = ("customer", candidate["principal"].customer_id)
+                self.customer_auth.set_pin_hash(principal[1], stored)
+            else:
+                principal = ("employee", candidate["principal"].employee_id)
+                self.employee_auth.set_pin_hash(principal[1], stored)
+            invalidate_logins(principal)
+        return stored
 
     def login(self, username: str, pin: str) -> SessionContext | None:
-        customer = self.customer_auth.authenticate(username=username, pin=pin)
-        if customer:
-            accounts = self.account_dao.get_by_customer(customer.customer_id)
-            return SessionContext(role="customer", customer=customer, employee=None, accounts=accounts)
+        """
+        Resolve customer or employee (customers first, as before) and a customer's accounts in one query,
+        then check the PIN against its salted hash in Python, outside any pooled connection.
+        """
+        cache = _login_cache()
+        key = hmac.new(_CACHE_SECRET, f"{username}\0{pin}".encode("utf-8"), hashlib.sha256).digest()
+        cached = cache.get(key) if cache.enabled else None
+        generation = cache.generation()
+        candidates = self.customer_auth.lookup_principals(username)
+        if cached is not None:
+            # The lookup only returns ACTIVE principals, so deactivation or a PIN change made outside this
+            # process ends the cached sign-in without another query.
+            for candidate in candidates:
+                if (candidate["role"], _principal_id(candidate)) == cached[:2] and candidate["pin_hash"] == cached[2]:
+                    return _session(candidate)
+            invalidate_logins(cached[:2])
 
-        employee = self.employee_auth.authenticate(username=username, pin=pin)
-        if employee:
-            return SessionContext(role="employee", customer=None, employee=employee, accounts=[])
+        for candidate in candidates:
+            pin_hash = self._verify(candidate, pin)
+            if pin_hash is None:
+                continue
+            principal = (candidate["role"], _principal_id(candidate))
+            cache.put(key, (*principal, pin_hash), tags=[principal], generation=generation)
+            return _session(candidate)
 
         return None
+
+    @staticmethod
+    def cache_stats() -> dict:
+        return _login_cache().stats()
@@ -1,5 +1,10 @@
+from typing import Callable
+from config import load_config
 from daos import AuthDAO, AccountDAO, LoanDAO, OverDraftEventDAO
 from entities import Customer
+from controllers.portfolio import CustomerPortfolio, load_portfolios
+from controllers.retention_controller import RetentionController
+from infra.pin_hash import hash_pin
 
 
 class EmployeeController:
@@ -25,21 +30,27 @@ class EmployeeController:
     ) -> Customer:
         self.customer_dao.create_customer(
             username=username,
-            pin=pin,
+            pin_hash=hash_pin(pin, load_config()["auth"]["pin_hash_iterations"]),
             name=name,
             email=email,
             phone=phone,
             address=address,
             national_id=national_id,
         )
-        return self.customer_dao.authenticate(username=username, pin=pin)  # return the newly created record
+        return self.customer_dao.get_by_username(username)  # return the newly created record
 
     def list_accounts_for_customer(self, customer_id: int):
         return self.account_dao.get_by_customer(customer_id)
 
+    def customer_portfolios(self, customer_ids: list[int] | None = None) -> list[CustomerPortfolio]:
+        return load_portfolios(self.customer_dao, self.account_dao, self.loan_dao, customer_ids)
+
     def list_all_loans(self):
         return self.loan_dao.list_all()
 
+    def list_all_loans_columns(self) -> dict[str, list]:
+        return self.loan_dao.list_all_columns()
+
     def update_loan_status(self, loan_id: int, status: str):
         self.loan_dao.update_status(loan_id, status)
 
@@ -49,5 +60,8 @@ class EmployeeController:
     def delete_pending_loan(self, loan_id: int):
         self.loan_dao.delete_pending(loan_id)
 
-    def delete_overdraft_events(self, days: int):
-        self.overdraft_dao.delete_older_than_days(days)
+    def delete_overdraft_events(self, days: int, progress: Callable[[dict], None] | None = None) -> dict:
+        """
+        Archive and purge overdraft events older than `days` in short batches (see RetentionController).
+        """
+        return RetentionController().purge_overdraft_events(days, progress=progress)
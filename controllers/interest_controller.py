@@ -0,0 +1,84 @@
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from config import load_config
+from daos import InterestAccrualDAO
+
+
+class InterestController:
+    """
+    Monthly interest accrual for SAVINGS accounts, posted in bounded chunks (one transaction each).
+    A run is keyed by its period; rerunning an interrupted period resumes after the last committed chunk,
+    and rerunning a completed period posts nothing.
+    """
+
+    def __init__(self):
+        self.dao = InterestAccrualDAO()
+        cfg = load_config()["interest"]
+        self.default_rate = cfg["savings_rate"]
+        self.default_chunk_size = cfg["chunk_size"]
+
+    def accrue(
+        self,
+        period: str | None = None,
+        rate: Decimal | None = None,
+        chunk_size: int | None = None,
+        performed_by: str = "interest-accrual",
+        max_chunks: int | None = None,
+    ) -> dict:
+        """
+        Post interest for `period` (YYYY-MM, default the current month) and report progress and throughput.
+        `max_chunks` stops early (the run stays resumable), e.g. to spread a large book over several windows.
+        """
+        period = period or datetime.utcnow().strftime("%Y-%m")
+        try:
+            datetime.strptime(period, "%Y-%m")
+        except ValueError:
+            raise ValueError("Period must be in YYYY-MM format") from None
+        try:
+            rate = Decimal(rate if rate is not None else self.default_rate)
+        except InvalidOperation:
+            raise ValueError("Interest rate must be a number") from None
+        if rate < 0:
+            raise ValueError("Interest rate cannot be negative")
+        chunk_size = chunk_size or self.default_chunk_size
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than zero")
+
+        run = self.dao.start_run(period, rate)
+        stats = {
+            "period": period,
+            "rate": run["rate"],  # a resumed run keeps the rate it started with
+            "resumed_from": run["last_account_number"],
+            "chunks": 0,
+            "accounts_scanned": 0,
+            "accounts_posted": 0,
+            "interest_posted": Decimal("0"),
+            "completed": run["completed_at"] is not None,
+            "checkpoint_moves": 0,
+        }
+        started = time.perf_counter()
+        after = run["last_account_number"] or ""
+        while not stats["completed"] and (max_chunks is None or stats["chunks"] < max_chunks):
+            chunk = self.dao.accrue_chunk(period, run["rate"], after, chunk_size, performed_by)
+            if chunk["checkpoint_moved"]:
+                # Another runner (CLI job, employee page) advanced this period; continue from its checkpoint.
+                run = self.dao.get_run(period)
+                stats["checkpoint_moves"] += 1
+                stats["completed"] = run["completed_at"] is not None
+                after = run["last_account_number"] or ""
+                continue
+            stats["chunks"] += 1
+            stats["accounts_scanned"] += chunk["scanned"]
+            stats["accounts_posted"] += len(chunk["posted"])
+            stats["interest_posted"] += sum((amount for _, amount in chunk["posted"]), Decimal("0"))
+            stats["completed"] = chunk["scanned"] < chunk_size
+            after = chunk["last_account"] or after
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 3)
+        stats["accounts_per_sec"] = round(stats["accounts_scanned"] / elapsed, 1) if elapsed and stats["accounts_scanned"] else None
+        return stats
+
+    def run_status(self, period: str) -> dict | None:
+        return self.dao.get_run(period)
+
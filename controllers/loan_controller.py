@@ -1,13 +1,17 @@
+import time
 from datetime import datetime
 from decimal import Decimal
+import numpy as np
+from controllers import amortization
 from infra.db import get_engine
-from daos import LoanDAO, AccountDAO
+from daos import AsyncDAO, LoanDAO, AccountDAO
 from entities import Loan
 
 
 class LoanController:
     def __init__(self):
         self.loan_dao = LoanDAO()
+        self.async_loan_dao = AsyncDAO(self.loan_dao)
         self.account_dao = AccountDAO()
         self.engine = get_engine()
 
@@ -42,5 +46,100 @@ class LoanController:
     def list_loans(self, account_number: str) -> list[Loan]:
         return self.loan_dao.list_for_account(account_number)
 
+    def list_loans_columns(self, account_number: str) -> dict[str, list]:
+        return self.loan_dao.list_for_account_columns(account_number)
+
+    async def list_loans_columns_for_accounts_async(self, account_numbers: list[str]) -> dict[str, dict[str, list]]:
+        return await self.async_loan_dao.list_for_accounts_columns(account_numbers)
+
     def update_status(self, loan_id: int, status: str):
         self.loan_dao.update_status(loan_id, status)
+
+    def run_amortization(self, as_of: datetime | None = None, batch_size: int = 100_000) -> dict:
+        """
+        Bring balance_remaining and next_due_date of every APPROVED loan to its schedule as of `as_of`
+        (default now), a batch of loans per transaction. Loans without a term (term_months 0, which the
+        schema allows) have no schedule; they are left as they are and listed in `skipped`.
+        Returns counts and throughput.
+        """
+        as_of = as_of or datetime.utcnow()
+        started = time.perf_counter()
+        loans = batches = 0
+        skipped: list[int] = []
+        for columns in self.loan_dao.iter_amortization_inputs(batch_size):
+            term = np.asarray(columns["term_months"], dtype=np.int64)
+            valid = term > 0
+            loan_ids = np.asarray(columns["loan_id"], dtype=np.int64)
+            skipped += loan_ids[~valid].tolist()
+            result = amortization.amortize(
+                np.asarray(columns["principal_cents"], dtype=np.int64)[valid],
+                np.asarray(columns["rate_bp"], dtype=np.int64)[valid],
+                term[valid],
+                np.asarray(columns["start_date"], dtype="datetime64[us]")[valid],
+                as_of,
+            )
+            rows = [
+                {"loan_id": loan_id, "balance_cents": balance, "next_due_date": next_due}
+                for loan_id, balance, next_due in zip(
+                    loan_ids[valid].tolist(), result["balance"].tolist(), result["next_due_date"].tolist()
+                )
+            ]
+            self.loan_dao.apply_amortization(rows)
+            loans += len(rows)
+            batches += 1
+        elapsed = time.perf_counter() - started
+        return {
+            "loans": loans,
+            "skipped": skipped,
+            "batches": batches,
+            "seconds": round(elapsed, 3),
+            "loans_per_sec": round(loans / elapsed, 1) if elapsed else None,
+        }
+
+    def schedule(self, loan_id: int) -> dict[str, list]:
+        """
+        Full repayment schedule of one loan as column arrays (period, due date, payment, interest, principal, balance).
+        """
+        loan = self.loan_dao.get_by_id(loan_id)
+        if not loan:
+            raise ValueError("Loan not found")
+        if loan.term_months <= 0:
+            raise ValueError("Loan has no repayment term, so it has no schedule")
+        term = np.array([loan.term_months])
+        rows = amortization.schedule(np.array([int(loan.principal * 100)]), np.array([int(loan.rate * 100)]), term)
+        periods = np.arange(1, loan.term_months + 1)
+        due = amortization.add_months(np.repeat(np.datetime64(loan.start_date, "us"), loan.term_months), periods)
+        columns = {"period": periods.tolist(), "due_date": due.tolist()}
+        for name in ("payment", "interest", "principal", "balance"):
+            columns[name] = [Decimal(cents).scaleb(-2) for cents in rows[name][0].tolist()]
+        return columns
+
+    def with_projections(self, columns: dict[str, list], as_of: datetime | None = None) -> dict[str, list]:
+        """
+        Add installment, projected payoff date and remaining interest to loan column arrays
+        (as returned by list_loans_columns), projecting from each loan's current balance.
+        Loans without a term get None in the added columns.
+        """
+        if not columns["loan_id"]:
+            return {**columns, "installment": [], "payoff_date": [], "interest_remaining": []}
+        term = np.asarray(columns["term_months"], dtype=np.int64)
+        valid = term > 0
+        principal = np.array([int(v * 100) for v in columns["principal"]], dtype=np.int64)[valid]
+        balance = np.array([int(v * 100) for v in columns["balance_remaining"]], dtype=np.int64)[valid]
+        rate = np.array([int(v * 100) for v in columns["rate"]], dtype=np.int64)[valid]
+        start = np.asarray(columns["start_date"], dtype="datetime64[us]")[valid]
+        term = term[valid]
+        installment = amortization.installments(principal, rate, term)
+        paid = amortization.payments_due(start, term, as_of or datetime.utcnow())
+        months, interest = amortization.project_payoff(balance, rate, installment, term - paid)
+        payoff = amortization.add_months(start, paid + months)
+        payoff[months == 0] = np.datetime64("NaT")
+        projected = {
+            "installment": iter([Decimal(c).scaleb(-2) for c in installment.tolist()]),
+            "payoff_date": iter(payoff.tolist()),
+            "interest_remaining": iter([Decimal(c).scaleb(-2) for c in interest.tolist()]),
+        }
+        return {
+            **columns,
+            **{name: [next(values) if ok else None for ok in valid.tolist()] for name, values in projected.items()},
+        }
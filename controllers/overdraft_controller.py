@@ -1,10 +1,24 @@
-from daos import OverDraftEventDAO
+from daos import AsyncDAO, OverDraftEventDAO
 from entities import OverDraftEvent
 
 
 class OverDraftController:
     def __init__(self):
         self.dao = OverDraftEventDAO()
+        self.async_dao = AsyncDAO(self.dao)
 
     def list_events(self, account_number: str) -> list[OverDraftEvent]:
         return self.dao.list_for_account(account_number)
+
+    def list_events_columns(self, account_number: str) -> dict[str, list]:
+        return self.dao.list_for_account_columns(account_number)
+
+    async def list_events_columns_for_accounts_async(self, account_numbers: list[str]) -> dict[str, dict[str, list]]:
+        return await self.async_dao.list_for_accounts_columns(account_numbers)
+
+    def flush_buffered(self) -> int:
+        """
+        Write declined-attempt events still waiting in the write-behind buffer, including any a crash left
+        in the spill files.
+        """
+        return self.dao.flush_buffer()
@@ -0,0 +1,30 @@
+import asyncio
+from controllers.loan_controller import LoanController
+from controllers.overdraft_controller import OverDraftController
+
+
+class OverviewController:
+    """
+    Per-account data for a customer's overview page: the loans and the overdraft events of all the
+    accounts, one batched query each, issued concurrently rather than one after another.
+    """
+
+    def __init__(self):
+        self.loans = LoanController()
+        self.overdrafts = OverDraftController()
+
+    async def load_async(self, account_numbers: list[str]) -> dict[str, dict]:
+        loans, events = await asyncio.gather(
+            self.loans.list_loans_columns_for_accounts_async(account_numbers),
+            self.overdrafts.list_events_columns_for_accounts_async(account_numbers),
+        )
+        return {n: {"loans": loans[n], "overdraft_events": events[n]} for n in account_numbers}
+
+    def load(self, account_numbers: list[str]) -> dict[str, dict]:
+        return asyncio.run(self.load_async(account_numbers))
+
+    def load_serial(self, account_numbers: list[str]) -> dict[str, dict]:
+        return {
+            n: {"loans": self.loans.list_loans_columns(n), "overdraft_events": self.overdrafts.list_events_columns(n)}
+            for n in account_numbers
+        }
@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from daos import AuthDAO, AccountDAO, LoanDAO
+from entities import Account, Customer, Loan
+
+
+@dataclass
+class AccountWithLoans:
+    account: Account
+    loans: list[Loan] = field(default_factory=list)
+
+
+@dataclass
+class CustomerPortfolio:
+    customer: Customer
+    accounts: list[AccountWithLoans] = field(default_factory=list)
+
+
+def load_portfolios(
+    customer_dao: AuthDAO,
+    account_dao: AccountDAO,
+    loan_dao: LoanDAO,
+    customer_ids: list[int] | None = None,
+) -> list[CustomerPortfolio]:
+    """
+    Customer -> accounts -> loans tree in three batched lookups (one query per 1000 ids at each
+    level) instead of one accounts query per customer and one loans query per account.
+    All customers when `customer_ids` is None.
+    """
+    customers = customer_dao.list_all() if customer_ids is None else customer_dao.get_many(customer_ids)
+    accounts = account_dao.get_by_customers([c.customer_id for c in customers])
+    loans = loan_dao.list_for_accounts([a.account_number for owned in accounts.values() for a in owned])
+    return [
+        CustomerPortfolio(
+            customer=c,
+            accounts=[AccountWithLoans(account=a, loans=loans[a.account_number]) for a in accounts[c.customer_id]],
+        )
+        for c in customers
+    ]
@@ -1,4 +1,35 @@
-from daos import ReportingDAO
+from typing import Callable, Hashable
+from config import load_config
+from controllers.auth_controller import AuthController
+from daos import AccountDAO, OverDraftEventDAO, ReportingDAO, TransactionDAO
+from infra.cache import TTLCache
+from infra.db import pool_stats
+from infra.metrics import metrics
+from infra.write_behind import write_behind_prometheus_text
+
+
+_cache: TTLCache | None = None
+_watermark_cache: TTLCache | None = None
+
+
+def _report_cache() -> TTLCache:
+    """
+    Portfolio report results, each stored with the data watermark it was computed at. An entry whose
+    watermark still matches is served as is; otherwise only the rows past its watermark are read and
+    merged in, and the entry's TTL bounds how long incremental merges go without a full rebuild.
+    """
+    global _cache
+    if _cache is None:
+        cfg = load_config()["reports"]
+        _cache = TTLCache(cfg["cache_max_entries"], cfg["cache_ttl_ms"] / 1000)
+    return _cache
+
+
+def _watermarks() -> TTLCache:
+    global _watermark_cache
+    if _watermark_cache is None:
+        _watermark_cache = TTLCache(1, load_config()["reports"]["watermark_ttl_ms"] / 1000)
+    return _watermark_cache
 
 
 class ReportController:
@@ -7,3 +38,138 @@ class ReportController:
 
     def account_summary(self, account_number: str) -> dict | None:
         return self.dao.account_summary(account_number)
+
+    def rebuild_summaries(self):
+        self.dao.rebuild_account_summaries()
+
+    def data_watermark(self) -> dict:
+        """
+        ReportingDAO.report_watermark, read at most once per REPORT_WATERMARK_TTL_MS.
+        """
+        cache = _watermarks()
+        cached = cache.get("watermark")
+        if cached is None:
+            cached = self.dao.report_watermark()
+            cache.put("watermark", cached)
+        return cached
+
+    def _cached(self, key: Hashable, mark: tuple, build: Callable[[], object], merge: Callable[[dict], object | None] | None = None):
+        # `merge(entry)` folds changes since entry["since"] into entry["value"], or returns None to force a rebuild.
+        # Deltas are read from the watermark before the entry's last one, so a row whose id was assigned
+        # before a watermark was read but committed after it is still picked up on the next refresh.
+        cache = _report_cache()
+        entry = cache.get(key) if cache.enabled else None
+        if entry is not None and entry["mark"] == mark:
+            return entry["value"]
+        generation = cache.generation()
+        value = merge(entry) if entry is not None and merge is not None else None
+        if value is None:
+            value, since = build(), mark
+        else:
+            since = entry["mark"]
+        cache.put(key, {"mark": mark, "since": since, "value": value}, generation=generation)
+        return value
+
+    def overdraft_counts(self) -> list[dict]:
+        """
+        Customers with overdraft events, most events first. New events are counted onto the cached
+        totals; a purge (the event count fell behind the ids) triggers a full recount.
+        """
+        wm = self.data_watermark()
+
+        def build():
+            return sorted(self.dao.overdraft_counts_by_customer(), key=lambda r: (-r["overdraft_events"], r["customer_id"]))
+
+        def merge(entry):
+            new = self.dao.overdraft_counts_by_customer(after_id=entry["mark"][0])
+            if entry["mark"][1] + sum(r["overdraft_events"] for r in new) != wm["overdraft_events"]:
+                return None
+            counts = {r["customer_id"]: dict(r) for r in entry["value"]}
+            for r in new:
+                row = counts.setdefault(r["customer_id"], {**r, "overdraft_events": 0})
+                row["overdraft_events"] += r["overdraft_events"]
+            return sorted(counts.values(), key=lambda r: (-r["overdraft_events"], r["customer_id"]))
+
+        return self._cached("overdraft_counts", (wm["last_event_id"], wm["overdraft_events"]), build, merge)
+
+    def accounts_above_average(self) -> list[dict]:
+        """
+        Accounts whose balance is above the average over all accounts, largest first. Balances are kept
+        per account, so a refresh re-reads only the accounts posted to since the cached watermark;
+        opening an account (which may not post a transaction) triggers a full reload.
+        """
+        wm = self.data_watermark()
+
+        def above(balances: dict) -> dict:
+            # balance > total / count, compared exactly rather than against a rounded AVG.
+            total, count = sum(balances.values()), len(balances)
+            rows = [{"account_number": a, "balance": b} for a, b in balances.items() if b * count > total]
+            rows.sort(key=lambda r: (-r["balance"], r["account_number"]))
+            return {"balances": balances, "rows": rows}
+
+        def build():
+            return above({r["account_number"]: r["balance"] for r in self.dao.account_balances()})
+
+        def merge(entry):
+            if len(entry["value"]["balances"]) != wm["accounts"]:
+                return None
+            balances = dict(entry["value"]["balances"])
+            balances.update((r["account_number"], r["balance"]) for r in self.dao.account_balances(after_id=entry["since"][0]))
+            return above(balances)
+
+        return self._cached("accounts_above_average", (wm["last_transaction_id"], wm["accounts"]), build, merge)["rows"]
+
+    def loans_above_approved_average(self) -> list[dict]:
+        """
+        Loans whose remaining balance is above the average of approved loans. Loan updates carry no
+        id to read past, so any change to the loans watermark recomputes the (single-query) report.
+        """
+        wm = self.data_watermark()
+        mark = (wm["last_loan_id"], wm["loans"], wm["approved_loans"], wm["loan_balance"])
+        return self._cached("loans_above_approved_average", mark, self.dao.loans_above_approved_average)
+
+    def customer_history(self, customer_id: int) -> list[dict]:
+        """
+        Every transaction on the customer's accounts, archived ones included, newest first. A refresh
+        reads only transactions posted since the cached watermark and merges them in.
+        """
+        wm = self.data_watermark()
+
+        def merge(entry):
+            new = self.dao.customer_history(customer_id, after_id=entry["since"][0])
+            if not new:
+                return entry["value"]
+            seen = {r["transaction_id"] for r in new}
+            rows = new + [r for r in entry["value"] if r["transaction_id"] not in seen]
+            rows.sort(key=lambda r: (r["timestamp"], r["transaction_id"]), reverse=True)
+            return rows
+
+        return self._cached(("customer_history", customer_id), (wm["last_transaction_id"],), lambda: self.dao.customer_history(customer_id), merge)
+
+    @staticmethod
+    def report_cache_stats() -> dict:
+        return _report_cache().stats()
+
+    def db_metrics(self) -> dict:
+        """
+        JSON-ready snapshot of statement latency, slow queries, pool state and maintenance, the account
+        read cache, the login verification cache, the portfolio report cache, the overdraft write-behind buffer and deposit group
+        commit (those two None until first used).
+        """
+        snapshot = metrics.snapshot()
+        snapshot["pool"] = {**pool_stats(), **snapshot["pool"]}
+        return {
+            **snapshot,
+            "account_cache": AccountDAO.cache_stats(),
+            "login_cache": AuthController.cache_stats(),
+            "report_cache": ReportController.report_cache_stats(),
+            "overdraft_buffer": OverDraftEventDAO.buffer_stats(),
+            "group_commit": TransactionDAO.group_commit_stats(),
+        }
+
+    def db_metrics_prometheus(self) -> str:
+        text = metrics.prometheus_text()
+        buffer = OverDraftEventDAO.buffer_stats()
+        if buffer:
+            text += write_behind_prometheus_text("overdraft", buffer)
+        return text
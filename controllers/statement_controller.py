@@ -0,0 +1,267 @@
+import csv
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from config import load_config
+from daos import AccountDAO, OverDraftEventDAO, TransactionDAO, TransferDAO
+from daos.reporting_dao import INFLOW_TYPES
+from entities import Account
+from infra.pdf import TextPDF
+
+
+FORMATS = ("csv", "pdf")
+CSV_COLUMNS = ("section", "timestamp", "id", "type", "counterparty", "amount", "balance", "reference", "note")
+
+
+def period_bounds(period: str) -> tuple[datetime, datetime]:
+    """
+    [first instant of the month, first instant of the next month) for a YYYY-MM period.
+    """
+    try:
+        start = datetime.strptime(period, "%Y-%m")
+    except ValueError:
+        raise ValueError("Period must be in YYYY-MM format") from None
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+
+def statement_paths(out_dir: Path, account_number: str, formats: tuple[str, ...]) -> dict[str, Path]:
+    return {fmt: out_dir / f"{account_number}.{fmt}" for fmt in formats}
+
+
+def _ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _StatementWriter:
+    """
+    Writes one account's statement to every requested format in a single pass over the rows,
+    into .<run_id>.tmp files that are renamed into place only once complete (or removed on failure).
+    """
+
+    def __init__(self, paths: dict[str, Path], title: str, run_id: str):
+        self.paths = paths
+        self.run_id = run_id
+        self.files = {}
+        self.csv = self.pdf = None
+        if "csv" in paths:
+            self.files["csv"] = open(self._tmp(paths["csv"]), "w", newline="", encoding="utf-8")
+            self.csv = csv.writer(self.files["csv"], lineterminator="\n")
+            self.csv.writerow(CSV_COLUMNS)
+        if "pdf" in paths:
+            self.files["pdf"] = open(self._tmp(paths["pdf"]), "wb")
+            self.pdf = TextPDF(self.files["pdf"], title)
+
+    def _tmp(self, path: Path) -> Path:
+        # Named per run, so concurrent runs over the same directory never touch each other's partial files.
+        return path.with_suffix(f"{path.suffix}.{self.run_id}.tmp")
+
+    def row(self, *fields):
+        """
+        One CSV row in CSV_COLUMNS order; missing trailing fields and None are written empty.
+        """
+        if self.csv:
+            fields = ["" if value is None else value for value in fields]
+            self.csv.writerow(fields + [""] * (len(CSV_COLUMNS) - len(fields)))
+
+    def text(self, line: str = ""):
+        if self.pdf:
+            self.pdf.line(line)
+
+    def commit(self):
+        if self.pdf:
+            self.pdf.close()
+        for fmt, fh in self.files.items():
+            fh.flush()
+            os.fsync(fh.fileno())
+            fh.close()
+        # The last rename marks the account done, so a crash in between only means it is rendered again.
+        for fmt, path in self.paths.items():
+            os.replace(self._tmp(path), path)
+
+    def abort(self):
+        for fmt, fh in self.files.items():
+            fh.close()
+            self._tmp(self.paths[fmt]).unlink(missing_ok=True)
+
+
+def render_statement(
+    account: Account,
+    period: str,
+    start: datetime,
+    end: datetime,
+    paths: dict[str, Path],
+    batch_size: int = 1000,
+    run_id: str = "0",
+) -> int:
+    """
+    Render one account's statement for [start, end) to `paths` ({format: path}) and return the rows written.
+    Transactions, transfers and overdraft events are streamed oldest first, so memory does not grow with
+    the account's activity. Everything printed is as of the period (the ledger, plus the account's fixed
+    type and currency; not its current status or balance), so rerunning a period reproduces the same bytes.
+    """
+    txn_dao, transfer_dao, overdraft_dao = TransactionDAO(), TransferDAO(), OverDraftEventDAO()
+    opening = txn_dao.balance_before(account.account_number, start)
+    if opening is None:
+        opening = Decimal("0.00")  # no ledger rows at all: every balance_after chain starts at zero
+    writer = _StatementWriter(paths, f"Statement {account.account_number} {period}", run_id)
+    try:
+        writer.text(f"STATEMENT {period}  account {account.account_number}")
+        writer.text(f"{account.account_type} / {account.currency}   {_ts(start)} to {_ts(end)} (exclusive)")
+        writer.text()
+        writer.text(f"Opening balance {opening:>58.2f}")
+        writer.row("summary", _ts(start), "", "OPENING_BALANCE", "", "", f"{opening:.2f}")
+
+        rows, closing = 0, opening
+        total_in, total_out = Decimal("0"), Decimal("0")
+        writer.text()
+        writer.text("TRANSACTIONS")
+        writer.text(f"{'date':<19} {'id':>10} {'type':<12} {'amount':>14} {'balance':>14}  reference")
+        for t in txn_dao.iter_for_period(account.account_number, start, end, batch_size):
+            signed = t.amount if t.transaction_type in INFLOW_TYPES else -t.amount
+            if signed > 0:
+                total_in += signed
+            else:
+                total_out -= signed
+            closing = t.balance_after
+            rows += 1
+            writer.row("transaction", _ts(t.timestamp), t.transaction_id, t.transaction_type, "", f"{signed:.2f}", f"{t.balance_after:.2f}", t.reference_code, t.note)
+            writer.text(f"{_ts(t.timestamp)} {t.transaction_id:>10} {t.transaction_type:<12} {signed:>14.2f} {t.balance_after:>14.2f}  {t.reference_code or ''}")
+
+        writer.text()
+        writer.text("TRANSFERS")
+        writer.text(f"{'date':<19} {'id':>10} {'direction':<12} {'amount':>14}  {'counterparty':<20} status")
+        for t in transfer_dao.iter_for_period(account.account_number, start, end, batch_size):
+            outgoing = t.from_account == account.account_number
+            counterparty = t.to_account if outgoing else t.from_account
+            direction = "OUT" if outgoing else "IN"
+            rows += 1
+            writer.row("transfer", _ts(t.timestamp), t.transfer_id, direction, counterparty, f"{t.amount:.2f}", "", t.status, t.note)
+            writer.text(f"{_ts(t.timestamp)} {t.transfer_id:>10} {direction:<12} {t.amount:>14.2f}  {counterparty:<20} {t.status}")
+
+        writer.text()
+        writer.text("OVERDRAFT EVENTS")
+        writer.text(f"{'date':<19} {'id':>10} {'':<12} {'amount':>14} {'balance':>14}  note")
+        for e in overdraft_dao.iter_for_period(account.account_number, start, end, batch_size):
+            rows += 1
+            writer.row("overdraft", _ts(e.occurred_at), e.event_id, "OVERDRAFT", "", f"{e.amount:.2f}", f"{e.balance_after:.2f}", "", e.note)
+            writer.text(f"{_ts(e.occurred_at)} {e.event_id:>10} {'':<12} {e.amount:>14.2f} {e.balance_after:>14.2f}  {e.note or ''}")
+
+        writer.text()
+        writer.text(f"Total in {total_in:>65.2f}")
+        writer.text(f"Total out {total_out:>64.2f}")
+        writer.text(f"Closing balance {closing:>58.2f}")
+        writer.row("summary", "", "", "TOTAL_IN", "", f"{total_in:.2f}")
+        writer.row("summary", "", "", "TOTAL_OUT", "", f"{total_out:.2f}")
+        writer.row("summary", _ts(end), "", "CLOSING_BALANCE", "", "", f"{closing:.2f}")
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+    return rows
+
+
+def _render_range(task: tuple) -> dict:
+    """
+    Worker entry point: render every account of one keyset range (`limit` accounts after `after_account`)
+    whose statement files are not all present yet. Runs in a pool process with its own engine.
+    """
+    period, after_account, limit, out_dir, formats, batch_size, run_id = task
+    start, end = period_bounds(period)
+    out_dir = Path(out_dir)
+    stats = {"accounts": 0, "rendered": 0, "skipped": 0, "rows": 0}
+    for account in AccountDAO().page_after(after_account, limit, end):
+        stats["accounts"] += 1
+        paths = statement_paths(out_dir, account.account_number, formats)
+        if all(path.exists() for path in paths.values()):
+            stats["skipped"] += 1
+            continue
+        stats["rows"] += render_statement(account, period, start, end, paths, batch_size, run_id)
+        stats["rendered"] += 1
+    return stats
+
+
+class StatementController:
+    """
+    Monthly statements for every account opened before the period ends, one CSV and/or PDF per account
+    under <out_dir>/<period>/. Account ranges are fanned out over a process pool; each file is written
+    to a temporary name and renamed when complete, so rerunning after a crash skips finished accounts.
+    Temporary names carry the run's id; a crashed run's partial files are left for the operator to delete.
+    """
+
+    def __init__(self):
+        cfg = load_config()["statements"]
+        self.default_out_dir = cfg["out_dir"]
+        self.default_workers = cfg["workers"] or os.cpu_count() or 1
+        self.default_range_size = cfg["range_size"]
+
+    def _ranges(self, period_end: datetime, range_size: int):
+        # Planning reads one keyset page of accounts at a time; a range is identified by the key before it.
+        accounts, after = AccountDAO(), ""
+        while True:
+            page = accounts.page_after(after, range_size, period_end)
+            if not page:
+                return
+            yield after
+            after = page[-1].account_number
+
+    def generate(
+        self,
+        period: str | None = None,
+        out_dir: str | None = None,
+        formats: tuple[str, ...] = FORMATS,
+        workers: int | None = None,
+        range_size: int | None = None,
+        batch_size: int = 1000,
+    ) -> dict:
+        """
+        Render statements for `period` (YYYY-MM, default the previous month) and report progress and throughput.
+        """
+        if period is None:
+            first_of_month = datetime.utcnow().replace(day=1)
+            previous = first_of_month.replace(year=first_of_month.year - 1, month=12) if first_of_month.month == 1 else first_of_month.replace(month=first_of_month.month - 1)
+            period = previous.strftime("%Y-%m")
+        _, end = period_bounds(period)
+        formats = tuple(dict.fromkeys(formats))
+        if not formats or any(fmt not in FORMATS for fmt in formats):
+            raise ValueError(f"Formats must be chosen from {', '.join(FORMATS)}")
+        workers = workers or self.default_workers
+        range_size = range_size or self.default_range_size
+        if workers <= 0 or range_size <= 0:
+            raise ValueError("Workers and range size must be greater than zero")
+        target = Path(out_dir or self.default_out_dir) / period
+        target.mkdir(parents=True, exist_ok=True)
+        run_id = f"{os.getpid()}-{os.urandom(4).hex()}"
+
+        stats = {"period": period, "out_dir": str(target), "ranges": 0, "accounts": 0, "rendered": 0, "skipped": 0, "rows": 0}
+        tasks = ((period, after, range_size, str(target), formats, batch_size, run_id) for after in self._ranges(end, range_size))
+        started = time.perf_counter()
+
+        def merge(result: dict):
+            stats["ranges"] += 1
+            for key in ("accounts", "rendered", "skipped", "rows"):
+                stats[key] += result[key]
+
+        if workers == 1:
+            for task in tasks:
+                merge(_render_range(task))
+        else:
+            # spawn: workers build their own engine instead of inheriting the parent's pooled connections
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                pending = set()
+                for task in tasks:
+                    pending.add(pool.submit(_render_range, task))
+                    if len(pending) >= workers * 2:  # keep planning only a little ahead of the workers
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            merge(future.result())
+                for future in pending:
+                    merge(future.result())
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 3)
+        stats["accounts_per_sec"] = round(stats["rendered"] / elapsed, 1) if elapsed and stats["rendered"] else None
+        return stats
@@ -0,0 +1,61 @@
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+from config import load_config
+from daos import TieringDAO
+
+
+class TieringController:
+    """
+    Hot/cold tiering of Transactions: rows older than `hot_days` move to TransactionsArchive in chunks of
+    `chunk_size`, each in its own short transaction, so the hot table (and its indexes) only grows with
+    recent activity. History reads union the archive only when their date range reaches the watermark.
+    """
+
+    def __init__(self):
+        self.dao = TieringDAO()
+        cfg = load_config()["tiering"]
+        self.default_hot_days = cfg["hot_days"]
+        self.default_chunk_size = cfg["chunk_size"]
+        self.watermark_ttl = cfg["watermark_ttl_ms"] / 1000
+
+    def archive_transactions(
+        self,
+        hot_days: int | None = None,
+        chunk_size: int | None = None,
+        progress: Callable[[dict], None] | None = None,
+        max_chunks: int | None = None,
+    ) -> dict:
+        """
+        Move transactions older than `hot_days` days (cut at midnight UTC) to the archive; `progress` is called
+        with the running stats after every chunk. The watermark is raised before anything moves, then the job
+        waits out the readers' watermark cache, so no reader can skip the archive for a row already in it.
+        Interrupted runs simply resume: a moved row is never in both tiers.
+        """
+        hot_days = hot_days or self.default_hot_days
+        chunk_size = chunk_size or self.default_chunk_size
+        if hot_days <= 0 or chunk_size <= 0:
+            raise ValueError("Hot days and chunk size must be greater than zero")
+        cutoff = (datetime.utcnow() - timedelta(days=hot_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        watermark = self.dao.get_watermark()
+        if watermark is None or cutoff > watermark:
+            self.dao.raise_watermark(cutoff)
+            time.sleep(self.watermark_ttl)
+        else:
+            cutoff = watermark  # never archive past what readers already know about
+
+        stats = {"cutoff": cutoff, "moved": 0, "chunks": 0}
+        started = time.perf_counter()
+        while max_chunks is None or stats["chunks"] < max_chunks:
+            moved = self.dao.move_transactions(cutoff, chunk_size)
+            stats["moved"] += moved
+            stats["chunks"] += 1
+            stats["seconds"] = round(time.perf_counter() - started, 3)
+            if progress:
+                progress(stats)
+            if moved < chunk_size:
+                break
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 3)
+        stats["rows_per_sec"] = round(stats["moved"] / elapsed, 1) if elapsed and stats["moved"] else None
+        return stats
@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Iterator, Optional
 from infra.db import get_engine
 from daos import AccountDAO, TransactionDAO, OverDraftEventDAO
 from entities import Transaction
@@ -14,7 +14,8 @@ class TransactionController:
         self.engine = get_engine()
 
     def _ensure_account_active(self, account_number: str):
-        account = self.account_dao.get_one(account_number)
+        # Only reached when a posting was rejected, so bypass the read cache for an exact reason.
+        account = self.account_dao.get_one(account_number, fresh=True)
         if not account:
             raise ValueError("Account not found")
         if account.status.upper() != "ACTIVE":
@@ -24,49 +25,43 @@ class TransactionController:
     def deposit(self, account_number: str, amount: Decimal, performed_by: str, note: Optional[str] = None) -> Transaction:
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
-        account = self._ensure_account_active(account_number)
-        new_balance = account.balance + amount
-        with self.engine.begin() as conn:
-            self.account_dao.update_balance(account_number, new_balance, conn=conn)
-            txn_id = self.transaction_dao.add(
-                account_number=account_number,
-                transaction_type="DEPOSIT",
-                amount=amount,
-                performed_by=performed_by,
-                note=note,
-                balance_after=new_balance,
-                reference_code=None,
-                conn=conn,
-            )
-        return self._get_transaction(txn_id)
+        # Concurrent deposits to the same (hot merchant) account share one transaction instead of queuing on its row lock.
+        txn = self.transaction_dao.post_credit(
+            account_number=account_number,
+            transaction_type="DEPOSIT",
+            amount=amount,
+            performed_by=performed_by,
+            note=note,
+        )
+        if not txn:
+            self._ensure_account_active(account_number)
+            raise RuntimeError("Deposit could not be posted")
+        return txn
 
     def withdraw(self, account_number: str, amount: Decimal, performed_by: str, note: Optional[str] = None) -> Transaction:
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
+        txn = self.transaction_dao.post(
+            account_number=account_number,
+            transaction_type="WITHDRAWAL",
+            delta=-amount,
+            performed_by=performed_by,
+            note=note,
+        )
+        if txn:
+            return txn
+        # Nothing was posted: only now pay for a read to report the reason.
         account = self._ensure_account_active(account_number)
         if account.balance < amount:
             # Record overdraft attempt
-            self.overdraft_dao.add_event(
+            self.overdraft_dao.record_event(
                 account_number=account_number,
                 amount=amount,
                 balance_after=account.balance,
                 note="Overdraft attempt",
             )
             raise ValueError("Insufficient funds (overdraft recorded)")
-        new_balance = account.balance - amount
-        with self.engine.begin() as conn:
-            self.account_dao.update_balance(account_number, new_balance, conn=conn)
-            txn_id = self.transaction_dao.add(
-                account_number=account_number,
-                transaction_type="WITHDRAWAL",
-                amount=amount,
-                performed_by=performed_by,
-                note=note,
-                balance_after=new_balance,
-                reference_code=None,
-                conn=conn,
-            )
-        return self._get_transaction(txn_id)
+        raise RuntimeError("Withdrawal could not be posted (balance changed concurrently), please retry")
 
     def history(
         self,
@@ -82,8 +77,56 @@ class TransactionController:
             transaction_type=transaction_type,
         )
 
-    def _get_transaction(self, txn_id: int) -> Transaction:
-        txn = self.transaction_dao.get_by_id(txn_id)
-        if not txn:
-            raise RuntimeError("Transaction not found after creation")
-        return txn
+    def history_page(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        page_size: int = 50,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[list[Transaction], Optional[tuple[datetime, int]]]:
+        if page_size <= 0:
+            raise ValueError("Page size must be greater than zero")
+        return self.transaction_dao.list_page(
+            account_number=account_number,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+            limit=page_size,
+            after=after,
+        )
+
+    def history_page_columns(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        page_size: int = 50,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[dict[str, list], Optional[tuple[datetime, int]]]:
+        if page_size <= 0:
+            raise ValueError("Page size must be greater than zero")
+        return self.transaction_dao.list_page_columns(
+            account_number=account_number,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+            limit=page_size,
+            after=after,
+        )
+
+    def iter_history(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        return self.transaction_dao.iter_for_account(
+            account_number=account_number,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+        )
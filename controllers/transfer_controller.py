@@ -1,9 +1,18 @@
-from decimal import Decimal
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Iterable
+from sqlalchemy.exc import SQLAlchemyError
 from infra.db import get_engine
 from daos import AccountDAO, TransactionDAO, TransferDAO, OverDraftEventDAO
 from entities import Transfer
 
 
+@dataclass
+class TransferBatchResult:
+    transfers: list[Transfer] = field(default_factory=list)
+    failures: list[tuple[int, str]] = field(default_factory=list)  # (record index, reason)
+
+
 class TransferController:
     def __init__(self):
         self.account_dao = AccountDAO()
@@ -15,8 +24,21 @@ class TransferController:
     def transfer(self, from_account: str, to_account: str, amount: Decimal, performed_by: str, note: str | None = None) -> Transfer:
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
-        source = self.account_dao.get_one(from_account)
-        dest = self.account_dao.get_one(to_account)
+        if from_account == to_account:
+            raise ValueError("Source and destination accounts must differ")
+        transfer = self.transfer_dao.post_transfer(
+            from_account=from_account,
+            to_account=to_account,
+            amount=amount,
+            performed_by=performed_by,
+            note=note,
+        )
+        if transfer:
+            return transfer
+
+        # Rejected: only now read both accounts to report the reason.
+        source = self.account_dao.get_one(from_account, fresh=True)
+        dest = self.account_dao.get_one(to_account, fresh=True)
         if not source or not dest:
             raise ValueError("Source or destination account not found")
         if source.status.upper() != "ACTIVE":
@@ -24,56 +46,110 @@ class TransferController:
         if dest.status.upper() != "ACTIVE":
             raise ValueError("Destination account not active")
         if source.balance < amount:
-            self.overdraft_dao.add_event(
+            self.overdraft_dao.record_event(
                 account_number=from_account,
                 amount=amount,
                 balance_after=source.balance,
                 note="Overdraft transfer attempt",
             )
             raise ValueError("Insufficient funds (overdraft recorded)")
-
-        new_source_balance = source.balance - amount
-        new_dest_balance = dest.balance + amount
-
-        with self.engine.begin() as conn:
-            self.account_dao.update_balance(from_account, new_source_balance, conn=conn)
-            self.account_dao.update_balance(to_account, new_dest_balance, conn=conn)
-            transfer_id = self.transfer_dao.add(
-                from_account=from_account,
-                to_account=to_account,
-                amount=amount,
-                status="COMPLETED",
-                note=note,
-                conn=conn,
-            )
-            # Mirror into transaction log for both accounts
-            self.transaction_dao.add(
-                account_number=from_account,
-                transaction_type="TRANSFER_OUT",
-                amount=amount,
-                performed_by=performed_by,
-                note=note,
-                balance_after=new_source_balance,
-                reference_code=str(transfer_id),
-                conn=conn,
-            )
-            self.transaction_dao.add(
-                account_number=to_account,
-                transaction_type="TRANSFER_IN",
-                amount=amount,
-                performed_by=performed_by,
-                note=note,
-                balance_after=new_dest_balance,
-                reference_code=str(transfer_id),
-                conn=conn,
-            )
-
-        transfer = self.transfer_dao.list_for_account(from_account)
-        # Return the first matching transfer_id (freshest)
-        for t in transfer:
-            if t.transfer_id == transfer_id:
-                return t
-        raise RuntimeError("Transfer not found after creation")
+        raise RuntimeError("Transfer could not be posted (balance changed concurrently), please retry")
 
     def list_history(self, account_number: str) -> list[Transfer]:
         return self.transfer_dao.list_for_account(account_number)
+
+    def transfer_batch(
+        self,
+        records: Iterable[tuple],
+        performed_by: str,
+        chunk_size: int = 1000,
+    ) -> TransferBatchResult:
+        """
+        Post many (from_account, to_account, amount, note) records, e.g. a payroll run.
+        Records are validated and posted chunk by chunk, each chunk in its own transaction with
+        balances netted per account; a bad record (or a failed chunk) is reported in `failures`
+        without aborting the rest of the batch.
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than zero")
+        result = TransferBatchResult()
+        chunk: list[tuple] = []
+        for index, record in enumerate(records):
+            try:
+                from_account, to_account, amount, note = record
+                if not all(isinstance(number, str) and number for number in (from_account, to_account)):
+                    raise TypeError("account numbers must be non-empty strings")
+                amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+            except (TypeError, ValueError, InvalidOperation):
+                result.failures.append((index, "Malformed transfer record"))
+                continue
+            if not amount.is_finite():
+                result.failures.append((index, "Amount must be a finite number"))
+            elif amount <= 0:
+                result.failures.append((index, "Amount must be greater than zero"))
+            elif from_account == to_account:
+                result.failures.append((index, "Source and destination accounts must differ"))
+            else:
+                chunk.append((index, from_account, to_account, amount, note))
+            if len(chunk) >= chunk_size:
+                self._post_chunk(chunk, performed_by, result)
+                chunk = []
+        if chunk:
+            self._post_chunk(chunk, performed_by, result)
+        result.failures.sort()
+        return result
+
+    def _post_chunk(self, chunk: list[tuple], performed_by: str, result: TransferBatchResult):
+        failures: list[tuple[int, str]] = []
+        try:
+            with self.engine.begin() as conn:
+                accounts = self.account_dao.lock_many(
+                    {n for _, from_account, to_account, _, _ in chunk for n in (from_account, to_account)}, conn=conn
+                )
+                balances = {number: acct.balance for number, acct in accounts.items()}
+                accepted, overdrafts = [], []
+                for index, from_account, to_account, amount, note in chunk:
+                    source, dest = accounts.get(from_account), accounts.get(to_account)
+                    if not source or not dest:
+                        failures.append((index, "Source or destination account not found"))
+                    elif source.status.upper() != "ACTIVE":
+                        failures.append((index, "Source account not active"))
+                    elif dest.status.upper() != "ACTIVE":
+                        failures.append((index, "Destination account not active"))
+                    elif balances[from_account] < amount:
+                        overdrafts.append(
+                            {
+                                "account_number": from_account,
+                                "amount": amount,
+                                "balance_after": balances[from_account],
+                                "note": "Overdraft transfer attempt",
+                            }
+                        )
+                        failures.append((index, "Insufficient funds (overdraft recorded)"))
+                    else:
+                        balances[from_account] -= amount
+                        balances[to_account] += amount
+                        accepted.append(
+                            {
+                                "seq": index,
+                                "from_account": from_account,
+                                "to_account": to_account,
+                                "amount": amount,
+                                "note": note,
+                                "from_balance": balances[from_account],
+                                "to_balance": balances[to_account],
+                            }
+                        )
+                deltas = {
+                    number: balance - accounts[number].balance
+                    for number, balance in balances.items()
+                    if balance != accounts[number].balance
+                }
+                self.account_dao.apply_balance_deltas(deltas, conn=conn)
+                created = self.transfer_dao.post_transfer_batch(accepted, performed_by, conn=conn)
+                self.overdraft_dao.add_events(overdrafts, conn=conn)
+        except SQLAlchemyError as exc:
+            result.failures.extend((item[0], f"Batch chunk failed: {exc}") for item in chunk)
+            return
+        result.transfers.extend(created[seq] for seq in sorted(created))
+        result.failures.extend(failures)
@@ -6,6 +6,9 @@ from .auth_dao import AuthDAO
 from .employee_dao import EmployeeDAO
 from .overdraft_event_dao import OverDraftEventDAO
 from .reporting_dao import ReportingDAO
+from .interest_dao import InterestAccrualDAO
+from .tiering_dao import TieringDAO
+from .aio import AsyncDAO
 
 __all__ = [
     "AccountDAO",
@@ -16,4 +19,7 @@ __all__ = [
     "EmployeeDAO",
     "OverDraftEventDAO",
     "ReportingDAO",
+    "InterestAccrualDAO",
+    "TieringDAO",
+    "AsyncDAO",
 ]
@@ -1,11 +1,53 @@
+from dataclasses import replace
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
-from sqlalchemy import text
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+from config import load_config
+from infra.cache import TTLCache
 from infra.db import get_engine
+from daos.statements import in_list_chunks, statement
 from entities import Account
 
 
+_cache: TTLCache | None = None
+
+
+def _account_cache() -> TTLCache:
+    """
+    Process-wide read-through cache shared by every AccountDAO (and thus every Streamlit session).
+    Entries are tagged with the account numbers they contain and with ("customer", id). Callers get
+    copies of the cached Account objects, never the shared instances.
+    """
+    global _cache
+    if _cache is None:
+        cfg = load_config()["cache"]
+        _cache = TTLCache(cfg["account_max_entries"], cfg["account_ttl_ms"] / 1000)
+    return _cache
+
+
+_PENDING_INVALIDATION = "invalidate_accounts"
+
+
+def invalidate_accounts(*account_numbers: str, conn=None):
+    """
+    Drop cached reads that include any of these accounts; called by every path that changes an Accounts row.
+    Pass the caller's `conn` when the change is not committed yet: the accounts are dropped again when that
+    connection goes back to the pool, after the commit, so a read racing the commit cannot re-cache the old row.
+    """
+    _account_cache().invalidate_tags(*account_numbers)
+    if conn is not None:
+        conn.info.setdefault(_PENDING_INVALIDATION, set()).update(account_numbers)
+
+
+@event.listens_for(Pool, "checkin")
+def _invalidate_after_commit(dbapi_connection, connection_record):
+    pending = connection_record.info.pop(_PENDING_INVALIDATION, None) if connection_record is not None else None
+    if pending:
+        _account_cache().invalidate_tags(*pending)
+
+
 class AccountDAO:
     def __init__(self):
         self.engine = get_engine()
@@ -15,39 +57,121 @@ class AccountDAO:
             account_number=row.account_number,
             customer_id=row.customer_id,
             account_type=row.account_type,
-            balance=Decimal(row.balance),
+            balance=row.balance,
             currency=row.currency,
             status=row.status,
             date_opened=row.date_opened,
         )
 
     def get_by_customer(self, customer_id: int) -> List[Account]:
-        sql = text(
+        sql = statement(
+            "AccountDAO.get_by_customer",
             """
             SELECT account_number, customer_id, account_type, balance, currency, status, date_opened
             FROM Accounts
             WHERE customer_id = :customer_id
             ORDER BY date_opened DESC
-            """
+            """,
+            returns=("balance",),
         )
+        cache = _account_cache()
+        key = ("customer", customer_id)
+        if cache.enabled:
+            cached = cache.get(key)
+            if cached is not None:
+                return [replace(a) for a in cached]
+        generation = cache.generation()
         with self.engine.connect() as conn:
             rows = conn.execute(sql, {"customer_id": customer_id}).mappings()
-            return [self._map(r) for r in rows]
+            accounts = [self._map(r) for r in rows]
+        cache.put(key, accounts, tags=[key, *(a.account_number for a in accounts)], generation=generation)
+        return [replace(a) for a in accounts]
 
-    def get_one(self, account_number: str) -> Optional[Account]:
-        sql = text(
+    def get_by_customers(self, customer_ids: list[int]) -> dict[int, List[Account]]:
+        """
+        Accounts of many customers in one query per IN-list chunk (cached customers are not re-read).
+        Every requested id is present in the result, with an empty list when it has no accounts.
+        """
+        sql = statement(
+            "AccountDAO.get_by_customers",
             """
             SELECT account_number, customer_id, account_type, balance, currency, status, date_opened
             FROM Accounts
-            WHERE account_number = :account_number
+            WHERE customer_id IN :customer_ids
+            ORDER BY customer_id, date_opened DESC
+            """,
+            returns=("balance",),
+        )
+        cache = _account_cache()
+        result: dict[int, List[Account]] = {}
+        missing = []
+        for customer_id in customer_ids:
+            cached = cache.get(("customer", customer_id)) if cache.enabled else None
+            if cached is not None:
+                result[customer_id] = [replace(a) for a in cached]
+            else:
+                missing.append(customer_id)
+        if not missing:
+            return result
+        generation = cache.generation()
+        with self.engine.connect() as conn:
+            for chunk in in_list_chunks(missing):
+                fetched: dict[int, List[Account]] = {customer_id: [] for customer_id in chunk}
+                for r in conn.execute(sql, {"customer_ids": chunk}).mappings():
+                    fetched[r.customer_id].append(self._map(r))
+                for customer_id, accounts in fetched.items():
+                    key = ("customer", customer_id)
+                    cache.put(key, accounts, tags=[key, *(a.account_number for a in accounts)], generation=generation)
+                    result[customer_id] = [replace(a) for a in accounts]
+        return result
+
+    def get_one(self, account_number: str, fresh: bool = False) -> Optional[Account]:
+        sql = statement(
+            "AccountDAO.get_one",
             """
+            SELECT account_number, customer_id, account_type, balance, currency, status, date_opened
+            FROM Accounts
+            WHERE account_number = :account_number
+            """,
+            returns=("balance",),
         )
+        cache = _account_cache()
+        key = ("account", account_number)
+        if cache.enabled and not fresh:
+            cached = cache.get(key)
+            if cached is not None:
+                return replace(cached)
+        generation = cache.generation()
         with self.engine.connect() as conn:
             row = conn.execute(sql, {"account_number": account_number}).mappings().fetchone()
-            return self._map(row) if row else None
+        if not row:
+            return None
+        account = self._map(row)
+        cache.put(key, account, tags=[account_number], generation=generation)
+        return replace(account)
+
+    def page_after(self, after_account: str, limit: int, opened_before: datetime) -> List[Account]:
+        """
+        Keyset page of accounts opened before `opened_before`, in account_number order after `after_account`;
+        used to split batch jobs into account ranges. Bypasses the read cache.
+        """
+        sql = statement(
+            "AccountDAO.page_after",
+            """
+            SELECT TOP (:limit) account_number, customer_id, account_type, balance, currency, status, date_opened
+            FROM Accounts
+            WHERE account_number > :after_account AND date_opened < :end_date
+            ORDER BY account_number
+            """,
+            returns=("balance",),
+        )
+        params = {"after_account": after_account, "limit": limit, "end_date": opened_before}
+        with self.engine.connect() as conn:
+            return [self._map(r) for r in conn.execute(sql, params).mappings()]
 
     def update_balance(self, account_number: str, new_balance: Decimal, conn=None):
-        sql = text(
+        sql = statement(
+            "AccountDAO.update_balance",
             """
             UPDATE Accounts
             SET balance = :balance
@@ -59,9 +183,55 @@ class AccountDAO:
         else:
             with self.engine.begin() as tx:
                 tx.execute(sql, {"balance": new_balance, "account_number": account_number})
+        invalidate_accounts(account_number, conn=conn)
+
+    def lock_many(self, account_numbers, conn) -> dict[str, Account]:
+        """
+        Read and update-lock a set of accounts inside the caller's transaction.
+        Rows are locked in account_number order so concurrent batches cannot deadlock on each other.
+        """
+        sql = statement(
+            "AccountDAO.lock_many",
+            """
+            SELECT account_number, customer_id, account_type, balance, currency, status, date_opened
+            FROM Accounts WITH (UPDLOCK, ROWLOCK, HOLDLOCK)
+            WHERE account_number IN :account_numbers
+            ORDER BY account_number
+            """,
+            returns=("balance",),
+        )
+        accounts: dict[str, Account] = {}
+        for chunk in in_list_chunks(account_numbers):
+            rows = conn.execute(sql, {"account_numbers": chunk}).mappings()
+            for r in rows:
+                accounts[r.account_number] = self._map(r)
+        return accounts
+
+    def apply_balance_deltas(self, deltas: dict[str, Decimal], conn=None):
+        """
+        Add a signed delta to each account's balance with a single executemany.
+        """
+        sql = statement(
+            "AccountDAO.apply_balance_deltas",
+            """
+            UPDATE Accounts
+            SET balance = balance + :delta
+            WHERE account_number = :account_number
+            """
+        )
+        params = [{"account_number": number, "delta": delta} for number, delta in deltas.items()]
+        if not params:
+            return
+        if conn:
+            conn.execute(sql, params)
+        else:
+            with self.engine.begin() as tx:
+                tx.execute(sql, params)
+        invalidate_accounts(*deltas, conn=conn)
 
     def update_status(self, account_number: str, status: str):
-        sql = text(
+        sql = statement(
+            "AccountDAO.update_status",
             """
             UPDATE Accounts
             SET status = :status
@@ -70,6 +240,7 @@ class AccountDAO:
         )
         with self.engine.begin() as conn:
             conn.execute(sql, {"status": status, "account_number": account_number})
+        invalidate_accounts(account_number)
 
     def create(
         self,
@@ -82,10 +253,13 @@ class AccountDAO:
         date_opened: datetime,
         conn=None,
     ):
-        sql = text(
+        sql = statement(
+            "AccountDAO.create",
             """
+            SET NOCOUNT ON;
             INSERT INTO Accounts (account_number, customer_id, account_type, balance, currency, status, date_opened)
-            VALUES (:account_number, :customer_id, :account_type, :balance, :currency, :status, :date_opened)
+            VALUES (:account_number, :customer_id, :account_type, :balance, :currency, :status, :date_opened);
+            INSERT INTO AccountSummary (account_number) VALUES (:account_number);
             """
         )
         params = {
@@ -102,3 +276,8 @@ class AccountDAO:
         else:
             with self.engine.begin() as tx:
                 tx.execute(sql, params)
+        _account_cache().invalidate_tags(account_number, ("customer", customer_id))
+
+    @staticmethod
+    def cache_stats() -> dict:
+        return _account_cache().stats()
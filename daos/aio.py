@@ -0,0 +1,21 @@
+"""
+Awaitable views of the DAOs: AsyncDAO(dao).method(...) runs dao.method(...) through
+infra.db.run_async, so independent queries can be gathered with asyncio.
+"""
+from infra.db import run_async
+
+
+class AsyncDAO:
+    def __init__(self, dao):
+        self._dao = dao
+
+    def __getattr__(self, name):
+        attr = getattr(self._dao, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await run_async(attr, *args, **kwargs)
+
+        call.__name__ = name
+        return call
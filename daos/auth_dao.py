@@ -1,6 +1,6 @@
-from sqlalchemy import text
 from infra.db import get_engine
-from entities import Customer
+from daos.statements import in_list_chunks, statement
+from entities import Account, Customer, Employee
 
 
 class AuthDAO:
@@ -19,32 +19,112 @@ class AuthDAO:
             pin=row.pin,
         )
 
-    def authenticate(self, username: str, pin: str) -> Customer | None:
-        sql = text(
+    def get_by_username(self, username: str) -> Customer | None:
+        sql = statement(
+            "AuthDAO.get_by_username",
             """
             SELECT customer_id, name, national_id, email, phone, address, status, pin
             FROM Customers
-            WHERE username = :username AND pin = :pin AND status = 'ACTIVE'
+            WHERE username = :username
             """
         )
         with self.engine.connect() as conn:
-            row = conn.execute(sql, {"username": username, "pin": pin}).mappings().fetchone()
+            row = conn.execute(sql, {"username": username}).mappings().fetchone()
             return self._map(row) if row else None
 
+    def lookup_principals(self, username: str) -> list[dict]:
+        """
+        Every ACTIVE customer and employee signed in as `username` (customers first), each with its stored
+        credentials (pin_hash, or the legacy plaintext pin until upgraded) and, for a customer, its accounts
+        newest first; one round trip. PINs are not compared here: see AuthController.login.
+        """
+        sql = statement(
+            "AuthDAO.lookup_principals",
+            """
+            SELECT 'customer' AS principal_type, c.customer_id AS principal_id, c.name, c.email, c.phone,
+                   c.address, c.national_id, NULL AS role, c.status, c.pin, c.pin_hash,
+                   a.account_number, a.account_type, a.balance, a.currency, a.status AS account_status, a.date_opened
+            FROM Customers c
+            LEFT JOIN Accounts a ON a.customer_id = c.customer_id
+            WHERE c.username = :username AND c.status = 'ACTIVE'
+            UNION ALL
+            SELECT 'employee', e.employee_id, e.name, e.email, e.phone,
+                   NULL, NULL, e.role, e.status, e.pin, e.pin_hash,
+                   NULL, NULL, NULL, NULL, NULL, NULL
+            FROM Employees e
+            WHERE e.username = :username AND e.status = 'ACTIVE'
+            ORDER BY principal_type, date_opened DESC
+            """,
+            returns=("balance",),
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(sql, {"username": username}).mappings().fetchall()
+        principals: dict[tuple[str, int], dict] = {}
+        for r in rows:
+            key = (r.principal_type, r.principal_id)
+            if key not in principals:
+                if r.principal_type == "customer":
+                    principal = Customer(
+                        customer_id=r.principal_id,
+                        name=r.name,
+                        national_id=r.national_id,
+                        email=r.email,
+                        phone=r.phone,
+                        address=r.address,
+                        status=r.status,
+                        pin=r.pin,
+                    )
+                else:
+                    principal = Employee(
+                        employee_id=r.principal_id,
+                        username=username,
+                        name=r.name,
+                        email=r.email,
+                        phone=r.phone,
+                        role=r.role,
+                        status=r.status,
+                    )
+                principals[key] = {"role": r.principal_type, "principal": principal, "pin": r.pin, "pin_hash": r.pin_hash, "accounts": []}
+            if r.account_number is not None:
+                principals[key]["accounts"].append(
+                    Account(
+                        account_number=r.account_number,
+                        customer_id=r.principal_id,
+                        account_type=r.account_type,
+                        balance=r.balance,
+                        currency=r.currency,
+                        status=r.account_status,
+                        date_opened=r.date_opened,
+                    )
+                )
+        return list(principals.values())
+
+    def set_pin_hash(self, customer_id: int, pin_hash: str):
+        """
+        Store a salted PIN hash and blank the legacy plaintext pin.
+        """
+        sql = statement(
+            "AuthDAO.set_pin_hash",
+            "UPDATE Customers SET pin_hash = :pin_hash, pin = '' WHERE customer_id = :customer_id",
+        )
+        with self.engine.begin() as conn:
+            conn.execute(sql, {"pin_hash": pin_hash, "customer_id": customer_id})
+
     def create_customer(
         self,
         username: str,
-        pin: str,
+        pin_hash: str,
         name: str,
         email: str,
         phone: str | None,
         address: str | None,
         national_id: str,
     ):
-        sql = text(
+        sql = statement(
+            "AuthDAO.create_customer",
             """
-            INSERT INTO Customers (username, pin, name, email, phone, address, status, national_id)
-            VALUES (:username, :pin, :name, :email, :phone, :address, 'ACTIVE', :national_id)
+            INSERT INTO Customers (username, pin, pin_hash, name, email, phone, address, status, national_id)
+            VALUES (:username, '', :pin_hash, :name, :email, :phone, :address, 'ACTIVE', :national_id)
             """
         )
         with self.engine.begin() as conn:
@@ -52,7 +132,7 @@ class AuthDAO:
                 sql,
                 {
                     "username": username,
-                    "pin": pin,
+                    "pin_hash": pin_hash,
                     "name": name,
                     "email": email,
                     "phone": phone,
@@ -62,7 +142,8 @@ class AuthDAO:
             )
 
     def list_all(self) -> list[Customer]:
-        sql = text(
+        sql = statement(
+            "AuthDAO.list_all",
             """
             SELECT customer_id, name, national_id, email, phone, address, status, pin
             FROM Customers
@@ -72,3 +153,19 @@ class AuthDAO:
         with self.engine.connect() as conn:
             rows = conn.execute(sql).mappings()
             return [self._map(r) for r in rows]
+
+    def get_many(self, customer_ids: list[int]) -> list[Customer]:
+        sql = statement(
+            "AuthDAO.get_many",
+            """
+            SELECT customer_id, name, national_id, email, phone, address, status, pin
+            FROM Customers
+            WHERE customer_id IN :customer_ids
+            ORDER BY customer_id ASC
+            """
+        )
+        customers = []
+        with self.engine.connect() as conn:
+            for chunk in in_list_chunks(customer_ids):
+                customers += [self._map(r) for r in conn.execute(sql, {"customer_ids": chunk}).mappings()]
+        return customers
@@ -1,5 +1,5 @@
-from sqlalchemy import text
 from infra.db import get_engine
+from daos.statements import statement
 from entities import Employee
 
 
@@ -18,14 +18,13 @@ class EmployeeDAO:
             status=row.status,
         )
 
-    def authenticate(self, username: str, pin: str) -> Employee | None:
-        sql = text(
-            """
-            SELECT employee_id, username, name, email, phone, role, status
-            FROM Employees
-            WHERE username = :username AND pin = :pin AND status = 'ACTIVE'
-            """
+    def set_pin_hash(self, employee_id: int, pin_hash: str):
+        """
+        Store a salted PIN hash and blank the legacy plaintext pin.
+        """
+        sql = statement(
+            "EmployeeDAO.set_pin_hash",
+            "UPDATE Employees SET pin_hash = :pin_hash, pin = '' WHERE employee_id = :employee_id",
         )
-        with self.engine.connect() as conn:
-            row = conn.execute(sql, {"username": username, "pin": pin}).mappings().fetchone()
-            return self._map(row) if row else None
+        with self.engine.begin() as conn:
+            conn.execute(sql, {"pin_hash": pin_hash, "employee_id": employee_id})
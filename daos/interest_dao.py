@@ -0,0 +1,128 @@
+from decimal import Decimal
+from infra.db import get_engine
+from daos.account_dao import invalidate_accounts
+from daos.statements import statement
+
+
+class InterestAccrualDAO:
+    """
+    Chunked interest posting for SAVINGS accounts, checkpointed in InterestAccrualRuns (migration V003).
+    """
+
+    def __init__(self):
+        self.engine = get_engine()
+
+    def start_run(self, period: str, rate: Decimal) -> dict:
+        """
+        Create the run for `period` unless it exists, and return it; an existing run keeps its rate and checkpoint.
+        """
+        insert_sql = statement(
+            "InterestAccrualDAO.start_run",
+            """
+            INSERT INTO InterestAccrualRuns (period, rate)
+            SELECT :period, :rate
+            WHERE NOT EXISTS (SELECT 1 FROM InterestAccrualRuns WITH (UPDLOCK, HOLDLOCK) WHERE period = :period)
+            """
+        )
+        with self.engine.begin() as conn:
+            conn.execute(insert_sql, {"period": period, "rate": rate})
+        return self.get_run(period)
+
+    def get_run(self, period: str) -> dict | None:
+        sql = statement(
+            "InterestAccrualDAO.get_run",
+            """
+            SELECT period, rate, last_account_number, accounts_posted, interest_total, started_at, completed_at
+            FROM InterestAccrualRuns
+            WHERE period = :period
+            """,
+            returns=("rate", "interest_total"),
+        )
+        with self.engine.connect() as conn:
+            row = conn.execute(sql, {"period": period}).mappings().fetchone()
+            return dict(row) if row else None
+
+    def accrue_chunk(self, period: str, rate: Decimal, after_account: str, limit: int, performed_by: str, conn=None) -> dict:
+        """
+        Post one month of interest to the next `limit` SAVINGS accounts after `after_account`, in account_number
+        order, and advance the run's checkpoint in the same transaction. Only ACTIVE accounts with a positive
+        balance earn interest (balance * rate / 1200, rounded half-up to the cent).
+        The run row is locked first and must still be open at `after_account`; if another runner has moved the
+        checkpoint, nothing is posted and `checkpoint_moved` is True so the caller re-reads the run.
+        Returns the last account scanned (None when nothing was left), the number scanned and the postings.
+        """
+        if conn is None:
+            with self.engine.begin() as tx:
+                return self.accrue_chunk(period, rate, after_account, limit, performed_by, conn=tx)
+        params = {
+            "period": period,
+            "rate": rate,
+            "after_account": after_account,
+            "limit": limit,
+            "performed_by": performed_by,
+            "note": f"Monthly interest {period}",
+            "reference_code": f"INT-{period}",
+        }
+        sql = statement(
+            "InterestAccrualDAO.accrue_chunk",
+            """
+            SET NOCOUNT ON;
+            DECLARE @keys TABLE (account_number NVARCHAR(20) NOT NULL PRIMARY KEY, interest DECIMAL(18,2) NOT NULL);
+            DECLARE @posted TABLE (account_number NVARCHAR(20) NOT NULL PRIMARY KEY, interest DECIMAL(18,2) NOT NULL, balance_after DECIMAL(18,2) NOT NULL);
+            DECLARE @at_checkpoint BIT = 0;
+
+            SELECT @at_checkpoint = 1
+            FROM InterestAccrualRuns WITH (UPDLOCK, HOLDLOCK)
+            WHERE period = :period AND ISNULL(last_account_number, '') = :after_account AND completed_at IS NULL;
+
+            IF @at_checkpoint = 0
+            BEGIN
+                SELECT CAST(1 AS BIT) AS moved, NULL AS last_key, 0 AS scanned, NULL AS account_number, NULL AS interest;
+                RETURN;
+            END
+
+            INSERT INTO @keys (account_number, interest)
+            SELECT TOP (:limit)
+                account_number,
+                CASE WHEN status = 'ACTIVE' AND balance > 0 THEN ROUND(balance * :rate / 1200, 2) ELSE 0 END
+            FROM Accounts WITH (UPDLOCK, ROWLOCK)
+            WHERE account_type = 'SAVINGS' AND account_number > :after_account
+            ORDER BY account_number;
+
+            UPDATE a
+            SET balance = a.balance + k.interest
+            OUTPUT INSERTED.account_number, k.interest, INSERTED.balance INTO @posted
+            FROM Accounts a
+            JOIN @keys k ON k.account_number = a.account_number
+            WHERE k.interest > 0;
+
+            INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+            SELECT account_number, 'INTEREST', interest, SYSUTCDATETIME(), :performed_by, :note, balance_after, :reference_code
+            FROM @posted;
+
+            UPDATE s
+            SET total_in = s.total_in + p.interest, last_activity = SYSUTCDATETIME()
+            FROM AccountSummary s
+            JOIN @posted p ON p.account_number = s.account_number;
+
+            UPDATE InterestAccrualRuns
+            SET last_account_number = ISNULL((SELECT MAX(account_number) FROM @keys), last_account_number),
+                accounts_posted = accounts_posted + (SELECT COUNT(*) FROM @posted),
+                interest_total = interest_total + ISNULL((SELECT SUM(interest) FROM @posted), 0),
+                completed_at = CASE WHEN (SELECT COUNT(*) FROM @keys) < :limit THEN SYSUTCDATETIME() END
+            WHERE period = :period;
+
+            SELECT CAST(0 AS BIT) AS moved, k.last_key, k.scanned, p.account_number, p.interest
+            FROM (SELECT MAX(account_number) AS last_key, COUNT(*) AS scanned FROM @keys) k
+            LEFT JOIN @posted p ON 1 = 1;
+            """
+        )
+        rows = conn.execute(sql, params).mappings().fetchall()
+        chunk = {
+            "checkpoint_moved": bool(rows[0].moved),
+            "last_account": rows[0].last_key,
+            "scanned": rows[0].scanned,
+            "posted": [(r.account_number, r.interest) for r in rows if r.account_number is not None],
+        }
+        invalidate_accounts(*(n for n, _ in chunk["posted"]), conn=conn)
+        return chunk
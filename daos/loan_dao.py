@@ -1,11 +1,42 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-from sqlalchemy import text
-from infra.db import get_engine
+from typing import Iterator, List, Optional
+from infra.db import fetch_columns, fetch_columns_by, get_engine
+from daos.statements import in_list_chunks, statement
 from entities import Loan
 
 
+LIST_FOR_ACCOUNT = statement(
+    "LoanDAO.list_for_account",
+    """
+    SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
+    FROM Loans
+    WHERE account_number = :account_number
+    ORDER BY start_date DESC
+    """,
+    returns=("principal", "balance_remaining", "rate"),
+)
+LIST_FOR_ACCOUNTS = statement(
+    "LoanDAO.list_for_accounts",
+    """
+    SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
+    FROM Loans
+    WHERE account_number IN :account_numbers
+    ORDER BY account_number, start_date DESC
+    """,
+    returns=("principal", "balance_remaining", "rate"),
+)
+LIST_ALL = statement(
+    "LoanDAO.list_all",
+    """
+    SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
+    FROM Loans
+    ORDER BY start_date DESC
+    """,
+    returns=("principal", "balance_remaining", "rate"),
+)
+
+
 class LoanDAO:
     def __init__(self):
         self.engine = get_engine()
@@ -14,9 +45,9 @@ class LoanDAO:
         return Loan(
             loan_id=row.loan_id,
             account_number=row.account_number,
-            principal=Decimal(row.principal),
-            balance_remaining=Decimal(row.balance_remaining),
-            rate=Decimal(row.rate),
+            principal=row.principal,
+            balance_remaining=row.balance_remaining,
+            rate=row.rate,
             term_months=row.term_months,
             start_date=row.start_date,
             status=row.status,
@@ -24,37 +55,61 @@ class LoanDAO:
         )
 
     def list_for_account(self, account_number: str) -> List[Loan]:
-        sql = text(
-            """
-            SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
-            FROM Loans
-            WHERE account_number = :account_number
-            ORDER BY start_date DESC
-            """
-        )
         with self.engine.connect() as conn:
-            rows = conn.execute(sql, {"account_number": account_number}).mappings()
+            rows = conn.execute(LIST_FOR_ACCOUNT, {"account_number": account_number}).mappings()
             return [self._map(r) for r in rows]
 
+    def list_for_account_columns(self, account_number: str) -> dict[str, list]:
+        """
+        Same rows as list_for_account, as column arrays for display.
+        """
+        with self.engine.connect() as conn:
+            return fetch_columns(conn.execute(LIST_FOR_ACCOUNT, {"account_number": account_number}))
+
+    def list_for_accounts(self, account_numbers: list[str]) -> dict[str, List[Loan]]:
+        """
+        Loans of many accounts in one query per IN-list chunk, newest first per account.
+        Every requested account is present in the result, with an empty list when it has no loans.
+        """
+        loans: dict[str, List[Loan]] = {n: [] for n in account_numbers}
+        with self.engine.connect() as conn:
+            for chunk in in_list_chunks(account_numbers):
+                for r in conn.execute(LIST_FOR_ACCOUNTS, {"account_numbers": chunk}).mappings():
+                    loans[r.account_number].append(self._map(r))
+        return loans
+
+    def list_for_accounts_columns(self, account_numbers: list[str]) -> dict[str, dict[str, list]]:
+        """
+        Same rows as list_for_accounts, as column arrays per account for display.
+        """
+        columns: dict[str, dict[str, list]] = {}
+        with self.engine.connect() as conn:
+            for chunk in in_list_chunks(account_numbers):
+                result = conn.execute(LIST_FOR_ACCOUNTS, {"account_numbers": chunk})
+                columns.update(fetch_columns_by(result, "account_number", chunk))
+        return columns
+
     def list_all(self) -> List[Loan]:
-        sql = text(
-            """
-            SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
-            FROM Loans
-            ORDER BY start_date DESC
-            """
-        )
         with self.engine.connect() as conn:
-            rows = conn.execute(sql).mappings()
+            rows = conn.execute(LIST_ALL).mappings()
             return [self._map(r) for r in rows]
 
+    def list_all_columns(self) -> dict[str, list]:
+        """
+        Same rows as list_all, as column arrays for display.
+        """
+        with self.engine.connect() as conn:
+            return fetch_columns(conn.execute(LIST_ALL))
+
     def get_by_id(self, loan_id: int) -> Loan | None:
-        sql = text(
+        sql = statement(
+            "LoanDAO.get_by_id",
             """
             SELECT loan_id, account_number, principal, balance_remaining, rate, term_months, start_date, status, next_due_date
             FROM Loans
             WHERE loan_id = :loan_id
-            """
+            """,
+            returns=("principal", "balance_remaining", "rate"),
         )
         with self.engine.connect() as conn:
             row = conn.execute(sql, {"loan_id": loan_id}).mappings().fetchone()
@@ -70,7 +125,8 @@ class LoanDAO:
         status: str,
         conn=None,
     ) -> int:
-        sql = text(
+        sql = statement(
+            "LoanDAO.request",
             """
             INSERT INTO Loans (account_number, principal, balance_remaining, rate, term_months, start_date, status)
             OUTPUT INSERTED.loan_id
@@ -94,11 +150,77 @@ class LoanDAO:
         return int(row[0]) if row else 0
 
     def update_status(self, loan_id: int, status: str):
-        sql = text("UPDATE Loans SET status = :status WHERE loan_id = :loan_id")
+        sql = statement("LoanDAO.update_status", "UPDATE Loans SET status = :status WHERE loan_id = :loan_id")
         with self.engine.begin() as conn:
             conn.execute(sql, {"status": status, "loan_id": loan_id})
 
     def delete_pending(self, loan_id: int):
-        sql = text("DELETE FROM Loans WHERE loan_id = :loan_id AND status = 'PENDING'")
+        sql = statement("LoanDAO.delete_pending", "DELETE FROM Loans WHERE loan_id = :loan_id AND status = 'PENDING'")
         with self.engine.begin() as conn:
             conn.execute(sql, {"loan_id": loan_id})
+
+    def iter_amortization_inputs(self, batch_size: int = 100_000) -> Iterator[dict[str, list]]:
+        """
+        APPROVED loans in loan_id order as column arrays of at most `batch_size` rows, with money
+        already scaled to integer cents and rates to basis points for the amortization engine.
+        """
+        sql = statement(
+            "LoanDAO.iter_amortization_inputs",
+            """
+            SELECT TOP (:limit)
+                loan_id,
+                CAST(ROUND(principal * 100, 0) AS BIGINT) AS principal_cents,
+                CAST(ROUND(rate * 100, 0) AS BIGINT) AS rate_bp,
+                term_months,
+                start_date
+            FROM Loans
+            WHERE status = 'APPROVED' AND loan_id > :after_id
+            ORDER BY loan_id
+            """
+        )
+        after_id = 0
+        while True:
+            with self.engine.connect() as conn:
+                columns = fetch_columns(conn.execute(sql, {"limit": batch_size, "after_id": after_id}))
+            if not columns["loan_id"]:
+                return
+            yield columns
+            after_id = columns["loan_id"][-1]
+
+    def apply_amortization(self, rows: list[dict], conn=None):
+        """
+        Bulk write of scheduled balances: rows of loan_id, balance_cents and next_due_date (None once paid off).
+        """
+        if not rows:
+            return
+        if conn is None:
+            with self.engine.begin() as tx:
+                return self.apply_amortization(rows, conn=tx)
+        create_sql = statement(
+            "LoanDAO.apply_amortization.create",
+            """
+            CREATE TABLE #loan_amortization (
+                loan_id BIGINT NOT NULL PRIMARY KEY,
+                balance_cents BIGINT NOT NULL,
+                next_due_date DATETIME2 NULL
+            );
+            """
+        )
+        stage_sql = statement(
+            "LoanDAO.apply_amortization.stage",
+            "INSERT INTO #loan_amortization (loan_id, balance_cents, next_due_date) VALUES (:loan_id, :balance_cents, :next_due_date)",
+        )
+        update_sql = statement(
+            "LoanDAO.apply_amortization.update",
+            """
+            UPDATE l
+            SET balance_remaining = CAST(a.balance_cents AS DECIMAL(18,2)) / 100, next_due_date = a.next_due_date
+            FROM Loans l
+            JOIN #loan_amortization a ON a.loan_id = l.loan_id;
+
+            DROP TABLE #loan_amortization;
+            """
+        )
+        conn.execute(create_sql)
+        conn.execute(stage_sql, rows)  # fast_executemany: one array-bound round trip
+        conn.execute(update_sql)
@@ -1,9 +1,96 @@
+import threading
+from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import text
-from infra.db import get_engine
+from pathlib import Path
+from typing import Iterator
+from config import load_config
+from infra.db import fetch_columns, fetch_columns_by, get_engine
+from infra.write_behind import WriteBehindBuffer
+from daos.reporting_dao import bump_account_summaries
+from daos.statements import in_list_chunks, statement
 from entities import OverDraftEvent
 
 
+LIST_FOR_ACCOUNT = statement(
+    "OverDraftEventDAO.list_for_account",
+    """
+    SELECT event_id, account_number, amount, occurred_at, note, balance_after
+    FROM OverDraftEvents
+    WHERE account_number = :account_number
+    ORDER BY occurred_at DESC
+    """,
+    returns=("amount", "balance_after"),
+)
+LIST_FOR_ACCOUNTS = statement(
+    "OverDraftEventDAO.list_for_accounts",
+    """
+    SELECT event_id, account_number, amount, occurred_at, note, balance_after
+    FROM OverDraftEvents
+    WHERE account_number IN :account_numbers
+    ORDER BY account_number, occurred_at DESC
+    """,
+    returns=("amount", "balance_after"),
+)
+
+_buffer: WriteBehindBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def _encode_event(event: dict) -> dict:
+    return {
+        **event,
+        "amount": str(event["amount"]),
+        "balance_after": str(event["balance_after"]),
+        "occurred_at": event["occurred_at"].isoformat(),
+    }
+
+
+def _decode_event(raw: dict) -> dict:
+    return {
+        **raw,
+        "amount": Decimal(raw["amount"]),
+        "balance_after": Decimal(raw["balance_after"]),
+        "occurred_at": datetime.fromisoformat(raw["occurred_at"]),
+    }
+
+
+def overdraft_buffer() -> WriteBehindBuffer | None:
+    """
+    Process-wide write-behind buffer behind OverDraftEventDAO.record_event, or None when
+    OVERDRAFT_BUFFER_ENABLED is off. Created on first use, which also replays any spill
+    files a crashed process left behind.
+    """
+    global _buffer
+    cfg = load_config()["overdraft_buffer"]
+    if not cfg["enabled"]:
+        return None
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = WriteBehindBuffer(
+                "overdraft",
+                flush=lambda events: OverDraftEventDAO().insert_events(events),
+                replay=lambda events: OverDraftEventDAO().insert_events(events, replay=True),
+                encode=_encode_event,
+                decode=_decode_event,
+                spill_dir=Path(cfg["spill_dir"]),
+                max_events=cfg["max_events"],
+                max_delay=cfg["flush_ms"] / 1000,
+                fsync=cfg["fsync"],
+            )
+        return _buffer
+
+
+def close_overdraft_buffer():
+    """
+    Flush and stop the buffer (also done at interpreter exit); the next record_event starts a new one.
+    """
+    global _buffer
+    with _buffer_lock:
+        buffer, _buffer = _buffer, None
+    if buffer is not None:
+        buffer.close()
+
+
 class OverDraftEventDAO:
     def __init__(self):
         self.engine = get_engine()
@@ -12,30 +99,69 @@ class OverDraftEventDAO:
         return OverDraftEvent(
             event_id=row.event_id,
             account_number=row.account_number,
-            amount=Decimal(row.amount),
+            amount=row.amount,
             occurred_at=row.occurred_at,
             note=row.note,
-            balance_after=Decimal(row.balance_after),
+            balance_after=row.balance_after,
         )
 
     def list_for_account(self, account_number: str) -> list[OverDraftEvent]:
-        sql = text(
+        with self.engine.connect() as conn:
+            rows = conn.execute(LIST_FOR_ACCOUNT, {"account_number": account_number}).mappings()
+            return [self._map(r) for r in rows]
+
+    def list_for_account_columns(self, account_number: str) -> dict[str, list]:
+        """
+        Same rows as list_for_account, as column arrays for display.
+        """
+        with self.engine.connect() as conn:
+            return fetch_columns(conn.execute(LIST_FOR_ACCOUNT, {"account_number": account_number}))
+
+    def list_for_accounts_columns(self, account_numbers: list[str]) -> dict[str, dict[str, list]]:
+        """
+        Events of many accounts in one query per IN-list chunk, as column arrays per account (newest first).
+        Every requested account is present, with empty arrays when it has no events.
+        """
+        columns: dict[str, dict[str, list]] = {}
+        with self.engine.connect() as conn:
+            for chunk in in_list_chunks(account_numbers):
+                result = conn.execute(LIST_FOR_ACCOUNTS, {"account_numbers": chunk})
+                columns.update(fetch_columns_by(result, "account_number", chunk))
+        return columns
+
+    def iter_for_period(
+        self, account_number: str, start_date: datetime, end_date: datetime, batch_size: int = 1000
+    ) -> Iterator[OverDraftEvent]:
+        """
+        Stream the account's events in [start_date, end_date), oldest first, for statements.
+        """
+        sql = statement(
+            "OverDraftEventDAO.iter_for_period",
             """
             SELECT event_id, account_number, amount, occurred_at, note, balance_after
             FROM OverDraftEvents
-            WHERE account_number = :account_number
-            ORDER BY occurred_at DESC
-            """
+            WHERE account_number = :account_number AND occurred_at >= :start_date AND occurred_at < :end_date
+            ORDER BY occurred_at, event_id
+            """,
+            returns=("amount", "balance_after"),
         )
+        params = {"account_number": account_number, "start_date": start_date, "end_date": end_date}
         with self.engine.connect() as conn:
-            rows = conn.execute(sql, {"account_number": account_number}).mappings()
-            return [self._map(r) for r in rows]
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(sql, params)
+            for partition in result.mappings().partitions():
+                for r in partition:
+                    yield self._map(r)
 
     def add_event(self, account_number: str, amount: Decimal, balance_after: Decimal, note: str | None, conn=None):
-        sql = text(
+        sql = statement(
+            "OverDraftEventDAO.add_event",
             """
+            SET NOCOUNT ON;
             INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after)
-            VALUES (:account_number, :amount, SYSUTCDATETIME(), :note, :balance_after)
+            VALUES (:account_number, :amount, SYSUTCDATETIME(), :note, :balance_after);
+            UPDATE AccountSummary
+            SET overdraft_events = overdraft_events + 1, last_activity = SYSUTCDATETIME()
+            WHERE account_number = :account_number;
             """
         )
         params = {
@@ -50,11 +176,179 @@ class OverDraftEventDAO:
             with self.engine.begin() as tx:
                 tx.execute(sql, params)
 
+    def add_events(self, events: list[dict], conn=None):
+        """
+        Insert many events (account_number, amount, balance_after, note) with a single executemany.
+        """
+        sql = statement(
+            "OverDraftEventDAO.add_events",
+            """
+            INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after)
+            VALUES (:account_number, :amount, SYSUTCDATETIME(), :note, :balance_after)
+            """
+        )
+        summary_sql = statement(
+            "OverDraftEventDAO.add_events.summary",
+            """
+            UPDATE AccountSummary
+            SET overdraft_events = overdraft_events + :events, last_activity = SYSUTCDATETIME()
+            WHERE account_number = :account_number
+            """
+        )
+        counts: dict[str, int] = {}
+        for event in events:
+            counts[event["account_number"]] = counts.get(event["account_number"], 0) + 1
+        summary_params = [{"account_number": number, "events": n} for number, n in counts.items()]
+        if not events:
+            return
+        if conn:
+            conn.execute(sql, events)
+            conn.execute(summary_sql, summary_params)
+        else:
+            with self.engine.begin() as tx:
+                tx.execute(sql, events)
+                tx.execute(summary_sql, summary_params)
+
+    def record_event(self, account_number: str, amount: Decimal, balance_after: Decimal, note: str | None):
+        """
+        Record a declined attempt off the request path: the event is stamped now, spilled to local disk and
+        written with the next buffered batch. Falls back to add_event when the buffer is disabled.
+        """
+        buffer = overdraft_buffer()
+        if buffer is None:
+            self.add_event(account_number, amount, balance_after, note)
+            return
+        buffer.add(
+            {
+                "account_number": account_number,
+                "amount": amount,
+                "balance_after": balance_after,
+                "note": note,
+                "occurred_at": datetime.utcnow(),
+            }
+        )
+
+    def insert_events(self, events: list[dict], replay: bool = False, conn=None):
+        """
+        Write a batch of buffered events (with their own occurred_at) and bump AccountSummary once per account.
+        With `replay`, events already in the table (same account, time and amount) are skipped, so spill
+        files recovered after a crash can be written again safely.
+        """
+        insert_sql = statement(
+            "OverDraftEventDAO.insert_events",
+            """
+            INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after)
+            VALUES (:account_number, :amount, :occurred_at, :note, :balance_after)
+            """
+        )
+        replay_sql = statement(
+            "OverDraftEventDAO.insert_events.replay",
+            """
+            INSERT INTO OverDraftEvents (account_number, amount, occurred_at, note, balance_after)
+            SELECT :account_number, :amount, :occurred_at, :note, :balance_after
+            WHERE NOT EXISTS (
+                SELECT 1 FROM OverDraftEvents
+                WHERE account_number = :account_number AND occurred_at = :occurred_at AND amount = :amount
+            )
+            """
+        )
+        if conn is None:
+            with self.engine.begin() as tx:
+                return self.insert_events(events, replay, conn=tx)
+        if replay:
+            # Recovery only: row by row, so each rowcount says whether the event was new.
+            written = [e for e in events if conn.execute(replay_sql, e).rowcount]
+        else:
+            written = events
+            if written:
+                conn.execute(insert_sql, written)
+        deltas: dict[str, dict] = {}
+        for e in written:
+            delta = deltas.setdefault(
+                e["account_number"],
+                {"account_number": e["account_number"], "total_in": 0, "total_out": 0, "overdraft_events": 0, "last_activity": e["occurred_at"]},
+            )
+            delta["overdraft_events"] += 1
+            delta["last_activity"] = max(delta["last_activity"], e["occurred_at"])
+        bump_account_summaries(conn, list(deltas.values()))
+
+    @staticmethod
+    def flush_buffer() -> int:
+        """
+        Write buffered (and crash-recovered) events now; returns how many were written.
+        """
+        buffer = overdraft_buffer()
+        return buffer.flush() if buffer else 0
+
+    @staticmethod
+    def buffer_stats() -> dict | None:
+        return _buffer.stats() if _buffer else None
+
+    def count_older_than(self, cutoff: datetime) -> int:
+        sql = statement(
+            "OverDraftEventDAO.count_older_than",
+            "SELECT COUNT(*) FROM OverDraftEvents WHERE occurred_at < :cutoff",
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(sql, {"cutoff": cutoff}).scalar()
+
+    def purge_candidates(self, cutoff: datetime, after_id: int, limit: int) -> dict[str, list]:
+        """
+        Next `limit` events older than `cutoff` with event_id > `after_id`, in event_id order, as column arrays.
+        """
+        sql = statement(
+            "OverDraftEventDAO.purge_candidates",
+            """
+            SELECT TOP (:limit) event_id, account_number, amount, occurred_at, note, balance_after
+            FROM OverDraftEvents
+            WHERE event_id > :after_id AND occurred_at < :cutoff
+            ORDER BY event_id
+            """,
+            returns=("amount", "balance_after"),
+        )
+        with self.engine.connect() as conn:
+            return fetch_columns(conn.execute(sql, {"cutoff": cutoff, "after_id": after_id, "limit": limit}))
+
+    def delete_range(self, cutoff: datetime, after_id: int, last_id: int) -> int:
+        """
+        Delete events older than `cutoff` with after_id < event_id <= last_id in one short transaction,
+        keeping AccountSummary in step; returns the rows deleted. Event ids only grow and occurred_at
+        never changes, so this is exactly the set purge_candidates returned for the same bounds.
+        """
+        sql = statement(
+            "OverDraftEventDAO.delete_range",
+            """
+            SET NOCOUNT ON;
+            DECLARE @purged TABLE (account_number NVARCHAR(20) NOT NULL);
+            DELETE FROM OverDraftEvents
+            OUTPUT DELETED.account_number INTO @purged
+            WHERE event_id > :after_id AND event_id <= :last_id AND occurred_at < :cutoff;
+            UPDATE s
+            SET overdraft_events = s.overdraft_events - p.events
+            FROM AccountSummary s
+            JOIN (SELECT account_number, COUNT(*) AS events FROM @purged GROUP BY account_number) p
+              ON p.account_number = s.account_number;
+            SELECT COUNT(*) FROM @purged;
+            """
+        )
+        params = {"cutoff": cutoff, "after_id": after_id, "last_id": last_id}
+        with self.engine.begin() as conn:
+            return conn.execute(sql, params).scalar()
+
     def delete_older_than_days(self, days: int):
-        sql = text(
+        sql = statement(
+            "OverDraftEventDAO.delete_older_than_days",
             """
+            SET NOCOUNT ON;
+            DECLARE @purged TABLE (account_number NVARCHAR(20) NOT NULL);
             DELETE FROM OverDraftEvents
-            WHERE occurred_at < DATEADD(day, -:days, SYSUTCDATETIME())
+            OUTPUT DELETED.account_number INTO @purged
+            WHERE occurred_at < DATEADD(day, -:days, SYSUTCDATETIME());
+            UPDATE s
+            SET overdraft_events = s.overdraft_events - p.events
+            FROM AccountSummary s
+            JOIN (SELECT account_number, COUNT(*) AS events FROM @purged GROUP BY account_number) p
+              ON p.account_number = s.account_number;
             """
         )
         with self.engine.begin() as conn:
@@ -1,5 +1,28 @@
-from sqlalchemy import text
 from infra.db import get_engine
+from daos.statements import statement
+
+
+INFLOW_TYPES = ("DEPOSIT", "TRANSFER_IN", "INTEREST")
+
+
+def bump_account_summaries(conn, deltas: list[dict]):
+    """
+    Apply per-account AccountSummary deltas with one executemany.
+    Each delta has account_number, total_in, total_out, overdraft_events and last_activity (None keeps it).
+    """
+    sql = statement(
+        "AccountSummary.bump",
+        """
+        UPDATE AccountSummary
+        SET total_in = total_in + :total_in,
+            total_out = total_out + :total_out,
+            overdraft_events = overdraft_events + :overdraft_events,
+            last_activity = COALESCE(:last_activity, last_activity)
+        WHERE account_number = :account_number
+        """
+    )
+    if deltas:
+        conn.execute(sql, deltas)
 
 
 class ReportingDAO:
@@ -7,22 +30,154 @@ class ReportingDAO:
         self.engine = get_engine()
 
     def account_summary(self, account_number: str) -> dict | None:
-        sql = text(
+        # AccountSummary is kept current by every posting path, so this is a primary-key lookup.
+        sql = statement(
+            "ReportingDAO.account_summary",
             """
             SELECT
               a.account_number,
               c.name AS customer_name,
-              SUM(CASE WHEN t.transaction_type IN ('DEPOSIT','TRANSFER_IN') THEN t.amount ELSE 0 END) AS total_in,
-              SUM(CASE WHEN t.transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN t.amount ELSE 0 END) AS total_out,
-              COUNT(DISTINCT o.event_id) AS overdraft_events
-            FROM Accounts a
+              s.total_in,
+              s.total_out,
+              s.overdraft_events,
+              s.last_activity
+            FROM AccountSummary s
+            JOIN Accounts a ON a.account_number = s.account_number
             JOIN Customers c ON c.customer_id = a.customer_id
-            LEFT JOIN Transactions t ON t.account_number = a.account_number
-            LEFT JOIN OverDraftEvents o ON o.account_number = a.account_number
-            WHERE a.account_number = :account_number
-            GROUP BY a.account_number, c.name
-            """
+            WHERE s.account_number = :account_number
+            """,
+            returns=("total_in", "total_out"),
         )
         with self.engine.connect() as conn:
             row = conn.execute(sql, {"account_number": account_number}).mappings().fetchone()
             return dict(row) if row else None
+
+    def rebuild_account_summaries(self):
+        """
+        One-shot backfill of AccountSummary from the base tables (see migration V002).
+        """
+        with self.engine.begin() as conn:
+            conn.execute(statement("ReportingDAO.rebuild_account_summaries", "EXEC dbo.RebuildAccountSummary"))
+
+    def report_watermark(self) -> dict:
+        """
+        Markers of what portfolio reports read: the newest transaction, overdraft event and loan ids
+        (primary-key seeks) and the OverDraftEvents / Accounts row counts that deletes and inserts move,
+        taken from sys.partitions rather than counted. Those counts can be briefly off while writes are in
+        flight, which only costs the reports a rebuild. Loan updates have no such marker, so the loan count,
+        approved count and balance total are aggregated over Loans itself (one row per loan, a scan).
+        """
+        sql = statement(
+            "ReportingDAO.report_watermark",
+            """
+            SELECT
+              COALESCE((SELECT MAX(transaction_id) FROM Transactions), (SELECT MAX(transaction_id) FROM TransactionsArchive), 0) AS last_transaction_id,
+              COALESCE((SELECT MAX(event_id) FROM OverDraftEvents), 0) AS last_event_id,
+              (SELECT SUM(rows) FROM sys.partitions WHERE object_id = OBJECT_ID('dbo.OverDraftEvents') AND index_id IN (0, 1)) AS overdraft_events,
+              (SELECT SUM(rows) FROM sys.partitions WHERE object_id = OBJECT_ID('dbo.Accounts') AND index_id IN (0, 1)) AS accounts,
+              COALESCE((SELECT MAX(loan_id) FROM Loans), 0) AS last_loan_id,
+              l.loans, l.approved_loans, l.loan_balance
+            FROM (
+              SELECT COUNT(*) AS loans, SUM(CASE WHEN status = 'APPROVED' THEN 1 ELSE 0 END) AS approved_loans,
+                     SUM(balance_remaining) AS loan_balance
+              FROM Loans
+            ) l
+            """
+        )
+        with self.engine.connect() as conn:
+            return dict(conn.execute(sql).mappings().one())
+
+    def overdraft_counts_by_customer(self, after_id: int = 0) -> list[dict]:
+        """
+        Customers with overdraft events and how many they have; only events with event_id > after_id.
+        """
+        sql = statement(
+            "ReportingDAO.overdraft_counts_by_customer",
+            """
+            SELECT c.customer_id, c.name, COUNT(o.event_id) AS overdraft_events
+            FROM OverDraftEvents o
+            JOIN Accounts a ON a.account_number = o.account_number
+            JOIN Customers c ON c.customer_id = a.customer_id
+            WHERE o.event_id > :after_id
+            GROUP BY c.customer_id, c.name
+            """
+        )
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(sql, {"after_id": after_id}).mappings()]
+
+    def account_balances(self, after_id: int | None = None) -> list[dict]:
+        """
+        Every account's balance, or only those of accounts posted to after transaction after_id.
+        """
+        if after_id is None:
+            sql, params = statement("ReportingDAO.account_balances", "SELECT account_number, balance FROM Accounts", returns=("balance",)), {}
+        else:
+            sql = statement(
+                "ReportingDAO.account_balances.since",
+                """
+                SELECT a.account_number, a.balance
+                FROM Accounts a
+                WHERE a.account_number IN (SELECT t.account_number FROM Transactions t WHERE t.transaction_id > :after_id)
+                """,
+                returns=("balance",),
+            )
+            params = {"after_id": after_id}
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(sql, params).mappings()]
+
+    def loans_above_approved_average(self) -> list[dict]:
+        sql = statement(
+            "ReportingDAO.loans_above_approved_average",
+            """
+            SELECT l.loan_id, l.account_number, c.name AS customer_name, l.status, l.balance_remaining
+            FROM Loans l
+            JOIN Accounts a ON a.account_number = l.account_number
+            JOIN Customers c ON c.customer_id = a.customer_id
+            WHERE l.balance_remaining > (SELECT AVG(balance_remaining) FROM Loans WHERE status = 'APPROVED')
+            ORDER BY l.balance_remaining DESC, l.loan_id
+            """,
+            returns=("balance_remaining",),
+        )
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(sql).mappings()]
+
+    def customer_history(self, customer_id: int, after_id: int | None = None) -> list[dict]:
+        """
+        A customer's transactions across all their accounts, newest first, including archived ones;
+        with after_id only the (always hot) transactions posted after it.
+        """
+        columns = "t.transaction_id, t.timestamp, t.transaction_type, t.amount, t.account_number, c.name AS customer_name"
+        if after_id is None:
+            sql = statement(
+                "ReportingDAO.customer_history",
+                f"""
+                SELECT {columns}
+                FROM (
+                    SELECT transaction_id, timestamp, transaction_type, amount, account_number FROM Transactions
+                    UNION ALL
+                    SELECT transaction_id, timestamp, transaction_type, amount, account_number FROM TransactionsArchive
+                ) t
+                JOIN Accounts a ON a.account_number = t.account_number
+                JOIN Customers c ON c.customer_id = a.customer_id
+                WHERE a.customer_id = :customer_id
+                ORDER BY t.timestamp DESC, t.transaction_id DESC
+                """,
+                returns=("amount",),
+            )
+            params = {"customer_id": customer_id}
+        else:
+            sql = statement(
+                "ReportingDAO.customer_history.since",
+                f"""
+                SELECT {columns}
+                FROM Transactions t
+                JOIN Accounts a ON a.account_number = t.account_number
+                JOIN Customers c ON c.customer_id = a.customer_id
+                WHERE t.transaction_id > :after_id AND a.customer_id = :customer_id
+                ORDER BY t.timestamp DESC, t.transaction_id DESC
+                """,
+                returns=("amount",),
+            )
+            params = {"customer_id": customer_id, "after_id": after_id}
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(sql, params).mappings()]
@@ -0,0 +1,148 @@
+"""
+Central registry of DAO statements.
+
+Each statement is parsed into a TextClause once, on first use, with the types of its bound
+parameters declared from PARAM_TYPES (so SQL Server sees NVARCHAR/DECIMAL/DATETIME2 parameters
+that match the columns) and the money result columns it declares in `returns` typed from
+RESULT_TYPES (so rows arrive as Decimal and mappers need not re-wrap them); later calls are a
+dict lookup.
+Names follow "<DAO>.<method>[.<part>]".
+"""
+import threading
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.selectable import TextualSelect
+from sqlalchemy.types import BigInteger, DateTime, Integer, Numeric, Unicode, UnicodeText
+
+
+MONEY = Numeric(18, 2)
+
+# Every bind name used by a DAO statement, typed after the column it is compared with or written to.
+PARAM_TYPES = {
+    "account_number": Unicode(20),
+    "account_numbers": Unicode(20),
+    "customer_ids": Integer(),
+    "from_account": Unicode(20),
+    "to_account": Unicode(20),
+    "acct": Unicode(20),
+    "after_account": Unicode(20),
+    "account_type": Unicode(20),
+    "status": Unicode(20),
+    "transaction_type": Unicode(20),
+    "pin": Unicode(20),
+    "pin_hash": Unicode(200),
+    "currency": Unicode(3),
+    "period": Unicode(7),
+    "username": Unicode(50),
+    "national_id": Unicode(50),
+    "reference_code": Unicode(50),
+    "name": Unicode(100),
+    "email": Unicode(100),
+    "performed_by": Unicode(100),
+    "phone": Unicode(30),
+    "address": Unicode(255),
+    "note": Unicode(255),
+    "postings": UnicodeText(),
+    "amount": MONEY,
+    "balance": MONEY,
+    "balance_after": MONEY,
+    "delta": MONEY,
+    "principal": MONEY,
+    "balance_remaining": MONEY,
+    "from_balance": MONEY,
+    "to_balance": MONEY,
+    "total_in": MONEY,
+    "total_out": MONEY,
+    "rate": Numeric(5, 2),
+    "customer_id": Integer(),
+    "employee_id": Integer(),
+    "term_months": Integer(),
+    "days": Integer(),
+    "limit": Integer(),
+    "seq": Integer(),
+    "events": Integer(),
+    "overdraft_events": Integer(),
+    "loan_id": BigInteger(),
+    "transaction_id": BigInteger(),
+    "transfer_id": BigInteger(),
+    "after_id": BigInteger(),
+    "last_id": BigInteger(),
+    "balance_cents": BigInteger(),
+    "date_opened": DateTime(),
+    "start_date": DateTime(),
+    "end_date": DateTime(),
+    "after_ts": DateTime(),
+    "cutoff": DateTime(),
+    "timestamp": DateTime(),
+    "occurred_at": DateTime(),
+    "last_activity": DateTime(),
+    "next_due_date": DateTime(),
+}
+
+# Types of the result columns a row-returning statement may declare in `returns`. pyodbc already
+# returns DECIMAL columns as Decimal, so on SQL Server these add no per-value conversion.
+RESULT_TYPES = {
+    "amount": MONEY,
+    "balance": MONEY,
+    "balance_after": MONEY,
+    "balance_remaining": MONEY,
+    "principal": MONEY,
+    "total_in": MONEY,
+    "total_out": MONEY,
+    "interest_total": MONEY,
+    "rate": Numeric(5, 2),
+}
+
+# Binds that take a list and expand to an IN (...) list.
+EXPANDING = {"account_numbers", "customer_ids"}
+
+# SQL Server caps a statement at 2100 parameters; expanding IN-lists are sent in chunks well below that.
+IN_LIST_CHUNK = 1000
+
+_registry: dict[str, TextClause | TextualSelect] = {}
+_lock = threading.Lock()
+
+
+def _build(name: str, sql: str, returns: tuple[str, ...]) -> TextClause | TextualSelect:
+    clause = text(sql)
+    binds = [
+        bindparam(key, type_=PARAM_TYPES[key], expanding=key in EXPANDING)
+        for key in clause._bindparams  # raises KeyError for an undeclared bind name
+    ]
+    if binds:
+        clause = clause.bindparams(*binds)
+    if returns:
+        clause = clause.columns(**{column: RESULT_TYPES[column] for column in returns})  # KeyError for an untyped name
+    # The name rides along as an execution option so infra.metrics can label the statement without
+    # inspecting the call stack.
+    return clause.execution_options(statement_name=name)
+
+
+def statement(name: str, sql: str, returns: tuple[str, ...] = ()) -> TextClause | TextualSelect:
+    """
+    Return the registered statement `name`, building it from `sql` the first time it is asked for.
+    `returns` names the result columns to type from RESULT_TYPES (money and rate columns of the rows it returns).
+    """
+    stmt = _registry.get(name)
+    if stmt is None:
+        built = _build(name, sql, returns)
+        with _lock:
+            stmt = _registry.setdefault(name, built)
+    return stmt
+
+
+def in_list_chunks(values, size: int = IN_LIST_CHUNK):
+    """
+    Distinct, sorted `values` in slices of at most `size`, one per IN-list query.
+    """
+    ordered = sorted(set(values))
+    for i in range(0, len(ordered), size):
+        yield ordered[i : i + size]
+
+
+def registered() -> dict[str, str]:
+    """
+    Name -> SQL text of every statement built so far.
+    """
+    with _lock:
+        return {name: getattr(stmt, "element", stmt).text for name, stmt in sorted(_registry.items())}
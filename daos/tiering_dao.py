@@ -0,0 +1,105 @@
+from datetime import datetime
+from config import load_config
+from infra.cache import TTLCache
+from infra.db import get_engine
+from daos.statements import statement
+
+
+_cache: TTLCache | None = None
+
+
+def _watermark_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        _cache = TTLCache(1, load_config()["tiering"]["watermark_ttl_ms"] / 1000)
+    return _cache
+
+
+def archive_watermark() -> datetime | None:
+    """
+    Transactions older than this may have moved to TransactionsArchive; None while nothing has been archived.
+    Cached for TIERING_WATERMARK_TTL_MS. The mover waits that long after raising the watermark before moving
+    any row, so a cached value is never behind the rows actually moved.
+    """
+    cache = _watermark_cache()
+    cached = cache.get("Transactions")
+    if cached is not None:
+        return cached[0]
+    generation = cache.generation()
+    value = TieringDAO().get_watermark("Transactions")
+    cache.put("Transactions", (value,), tags=["Transactions"], generation=generation)
+    return value
+
+
+def invalidate_archive_watermark():
+    _watermark_cache().invalidate_tags("Transactions")
+
+
+class TieringDAO:
+    """
+    Hot/cold tiering of Transactions (migration V004): rows older than the watermark move, in bounded
+    chunks, to TransactionsArchive; a moved row keeps its transaction_id and is in exactly one tier.
+    """
+
+    def __init__(self):
+        self.engine = get_engine()
+
+    def get_watermark(self, table_name: str = "Transactions") -> datetime | None:
+        sql = statement(
+            "TieringDAO.get_watermark",
+            "SELECT archived_before FROM TierWatermarks WHERE table_name = :name",
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(sql, {"name": table_name}).scalar()
+
+    def raise_watermark(self, cutoff: datetime, table_name: str = "Transactions"):
+        """
+        Move the watermark forward to `cutoff`; it never moves back.
+        """
+        update_sql = statement(
+            "TieringDAO.raise_watermark.update",
+            """
+            UPDATE TierWatermarks
+            SET archived_before = :cutoff, updated_at = SYSUTCDATETIME()
+            WHERE table_name = :name AND archived_before < :cutoff
+            """
+        )
+        insert_sql = statement(
+            "TieringDAO.raise_watermark.insert",
+            """
+            INSERT INTO TierWatermarks (table_name, archived_before)
+            SELECT :name, :cutoff
+            WHERE NOT EXISTS (SELECT 1 FROM TierWatermarks WITH (UPDLOCK, HOLDLOCK) WHERE table_name = :name)
+            """
+        )
+        params = {"name": table_name, "cutoff": cutoff}
+        with self.engine.begin() as conn:
+            conn.execute(update_sql, params)
+            conn.execute(insert_sql, params)
+        invalidate_archive_watermark()
+
+    def move_transactions(self, cutoff: datetime, limit: int) -> int:
+        """
+        Move the oldest `limit` transactions older than `cutoff` to TransactionsArchive in one short
+        transaction; returns the rows moved (fewer than `limit` once nothing is left).
+        """
+        sql = statement(
+            "TieringDAO.move_transactions",
+            """
+            SET NOCOUNT ON;
+            WITH batch AS (
+                SELECT TOP (:limit) *
+                FROM Transactions
+                WHERE timestamp < :cutoff
+                ORDER BY timestamp, transaction_id
+            )
+            DELETE FROM batch
+            OUTPUT DELETED.transaction_id, DELETED.account_number, DELETED.transaction_type, DELETED.amount,
+                   DELETED.timestamp, DELETED.performed_by, DELETED.note, DELETED.balance_after, DELETED.reference_code
+            INTO TransactionsArchive (transaction_id, account_number, transaction_type, amount,
+                   timestamp, performed_by, note, balance_after, reference_code);
+            SELECT @@ROWCOUNT;
+            """
+        )
+        with self.engine.begin() as conn:
+            return conn.execute(sql, {"cutoff": cutoff, "limit": limit}).scalar()
@@ -1,11 +1,159 @@
+import json
+import threading
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-from sqlalchemy import text
-from infra.db import get_engine
+from itertools import product
+from typing import Iterator, List, Optional
+from sqlalchemy import TextualSelect
+from config import load_config
+from infra.db import fetch_columns, get_engine
+from infra.group_commit import GroupCommitter
+from daos.account_dao import invalidate_accounts
+from daos.reporting_dao import INFLOW_TYPES
+from daos.statements import statement
+from daos.tiering_dao import archive_watermark
 from entities import Transaction
 
 
+TRANSACTION_COLUMNS = (
+    "transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code"
+)
+TRANSACTION_RESULTS = ("amount", "balance_after")
+
+# Optional history filters, in the order of the variant key built by TransactionDAO._filters.
+HISTORY_FILTERS = (
+    ("start_date", "timestamp >= :start_date"),
+    ("end_date", "timestamp <= :end_date"),
+    ("transaction_type", "transaction_type = :transaction_type"),
+)
+KEYSET_FILTER = "(timestamp < :after_ts OR (timestamp = :after_ts AND transaction_id < :after_id))"
+
+
+# Where history rows come from: the hot table alone, or both tiers once the range reaches the
+# archive watermark (see daos.tiering_dao). A row lives in exactly one tier, so UNION ALL is exact.
+HOT_SOURCE = "Transactions WHERE {where}"
+TIERED_SOURCE = """(
+        SELECT {columns} FROM Transactions WHERE {where}
+        UNION ALL
+        SELECT {columns} FROM TransactionsArchive WHERE {where}
+    ) AS tiers"""
+
+
+def _tiered(name: str, template: str, where: str, returns: tuple[str, ...] = TRANSACTION_RESULTS) -> dict[bool, TextualSelect]:
+    """
+    The hot-only statement (key False) and the one reading both tiers (key True) for `template`,
+    whose {source} is the table plus `where`; `returns` as for daos.statements.statement.
+    """
+    return {
+        tiered: statement(
+            f"{name}[tiered]" if tiered else name,
+            template.format(
+                columns=TRANSACTION_COLUMNS,
+                source=(TIERED_SOURCE if tiered else HOT_SOURCE).format(columns=TRANSACTION_COLUMNS, where=where),
+            ),
+            returns=returns,
+        )
+        for tiered in (False, True)
+    }
+
+
+def _history_variants(name: str, template: str, extra: tuple[str, ...] = ()) -> dict[tuple[bool, ...], TextualSelect]:
+    """
+    Build one statement per combination of the optional filters (plus `extra` conditions) and tier,
+    keyed by which of them are present (the last flag: tiered), so no history query is assembled per call.
+    """
+    conditions = [sql for _, sql in HISTORY_FILTERS] + list(extra)
+    variants = {}
+    for variant in product((False, True), repeat=len(conditions)):
+        where = " AND ".join(["account_number = :account_number"] + [c for c, on in zip(conditions, variant) if on])
+        flags = "".join("1" if on else "0" for on in variant)
+        for tiered, sql in _tiered(f"{name}[{flags}]", template, where).items():
+            variants[variant + (tiered,)] = sql
+    return variants
+
+
+LIST_FOR_ACCOUNT = _history_variants(
+    "TransactionDAO.list_for_account",
+    """
+    SELECT {columns}
+    FROM {source}
+    ORDER BY timestamp DESC
+    """,
+)
+LIST_PAGE = _history_variants(
+    "TransactionDAO.list_page",
+    """
+    SELECT TOP (:limit) {columns}
+    FROM {source}
+    ORDER BY timestamp DESC, transaction_id DESC
+    """,
+    extra=(KEYSET_FILTER,),
+)
+ITER_FOR_ACCOUNT = _history_variants(
+    "TransactionDAO.iter_for_account",
+    """
+    SELECT {columns}
+    FROM {source}
+    ORDER BY timestamp DESC, transaction_id DESC
+    """,
+)
+ITER_FOR_PERIOD = _tiered(
+    "TransactionDAO.iter_for_period",
+    """
+    SELECT {columns}
+    FROM {source}
+    ORDER BY timestamp, transaction_id
+    """,
+    "account_number = :account_number AND timestamp >= :start_date AND timestamp < :end_date",
+)
+BALANCE_BEFORE = _tiered(
+    "TransactionDAO.balance_before",
+    """
+    SELECT TOP (1) timestamp, balance_after
+    FROM {source}
+    ORDER BY timestamp DESC, transaction_id DESC
+    """,
+    "account_number = :account_number AND timestamp < :start_date",
+    returns=("balance_after",),
+)
+FIRST_AFTER = _tiered(
+    "TransactionDAO.balance_before.first_after",
+    """
+    SELECT TOP (1) transaction_type, amount, balance_after
+    FROM {source}
+    ORDER BY timestamp, transaction_id
+    """,
+    "account_number = :account_number AND timestamp >= :start_date",
+)
+
+
+def _reaches_archive(start_date: Optional[datetime]) -> bool:
+    watermark = archive_watermark()
+    return watermark is not None and (start_date is None or start_date < watermark)
+
+
+_credits: GroupCommitter | None = None
+_credits_lock = threading.Lock()
+
+
+def credit_committer() -> GroupCommitter | None:
+    """
+    Process-wide group committer behind TransactionDAO.post_credit, or None when GROUP_COMMIT_ENABLED is off.
+    """
+    global _credits
+    cfg = load_config()["group_commit"]
+    if not cfg["enabled"]:
+        return None
+    with _credits_lock:
+        if _credits is None:
+            _credits = GroupCommitter(
+                "credits",
+                commit=lambda account_number, postings: TransactionDAO().post_credits(account_number, postings),
+                max_batch=cfg["max_batch"],
+            )
+        return _credits
+
+
 class TransactionDAO:
     def __init__(self):
         self.engine = get_engine()
@@ -15,46 +163,173 @@ class TransactionDAO:
             transaction_id=row.transaction_id,
             account_number=row.account_number,
             transaction_type=row.transaction_type,
-            amount=Decimal(row.amount),
+            amount=row.amount,
             timestamp=row.timestamp,
             performed_by=row.performed_by,
             note=row.note,
-            balance_after=Decimal(row.balance_after),
+            balance_after=row.balance_after,
             reference_code=row.reference_code,
         )
 
-    def list_for_account(
+    def _filters(
         self,
         account_number: str,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        transaction_type: Optional[str] = None,
-    ) -> List[Transaction]:
-        filters = ["account_number = :account_number"]
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        transaction_type: Optional[str],
+    ) -> tuple[tuple[bool, ...], dict]:
+        """
+        Which optional history filters apply (the key into the prebuilt variants) and their bind values.
+        """
         params = {"account_number": account_number}
         if start_date:
-            filters.append("timestamp >= :start_date")
             params["start_date"] = start_date
         if end_date:
-            filters.append("timestamp <= :end_date")
             params["end_date"] = end_date
         if transaction_type and transaction_type.lower() != "all":
-            filters.append("transaction_type = :transaction_type")
             params["transaction_type"] = transaction_type
-        where_clause = " AND ".join(filters)
+        return tuple(key in params for key, _ in HISTORY_FILTERS), params
 
-        sql = text(
-            f"""
-            SELECT transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code
-            FROM Transactions
-            WHERE {where_clause}
-            ORDER BY timestamp DESC
-            """
-        )
+    def list_for_account(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+    ) -> List[Transaction]:
+        variant, params = self._filters(account_number, start_date, end_date, transaction_type)
         with self.engine.connect() as conn:
-            rows = conn.execute(sql, params).mappings()
+            rows = conn.execute(LIST_FOR_ACCOUNT[variant + (_reaches_archive(start_date),)], params).mappings()
             return [self._map(r) for r in rows]
 
+    def _fetch_page(self, conn, variant: tuple[bool, ...], params: dict, start_date: Optional[datetime], fetch, timestamps):
+        """
+        Run a LIST_PAGE variant on the hot table alone whenever that is provably the whole answer: the range
+        does not reach the archive watermark, or the hot rows fill the page without going below it (archived
+        rows are all older than the watermark, so they could only come after them).
+        """
+        watermark = archive_watermark()
+        if watermark is None or (start_date is not None and start_date >= watermark):
+            return fetch(conn.execute(LIST_PAGE[variant + (False,)], params))
+        newest = min((params[k] for k in ("after_ts", "end_date") if k in params), default=None)
+        if newest is None or newest >= watermark:
+            rows = fetch(conn.execute(LIST_PAGE[variant + (False,)], params))
+            stamps = timestamps(rows)
+            if len(stamps) >= params["limit"] and stamps[-1] >= watermark:
+                return rows
+        return fetch(conn.execute(LIST_PAGE[variant + (True,)], params))
+
+    def list_page(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[List[Transaction], Optional[tuple[datetime, int]]]:
+        """
+        Keyset page of history, newest first, ordered by (timestamp, transaction_id) DESC.
+        `after` is the cursor returned with the previous page; the returned cursor is None on the last page.
+        """
+        variant, params = self._filters(account_number, start_date, end_date, transaction_type)
+        if after:
+            params["after_ts"], params["after_id"] = after
+        params["limit"] = limit + 1  # one extra row tells us whether another page exists
+
+        with self.engine.connect() as conn:
+            rows = self._fetch_page(
+                conn,
+                variant + (bool(after),),
+                params,
+                start_date,
+                lambda result: result.mappings().fetchall(),
+                lambda rows: [r.timestamp for r in rows],
+            )
+        txns = [self._map(r) for r in rows[:limit]]
+        next_cursor = (txns[-1].timestamp, txns[-1].transaction_id) if len(rows) > limit else None
+        return txns, next_cursor
+
+    def list_page_columns(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> tuple[dict[str, list], Optional[tuple[datetime, int]]]:
+        """
+        list_page as column arrays ({column: [values, ...]}) straight from the cursor, for tabular views.
+        """
+        variant, params = self._filters(account_number, start_date, end_date, transaction_type)
+        if after:
+            params["after_ts"], params["after_id"] = after
+        params["limit"] = limit + 1
+
+        with self.engine.connect() as conn:
+            columns = self._fetch_page(
+                conn, variant + (bool(after),), params, start_date, fetch_columns, lambda columns: columns["timestamp"]
+            )
+        if len(columns["transaction_id"]) <= limit:
+            return columns, None
+        columns = {name: values[:limit] for name, values in columns.items()}
+        return columns, (columns["timestamp"][-1], columns["transaction_id"][-1])
+
+    def iter_for_account(
+        self,
+        account_number: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Transaction]:
+        """
+        Stream history newest first without materializing it; rows are pulled from the
+        cursor `batch_size` at a time, so memory stays bounded however long the history is.
+        """
+        variant, params = self._filters(account_number, start_date, end_date, transaction_type)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                ITER_FOR_ACCOUNT[variant + (_reaches_archive(start_date),)], params
+            )
+            for partition in result.mappings().partitions():
+                for r in partition:
+                    yield self._map(r)
+
+    def iter_for_period(
+        self, account_number: str, start_date: datetime, end_date: datetime, batch_size: int = 1000
+    ) -> Iterator[Transaction]:
+        """
+        Stream [start_date, end_date) oldest first, `batch_size` rows at a time, for statements.
+        """
+        params = {"account_number": account_number, "start_date": start_date, "end_date": end_date}
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                ITER_FOR_PERIOD[_reaches_archive(start_date)], params
+            )
+            for partition in result.mappings().partitions():
+                for r in partition:
+                    yield self._map(r)
+
+    def balance_before(self, account_number: str, start_date: datetime) -> Optional[Decimal]:
+        """
+        Ledger balance just before `start_date`: the last earlier balance_after, else the first later row's
+        balance_after with its amount backed out. None when the account has no transactions at all.
+        """
+        params = {"account_number": account_number, "start_date": start_date}
+        watermark = archive_watermark()
+        with self.engine.connect() as conn:
+            row = conn.execute(BALANCE_BEFORE[False], params).fetchone()
+            if watermark is not None and (row is None or row.timestamp < watermark):
+                row = conn.execute(BALANCE_BEFORE[True], params).fetchone()  # an archived row may be later
+            if row:
+                return row.balance_after
+            row = conn.execute(FIRST_AFTER[_reaches_archive(start_date)], params).fetchone()
+        if not row:
+            return None
+        return row.balance_after - row.amount if row.transaction_type in INFLOW_TYPES else row.balance_after + row.amount
+
     def add(
         self,
         account_number: str,
@@ -66,11 +341,20 @@ class TransactionDAO:
         reference_code: str | None = None,
         conn=None,
     ) -> int:
-        sql = text(
+        sql = statement(
+            "TransactionDAO.add",
             """
+            SET NOCOUNT ON;
+            DECLARE @txn TABLE (transaction_id BIGINT NOT NULL, timestamp DATETIME2 NOT NULL);
             INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
-            OUTPUT INSERTED.transaction_id
-            VALUES (:account_number, :transaction_type, :amount, SYSUTCDATETIME(), :performed_by, :note, :balance_after, :reference_code)
+            OUTPUT INSERTED.transaction_id, INSERTED.timestamp INTO @txn
+            VALUES (:account_number, :transaction_type, :amount, SYSUTCDATETIME(), :performed_by, :note, :balance_after, :reference_code);
+            UPDATE AccountSummary
+            SET total_in = total_in + CASE WHEN :transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN :amount ELSE 0 END,
+                total_out = total_out + CASE WHEN :transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN :amount ELSE 0 END,
+                last_activity = (SELECT timestamp FROM @txn)
+            WHERE account_number = :account_number;
+            SELECT transaction_id FROM @txn;
             """
         )
         params = {
@@ -83,20 +367,199 @@ class TransactionDAO:
             "reference_code": reference_code,
         }
         if conn:
-            result = conn.execute(sql, params)
+            row = conn.execute(sql, params).fetchone()
         else:
             with self.engine.begin() as tx:
-                result = tx.execute(sql, params)
-        row = result.fetchone()
+                row = tx.execute(sql, params).fetchone()
         return int(row[0]) if row else 0
 
+    def post(
+        self,
+        account_number: str,
+        transaction_type: str,
+        delta: Decimal,
+        performed_by: str,
+        note: str | None,
+        reference_code: str | None = None,
+        conn=None,
+    ) -> Transaction | None:
+        """
+        Apply a signed balance delta and write the ledger row in one batch.
+        The balance is moved server-side (no stale read) and only when the account is ACTIVE
+        and stays non-negative; AccountSummary is updated alongside and the inserted row comes back via OUTPUT.
+        Returns None when nothing was posted so the caller can work out why.
+        """
+        sql = statement(
+            "TransactionDAO.post",
+            """
+            SET NOCOUNT ON;
+            DECLARE @posted TABLE (account_number NVARCHAR(20) NOT NULL, balance DECIMAL(18,2) NOT NULL);
+            DECLARE @txn TABLE (
+                transaction_id BIGINT NOT NULL, account_number NVARCHAR(20) NOT NULL, transaction_type NVARCHAR(20) NOT NULL,
+                amount DECIMAL(18,2) NOT NULL, timestamp DATETIME2 NOT NULL, performed_by NVARCHAR(100) NOT NULL,
+                note NVARCHAR(255) NULL, balance_after DECIMAL(18,2) NOT NULL, reference_code NVARCHAR(50) NULL
+            );
+            UPDATE Accounts
+            SET balance = balance + :delta
+            OUTPUT INSERTED.account_number, INSERTED.balance INTO @posted
+            WHERE account_number = :account_number
+              AND status = 'ACTIVE'
+              AND balance + :delta >= 0;
+            INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+            OUTPUT INSERTED.transaction_id, INSERTED.account_number, INSERTED.transaction_type, INSERTED.amount, INSERTED.timestamp,
+                   INSERTED.performed_by, INSERTED.note, INSERTED.balance_after, INSERTED.reference_code INTO @txn
+            SELECT account_number, :transaction_type, :amount, SYSUTCDATETIME(), :performed_by, :note, balance, :reference_code
+            FROM @posted;
+            UPDATE s
+            SET total_in = s.total_in + CASE WHEN t.transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN t.amount ELSE 0 END,
+                total_out = s.total_out + CASE WHEN t.transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN t.amount ELSE 0 END,
+                last_activity = t.timestamp
+            FROM AccountSummary s JOIN @txn t ON t.account_number = s.account_number;
+            SELECT transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code
+            FROM @txn;
+            """,
+            returns=TRANSACTION_RESULTS,
+        )
+        params = {
+            "account_number": account_number,
+            "transaction_type": transaction_type,
+            "delta": delta,
+            "amount": abs(delta),
+            "performed_by": performed_by,
+            "note": note,
+            "reference_code": reference_code,
+        }
+        if conn:
+            row = conn.execute(sql, params).mappings().fetchone()
+        else:
+            with self.engine.begin() as tx:
+                row = tx.execute(sql, params).mappings().fetchone()
+        if not row:
+            return None
+        invalidate_accounts(account_number, conn=conn)
+        return self._map(row)
+
+    def post_credits(self, account_number: str, postings: list[dict], conn=None) -> list[Transaction | None]:
+        """
+        Post several credits (transaction_type, amount, performed_by, note, reference_code) to one account in
+        one batch: a single balance UPDATE for their total, then one ledger row each, in order, with the
+        running balance_after. All are posted or, when the account is missing or not ACTIVE, none (each None).
+        """
+        if any(p["amount"] <= 0 or p["transaction_type"] not in INFLOW_TYPES for p in postings):
+            raise ValueError("Only positive credits can be posted together")
+        params = {
+            "account_number": account_number,
+            "amount": sum((p["amount"] for p in postings), Decimal("0")),
+            "postings": json.dumps(
+                [
+                    {
+                        "seq": seq,
+                        "transaction_type": p["transaction_type"],
+                        "amount": str(p["amount"]),
+                        "performed_by": p["performed_by"],
+                        "note": p.get("note"),
+                        "reference_code": p.get("reference_code"),
+                    }
+                    for seq, p in enumerate(postings)
+                ]
+            ),
+        }
+        if conn is None:
+            with self.engine.begin() as tx:
+                rows = self._run_post_credits(tx, params)
+        else:
+            rows = self._run_post_credits(conn, params)
+        if not rows:
+            return [None] * len(postings)
+        invalidate_accounts(account_number, conn=conn)
+        return [self._map(r) for r in rows]
+
+    def _run_post_credits(self, conn, params: dict) -> list:
+        sql = statement(
+            "TransactionDAO.post_credits",
+            """
+            SET NOCOUNT ON;
+            DECLARE @posted TABLE (balance DECIMAL(18,2) NOT NULL);
+            DECLARE @txn TABLE (
+                transaction_id BIGINT NOT NULL, account_number NVARCHAR(20) NOT NULL, transaction_type NVARCHAR(20) NOT NULL,
+                amount DECIMAL(18,2) NOT NULL, timestamp DATETIME2 NOT NULL, performed_by NVARCHAR(100) NOT NULL,
+                note NVARCHAR(255) NULL, balance_after DECIMAL(18,2) NOT NULL, reference_code NVARCHAR(50) NULL
+            );
+            UPDATE Accounts
+            SET balance = balance + :amount
+            OUTPUT INSERTED.balance INTO @posted
+            WHERE account_number = :account_number AND status = 'ACTIVE';
+            -- identity values follow the ORDER BY, so transaction_id order is posting order
+            INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+            OUTPUT INSERTED.transaction_id, INSERTED.account_number, INSERTED.transaction_type, INSERTED.amount, INSERTED.timestamp,
+                   INSERTED.performed_by, INSERTED.note, INSERTED.balance_after, INSERTED.reference_code INTO @txn
+            SELECT :account_number, j.transaction_type, j.amount, SYSUTCDATETIME(), j.performed_by, j.note,
+                   p.balance - :amount + SUM(j.amount) OVER (ORDER BY j.seq ROWS UNBOUNDED PRECEDING), j.reference_code
+            FROM @posted p
+            CROSS JOIN OPENJSON(:postings) WITH (
+                seq INT, transaction_type NVARCHAR(20), amount DECIMAL(18,2), performed_by NVARCHAR(100),
+                note NVARCHAR(255), reference_code NVARCHAR(50)
+            ) j
+            ORDER BY j.seq;
+            UPDATE s
+            SET total_in = s.total_in + t.total_in, total_out = s.total_out + t.total_out, last_activity = t.last_activity
+            FROM AccountSummary s
+            JOIN (
+                SELECT account_number,
+                       SUM(CASE WHEN transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN amount ELSE 0 END) AS total_in,
+                       SUM(CASE WHEN transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN amount ELSE 0 END) AS total_out,
+                       MAX(timestamp) AS last_activity
+                FROM @txn
+                GROUP BY account_number
+            ) t ON t.account_number = s.account_number;
+            SELECT transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code
+            FROM @txn
+            ORDER BY transaction_id;
+            """,
+            returns=TRANSACTION_RESULTS,
+        )
+        return conn.execute(sql, params).mappings().fetchall()
+
+    def post_credit(
+        self,
+        account_number: str,
+        transaction_type: str,
+        amount: Decimal,
+        performed_by: str,
+        note: str | None,
+        reference_code: str | None = None,
+    ) -> Transaction | None:
+        """
+        post() for a credit, group-committed with credits other threads are posting to the same account
+        at the same moment (see infra/group_commit.py); falls back to post() when group commit is off.
+        """
+        if amount <= 0 or transaction_type not in INFLOW_TYPES:
+            raise ValueError("Only positive credits can be posted together")  # checked here so it cannot fail a whole batch
+        committer = credit_committer()
+        if committer is None:
+            return self.post(account_number, transaction_type, amount, performed_by, note, reference_code)
+        posting = {
+            "transaction_type": transaction_type,
+            "amount": amount,
+            "performed_by": performed_by,
+            "note": note,
+            "reference_code": reference_code,
+        }
+        return committer.submit(account_number, posting)
+
+    @staticmethod
+    def group_commit_stats() -> dict | None:
+        return _credits.stats() if _credits is not None else None
+
     def get_by_id(self, transaction_id: int) -> Transaction | None:
-        sql = text(
+        sql = statement(
+            "TransactionDAO.get_by_id",
             """
             SELECT transaction_id, account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code
             FROM Transactions
             WHERE transaction_id = :transaction_id
-            """
+            """,
+            returns=TRANSACTION_RESULTS,
         )
         with self.engine.connect() as conn:
             row = conn.execute(sql, {"transaction_id": transaction_id}).mappings().fetchone()
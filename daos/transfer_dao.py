@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List
-from sqlalchemy import text
+from typing import Iterator, List
 from infra.db import get_engine
+from daos.account_dao import invalidate_accounts
+from daos.statements import statement
 from entities import Transfer
 
 
@@ -15,25 +16,58 @@ class TransferDAO:
             transfer_id=row.transfer_id,
             from_account=row.from_account,
             to_account=row.to_account,
-            amount=Decimal(row.amount),
+            amount=row.amount,
             timestamp=row.timestamp,
             status=row.status,
             note=row.note,
         )
 
     def list_for_account(self, account_number: str) -> List[Transfer]:
-        sql = text(
+        sql = statement(
+            "TransferDAO.list_for_account",
             """
             SELECT transfer_id, from_account, to_account, amount, timestamp, status, note
             FROM Transfers
-            WHERE from_account = :acct OR to_account = :acct
+            WHERE from_account = :acct
+            UNION ALL
+            SELECT transfer_id, from_account, to_account, amount, timestamp, status, note
+            FROM Transfers
+            WHERE to_account = :acct AND from_account <> :acct
             ORDER BY timestamp DESC
-            """
+            """,
+            returns=("amount",),
         )
         with self.engine.connect() as conn:
             rows = conn.execute(sql, {"acct": account_number}).mappings()
             return [self._map(r) for r in rows]
 
+    def iter_for_period(
+        self, account_number: str, start_date: datetime, end_date: datetime, batch_size: int = 1000
+    ) -> Iterator[Transfer]:
+        """
+        Stream transfers from or to the account in [start_date, end_date), oldest first, for statements.
+        """
+        sql = statement(
+            "TransferDAO.iter_for_period",
+            """
+            SELECT transfer_id, from_account, to_account, amount, timestamp, status, note
+            FROM Transfers
+            WHERE from_account = :acct AND timestamp >= :start_date AND timestamp < :end_date
+            UNION ALL
+            SELECT transfer_id, from_account, to_account, amount, timestamp, status, note
+            FROM Transfers
+            WHERE to_account = :acct AND from_account <> :acct AND timestamp >= :start_date AND timestamp < :end_date
+            ORDER BY timestamp, transfer_id
+            """,
+            returns=("amount",),
+        )
+        params = {"acct": account_number, "start_date": start_date, "end_date": end_date}
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(sql, params)
+            for partition in result.mappings().partitions():
+                for r in partition:
+                    yield self._map(r)
+
     def add(
         self,
         from_account: str,
@@ -43,7 +77,8 @@ class TransferDAO:
         note: str | None,
         conn=None,
     ) -> int:
-        sql = text(
+        sql = statement(
+            "TransferDAO.add",
             """
             INSERT INTO Transfers (from_account, to_account, amount, timestamp, status, note)
             OUTPUT INSERTED.transfer_id
@@ -64,3 +99,170 @@ class TransferDAO:
                 result = tx.execute(sql, params)
         row = result.fetchone()
         return int(row[0]) if row else 0
+
+    def post_transfer(
+        self,
+        from_account: str,
+        to_account: str,
+        amount: Decimal,
+        performed_by: str,
+        note: str | None,
+        conn=None,
+    ) -> Transfer | None:
+        """
+        Move funds between two accounts in one batch: lock both rows in key order, check status and
+        funds, apply both balance changes, write the Transfers row and its two mirrored Transactions
+        rows, bump both AccountSummary rows, and return the new transfer via OUTPUT.
+        Returns None when the transfer was rejected so the caller can work out why.
+        """
+        sql = statement(
+            "TransferDAO.post_transfer",
+            """
+            SET NOCOUNT ON;
+            DECLARE @moved TABLE (account_number NVARCHAR(20) NOT NULL, balance DECIMAL(18,2) NOT NULL);
+            DECLARE @transfer TABLE (
+                transfer_id BIGINT NOT NULL, from_account NVARCHAR(20) NOT NULL, to_account NVARCHAR(20) NOT NULL,
+                amount DECIMAL(18,2) NOT NULL, timestamp DATETIME2 NOT NULL, status NVARCHAR(20) NOT NULL, note NVARCHAR(255) NULL
+            );
+            DECLARE @src_balance DECIMAL(18,2), @src_status NVARCHAR(20), @dst_status NVARCHAR(20);
+
+            -- The clustered seek visits the IN-list in key order, so both row locks are taken in a fixed order
+            SELECT
+                @src_balance = MAX(CASE WHEN account_number = :from_account THEN balance END),
+                @src_status = MAX(CASE WHEN account_number = :from_account THEN status END),
+                @dst_status = MAX(CASE WHEN account_number = :to_account THEN status END)
+            FROM Accounts WITH (UPDLOCK, ROWLOCK, HOLDLOCK)
+            WHERE account_number IN (:from_account, :to_account);
+
+            IF @src_status = 'ACTIVE' AND @dst_status = 'ACTIVE' AND @src_balance >= :amount
+            BEGIN
+                UPDATE Accounts
+                SET balance = balance + CASE WHEN account_number = :from_account THEN -:amount ELSE :amount END
+                OUTPUT INSERTED.account_number, INSERTED.balance INTO @moved
+                WHERE account_number IN (:from_account, :to_account);
+
+                INSERT INTO Transfers (from_account, to_account, amount, timestamp, status, note)
+                OUTPUT INSERTED.transfer_id, INSERTED.from_account, INSERTED.to_account, INSERTED.amount,
+                       INSERTED.timestamp, INSERTED.status, INSERTED.note INTO @transfer
+                VALUES (:from_account, :to_account, :amount, SYSUTCDATETIME(), 'COMPLETED', :note);
+
+                -- Mirror into transaction log for both accounts
+                INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+                SELECT
+                    m.account_number,
+                    CASE WHEN m.account_number = :from_account THEN 'TRANSFER_OUT' ELSE 'TRANSFER_IN' END,
+                    t.amount, t.timestamp, :performed_by, t.note, m.balance, CAST(t.transfer_id AS NVARCHAR(50))
+                FROM @moved m CROSS JOIN @transfer t;
+
+                UPDATE s
+                SET total_in = s.total_in + CASE WHEN m.account_number = :to_account THEN :amount ELSE 0 END,
+                    total_out = s.total_out + CASE WHEN m.account_number = :from_account THEN :amount ELSE 0 END,
+                    last_activity = (SELECT timestamp FROM @transfer)
+                FROM AccountSummary s JOIN @moved m ON m.account_number = s.account_number;
+            END
+
+            SELECT transfer_id, from_account, to_account, amount, timestamp, status, note FROM @transfer;
+            """,
+            returns=("amount",),
+        )
+        params = {
+            "from_account": from_account,
+            "to_account": to_account,
+            "amount": amount,
+            "performed_by": performed_by,
+            "note": note,
+        }
+        if conn:
+            row = conn.execute(sql, params).mappings().fetchone()
+        else:
+            with self.engine.begin() as tx:
+                row = tx.execute(sql, params).mappings().fetchone()
+        if not row:
+            return None
+        invalidate_accounts(from_account, to_account, conn=conn)
+        return self._map(row)
+
+    def post_transfer_batch(self, rows: list[dict], performed_by: str, conn) -> dict[int, Transfer]:
+        """
+        Write a pre-validated chunk of transfers plus their mirrored Transactions rows set-based.
+        Each row carries seq, from_account, to_account, amount, note and the running from_balance /
+        to_balance after that transfer; balances themselves must already have been applied by the caller.
+        Returns the created transfers keyed by seq.
+        """
+        create_sql = statement(
+            "TransferDAO.post_transfer_batch.create",
+            """
+            SET NOCOUNT ON;
+            IF OBJECT_ID('tempdb..#transfer_batch') IS NOT NULL DROP TABLE #transfer_batch;
+            IF OBJECT_ID('tempdb..#transfer_ids') IS NOT NULL DROP TABLE #transfer_ids;
+            CREATE TABLE #transfer_batch (
+                seq INT NOT NULL PRIMARY KEY, from_account NVARCHAR(20) NOT NULL, to_account NVARCHAR(20) NOT NULL,
+                amount DECIMAL(18,2) NOT NULL, note NVARCHAR(255) NULL,
+                from_balance DECIMAL(18,2) NOT NULL, to_balance DECIMAL(18,2) NOT NULL
+            );
+            CREATE TABLE #transfer_ids (seq INT NOT NULL PRIMARY KEY, transfer_id BIGINT NOT NULL, timestamp DATETIME2 NOT NULL);
+            """
+        )
+        stage_sql = statement(
+            "TransferDAO.post_transfer_batch.stage",
+            """
+            INSERT INTO #transfer_batch (seq, from_account, to_account, amount, note, from_balance, to_balance)
+            VALUES (:seq, :from_account, :to_account, :amount, :note, :from_balance, :to_balance)
+            """
+        )
+        # MERGE (unlike INSERT) may OUTPUT source columns, which ties each identity back to its seq.
+        post_sql = statement(
+            "TransferDAO.post_transfer_batch.post",
+            """
+            SET NOCOUNT ON;
+            MERGE INTO Transfers AS t
+            USING #transfer_batch AS b ON 1 = 0
+            WHEN NOT MATCHED THEN
+                INSERT (from_account, to_account, amount, timestamp, status, note)
+                VALUES (b.from_account, b.to_account, b.amount, SYSUTCDATETIME(), 'COMPLETED', b.note)
+            OUTPUT b.seq, INSERTED.transfer_id, INSERTED.timestamp INTO #transfer_ids;
+
+            -- Every row shares one timestamp, so transaction_id must follow seq (OUT before IN) for the
+            -- balance_after chains to read in order; INSERT ... SELECT assigns identities in ORDER BY order.
+            INSERT INTO Transactions (account_number, transaction_type, amount, timestamp, performed_by, note, balance_after, reference_code)
+            SELECT leg.account_number, leg.transaction_type, b.amount, i.timestamp, :performed_by, b.note, leg.balance_after,
+                   CAST(i.transfer_id AS NVARCHAR(50))
+            FROM #transfer_batch b
+            JOIN #transfer_ids i ON i.seq = b.seq
+            CROSS APPLY (VALUES
+                (0, b.from_account, 'TRANSFER_OUT', b.from_balance),
+                (1, b.to_account, 'TRANSFER_IN', b.to_balance)
+            ) leg (leg, account_number, transaction_type, balance_after)
+            ORDER BY b.seq, leg.leg;
+
+            UPDATE s
+            SET total_in = s.total_in + d.total_in,
+                total_out = s.total_out + d.total_out,
+                last_activity = d.last_activity
+            FROM AccountSummary s
+            JOIN (
+                SELECT account_number, SUM(total_in) AS total_in, SUM(total_out) AS total_out, MAX(last_activity) AS last_activity
+                FROM (
+                    SELECT b.from_account AS account_number, 0 AS total_in, b.amount AS total_out, i.timestamp AS last_activity
+                    FROM #transfer_batch b JOIN #transfer_ids i ON i.seq = b.seq
+                    UNION ALL
+                    SELECT b.to_account, b.amount, 0, i.timestamp
+                    FROM #transfer_batch b JOIN #transfer_ids i ON i.seq = b.seq
+                ) legs
+                GROUP BY account_number
+            ) d ON d.account_number = s.account_number;
+
+            SELECT i.seq, i.transfer_id, b.from_account, b.to_account, b.amount, i.timestamp, 'COMPLETED' AS status, b.note
+            FROM #transfer_ids i JOIN #transfer_batch b ON b.seq = i.seq
+            ORDER BY i.seq;
+            """,
+            returns=("amount",),
+        )
+        drop_sql = statement("TransferDAO.post_transfer_batch.drop", "DROP TABLE #transfer_ids; DROP TABLE #transfer_batch;")
+        if not rows:
+            return {}
+        conn.execute(create_sql)
+        conn.execute(stage_sql, rows)
+        created = {r.seq: self._map(r) for r in conn.execute(post_sql, {"performed_by": performed_by}).mappings()}
+        conn.execute(drop_sql)
+        return created
@@ -0,0 +1,30 @@
+"""
+Compressed columnar archive files (Parquet) for rows purged from the database.
+
+Each file is written under a temporary name, fsynced and renamed, so an archive file either exists
+complete or not at all; callers delete rows from the database only after the file is in place.
+"""
+import os
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def write_parquet(path: Path, columns: dict[str, list], schema: pa.Schema, compression: str = "zstd") -> int:
+    """
+    Write `columns` ({name: values}) to `path` with `schema`; returns the file size in bytes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    pq.write_table(pa.Table.from_pydict(columns, schema=schema), tmp, compression=compression)
+    with open(tmp, "rb+") as fh:
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return path.stat().st_size
+
+
+def read_parquet(paths: list[Path]) -> pa.Table:
+    """
+    Concatenate archive files (e.g. to restore or audit purged rows).
+    """
+    return pa.concat_tables([pq.read_table(path) for path in paths]) if paths else pa.table({})
@@ -1,13 +1,19 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from urllib.parse import quote_plus
 from config import load_config
+from infra.metrics import InstrumentedQueuePool, instrument
+from infra.pool import ManagedQueuePool
 
 
 _engine: Engine | None = None
+_async_executor: ThreadPoolExecutor | None = None
 
 
-def _build_connection_url(config: dict) -> str:
+def build_connection_url(config: dict) -> str:
     """
     Build an ODBC connection string that works with named instances and ports.
     Example server inputs:
@@ -36,26 +42,129 @@ def _build_connection_url(config: dict) -> str:
 
 def get_engine() -> Engine:
     """
-    Lazily create a pooled SQLAlchemy engine for SQL Server.
+    Lazily create a pooled SQLAlchemy engine for SQL Server, or for the SQLite stand-in when
+    DB_BACKEND=sqlite.
     """
     global _engine
     if _engine is None:
         cfg = load_config()
         pool_cfg = cfg["pool"]
-        _engine = create_engine(
-            _build_connection_url(cfg),
+        metrics_cfg = cfg["metrics"]
+        poolclass = InstrumentedQueuePool if metrics_cfg["enabled"] else ManagedQueuePool
+        pool_args = dict(
+            poolclass=poolclass,
             pool_size=pool_cfg["max_size"],
             max_overflow=0,
             pool_timeout=pool_cfg["connection_timeout_ms"] / 1000,
             pool_recycle=pool_cfg["max_lifetime_ms"] / 1000,
             pool_pre_ping=True,
         )
+        if cfg["backend"] == "sqlite":
+            from infra.standin import create_standin_engine
+
+            _engine = create_standin_engine(cfg["sqlite_path"], **pool_args)
+        else:
+            _engine = create_engine(
+                build_connection_url(cfg),
+                **pool_args,
+                # executemany() inserts (bulk transfers, overdraft events) go as one array-bound round trip
+                fast_executemany=True,
+            )
+        _engine.pool.configure(pool_cfg["min_idle"], pool_cfg["idle_timeout_ms"] / 1000)
+        if metrics_cfg["enabled"]:
+            instrument(_engine, slow_query_ms=metrics_cfg["slow_query_ms"])
     return _engine
 
 
+def warm_up_pool() -> int:
+    """
+    Pre-open POOL_MIN_IDLE connections (in parallel) so the first requests find them ready;
+    returns how many were opened. Call once at startup, after the schema check.
+    """
+    return get_engine().pool.warm_up()
+
+
+def pool_stats() -> dict:
+    """
+    Pool occupancy and maintenance counters (warm-up, top-up, idle eviction), with or without DB metrics.
+    """
+    pool = get_engine().pool
+    return {
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        **pool.maintenance_stats(),
+    }
+
+
+def reset_engine():
+    """
+    Dispose the shared engine so the next get_engine() rebuilds it from the current config.
+    """
+    global _engine, _async_executor
+    if _async_executor is not None:
+        _async_executor.shutdown(wait=True)
+        _async_executor = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def get_async_executor() -> ThreadPoolExecutor:
+    """
+    Worker threads that async DAO calls run on. Each holds a pooled connection while it runs, so the
+    executor is capped at half the pool: one large gather queues here instead of taking every connection
+    and leaving other sessions to time out on checkout.
+    """
+    global _async_executor
+    if _async_executor is None:
+        pool_cfg = load_config()["pool"]
+        workers = pool_cfg["async_workers"] or pool_cfg["max_size"] // 4
+        workers = max(1, min(workers, pool_cfg["max_size"] // 2))
+        _async_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+    return _async_executor
+
+
+async def run_async(fn, *args, **kwargs):
+    """
+    Await a blocking DB call on the async executor. pyodbc releases the GIL while
+    waiting on the server, so calls gathered together overlap their round trips.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_async_executor(), partial(fn, *args, **kwargs))
+
+
 def execute(query: str, params: dict | None = None):
     """
     Helper for one-off parameterized executions.
     """
     with get_engine().connect() as conn:
         return conn.execute(text(query), params or {})
+
+
+def fetch_columns(result) -> dict[str, list]:
+    """
+    Drain a result into column arrays ({column: [values, ...]}) without building an object per row;
+    the dict can be handed straight to pandas.DataFrame.
+    """
+    keys = list(result.keys())
+    rows = result.fetchall()
+    if not rows:
+        return {key: [] for key in keys}
+    return dict(zip(keys, map(list, zip(*rows))))
+
+
+def fetch_columns_by(result, key: str, groups) -> dict[object, dict[str, list]]:
+    """
+    Like fetch_columns, but split into one set of column arrays per value of `key`, for every value in
+    `groups` (empty arrays when it has no rows). Row order is kept within each group.
+    """
+    keys = list(result.keys())
+    columns = {group: {k: [] for k in keys} for group in groups}
+    position = keys.index(key)
+    for row in result:
+        target = columns.get(row[position])
+        if target is not None:
+            for k, value in zip(keys, row):
+                target[k].append(value)
+    return columns
@@ -0,0 +1,99 @@
+"""
+Group commit: concurrent submissions for the same key (an account) are coalesced and committed
+together by whichever caller got there first.
+
+The first caller for a key becomes its leader and commits everything queued for the key, up to
+`max_batch` items, in one call to `commit`; callers arriving meanwhile queue up, and when the leader
+is done the oldest of them leads the next batch. Nothing waits on a timer: an idle key commits a
+single item straight away, and batches grow only while a commit is already in flight.
+"""
+import threading
+from typing import Callable, Hashable
+
+
+class _Slot:
+    __slots__ = ("item", "result", "error", "lead", "done")
+
+    def __init__(self, item):
+        self.item = item
+        self.result = None
+        self.error: BaseException | None = None
+        self.lead = False
+        self.done = threading.Event()
+
+
+class GroupCommitter:
+    def __init__(self, name: str, commit: Callable[[Hashable, list], list], max_batch: int = 100):
+        """
+        `commit(key, items)` runs one transaction and returns one result per item, in order; if it
+        raises, every caller in the batch gets the exception.
+        """
+        self.name = name
+        self._commit = commit
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, list[_Slot]] = {}
+        self._stats = {"submitted": 0, "committed": 0, "commits": 0, "failures": 0, "max_batch": 0}
+
+    def submit(self, key: Hashable, item):
+        """
+        Queue `item` for `key` and return its result once the batch holding it has committed.
+        """
+        slot = _Slot(item)
+        with self._lock:
+            self._stats["submitted"] += 1
+            queue = self._pending.get(key)
+            if queue is None:
+                self._pending[key] = [slot]
+                slot.lead = True
+            else:
+                queue.append(slot)
+        while True:
+            if slot.lead:
+                slot.lead = False
+                self._lead(key)
+            slot.done.wait()
+            if not slot.lead:
+                break
+            slot.done.clear()  # handed leadership of the next batch
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def _lead(self, key: Hashable):
+        # The leader is always first in the queue, so its own item is in the batch it commits.
+        with self._lock:
+            queue = self._pending[key]
+            batch, queue[:] = queue[: self.max_batch], queue[self.max_batch :]
+        try:
+            results = self._commit(key, [slot.item for slot in batch])
+        except BaseException as exc:  # noqa: BLE001 - delivered to every caller in the batch
+            for slot in batch:
+                slot.error = exc
+            failed = True
+        else:
+            for slot, result in zip(batch, results):
+                slot.result = result
+            failed = False
+        with self._lock:
+            self._stats["commits"] += 1
+            self._stats["failures"] += failed
+            self._stats["committed"] += 0 if failed else len(batch)
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            successor = queue[0] if queue else None
+            if successor is None:
+                del self._pending[key]
+            else:
+                successor.lead = True
+        for slot in batch:
+            slot.done.set()
+        if successor is not None:
+            successor.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "waiting": sum(len(queue) for queue in self._pending.values()),
+                "mean_batch": round(self._stats["committed"] / self._stats["commits"], 2) if self._stats["commits"] else None,
+            }
@@ -0,0 +1,177 @@
+"""
+Engine instrumentation: per-statement latency histograms tagged by registered statement name
+(daos/statements.py), a slow-query log,
+pool checkout wait time and pool occupancy. Exported as a JSON snapshot or Prometheus text.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from infra.pool import ManagedQueuePool
+
+
+slow_query_log = logging.getLogger("infra.db.slow_queries")
+
+# Upper bounds in seconds; the implicit last bucket is +Inf.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        running, out = 0, []
+        for bound, n in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class DBMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.slow_query_seconds = 0.5
+        self.statements: dict[str, Histogram] = {}
+        self.slow_queries: dict[str, int] = {}
+        self.checkout_wait = Histogram()
+        self.pool_timeouts = 0
+        self._pool = None
+
+    def observe_statement(self, tag: str, seconds: float, statement: str):
+        with self._lock:
+            self.statements.setdefault(tag, Histogram()).observe(seconds)
+            if seconds >= self.slow_query_seconds:
+                self.slow_queries[tag] = self.slow_queries.get(tag, 0) + 1
+            else:
+                return
+        slow_query_log.warning("slow query %.1f ms in %s: %s", seconds * 1000, tag, " ".join(statement.split())[:500])
+
+    def observe_checkout(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkout_wait.observe(seconds)
+            if timed_out:
+                self.pool_timeouts += 1
+
+    def pool_stats(self) -> dict:
+        pool = self._pool
+        if pool is None or not isinstance(pool, QueuePool):
+            return {}
+        return {
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **(pool.maintenance_stats() if isinstance(pool, ManagedQueuePool) else {}),
+        }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "slow_query_ms": self.slow_query_seconds * 1000,
+                "statements": {tag: h.to_dict() for tag, h in sorted(self.statements.items())},
+                "slow_queries": dict(sorted(self.slow_queries.items())),
+                "pool": {
+                    **self.pool_stats(),
+                    "timeouts": self.pool_timeouts,
+                    "checkout_wait": self.checkout_wait.to_dict(),
+                },
+            }
+
+    def prometheus_text(self) -> str:
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP bank_db_statement_duration_seconds Statement latency by registered statement.",
+                "# TYPE bank_db_statement_duration_seconds histogram",
+            ]
+            for tag, h in sorted(self.statements.items()):
+                lines += _histogram_lines("bank_db_statement_duration_seconds", h, f'statement="{tag}"')
+            lines += ["# HELP bank_db_slow_queries_total Statements slower than the slow-query threshold.", "# TYPE bank_db_slow_queries_total counter"]
+            lines += [f'bank_db_slow_queries_total{{statement="{tag}"}} {n}' for tag, n in sorted(self.slow_queries.items())]
+            lines += ["# HELP bank_db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.", "# TYPE bank_db_pool_checkout_wait_seconds histogram"]
+            lines += _histogram_lines("bank_db_pool_checkout_wait_seconds", self.checkout_wait, "")
+            lines += ["# HELP bank_db_pool_timeouts_total Checkouts that hit pool_timeout.", "# TYPE bank_db_pool_timeouts_total counter"]
+            lines.append(f"bank_db_pool_timeouts_total {self.pool_timeouts}")
+        pool = self.pool_stats()
+        if pool:
+            lines += ["# HELP bank_db_pool_connections Pooled connections by state.", "# TYPE bank_db_pool_connections gauge"]
+            lines += [f'bank_db_pool_connections{{state="{state}"}} {pool[state]}' for state in ("in_use", "idle", "overflow")]
+            lines += ["# TYPE bank_db_pool_size gauge", f"bank_db_pool_size {pool['size']}"]
+            if "min_idle" in pool:
+                lines += ["# TYPE bank_db_pool_min_idle gauge", f"bank_db_pool_min_idle {pool['min_idle']}"]
+                lines += ["# HELP bank_db_pool_maintenance_total Connections opened by warm-up and top-up, and closed by idle eviction.", "# TYPE bank_db_pool_maintenance_total counter"]
+                lines += [f'bank_db_pool_maintenance_total{{action="{action}"}} {pool[action]}' for action in ("warmed", "topped_up", "evicted")]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, h: Histogram, labels: str) -> list[str]:
+    sep = "," if labels else ""
+    lines = [f'{name}_bucket{{{labels}{sep}le="{bound}"}} {n}' for bound, n in h.cumulative()]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines += [f"{name}_sum{suffix} {h.total:.6f}", f"{name}_count{suffix} {h.count}"]
+    return lines
+
+
+metrics = DBMetrics()
+
+
+class InstrumentedQueuePool(ManagedQueuePool):
+    """
+    ManagedQueuePool that records how long each checkout waited (including opening a new connection).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            metrics.observe_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.observe_checkout(time.perf_counter() - started)
+        return conn
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    # Registered statements carry their name (daos.statements.statement); anything else is "other".
+    tag = context.execution_options.get("statement_name", "other") if context is not None else "other"
+    metrics.observe_statement(tag, time.perf_counter() - started, statement)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument(engine: Engine, slow_query_ms: int):
+    metrics.slow_query_seconds = slow_query_ms / 1000
+    metrics._pool = engine.pool
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
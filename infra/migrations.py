@@ -0,0 +1,134 @@
+import re
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from infra.db import get_engine
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "scripts" / "migrations"
+
+# Indexes the DAO queries are written against: (table, index name).
+REQUIRED_INDEXES = [
+    ("Customers", "IX_Customers_username"),
+    ("Employees", "IX_Employees_username"),
+    ("Accounts", "IX_Accounts_customer_opened"),
+    ("Transactions", "IX_Transactions_account_timestamp"),
+    ("Transactions", "IX_Transactions_timestamp"),
+    ("TransactionsArchive", "IX_TransactionsArchive_account_timestamp"),
+    ("Transfers", "IX_Transfers_from_account"),
+    ("Transfers", "IX_Transfers_to_account"),
+    ("Loans", "IX_Loans_account_start"),
+    ("OverDraftEvents", "IX_OverDraftEvents_account_occurred"),
+    ("OverDraftEvents", "IX_OverDraftEvents_occurred"),
+]
+
+_GO = re.compile(r"^\s*GO\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def split_batches(script: str) -> list[str]:
+    """
+    Split a script into its batches on sqlcmd-style GO lines, dropping empty ones.
+    """
+    return [b.strip() for b in _GO.split(script) if b.strip()]
+
+
+def load_migrations() -> list[tuple[int, str, list[str]]]:
+    """
+    Read scripts/migrations/V<version>__<description>.sql files, split on sqlcmd-style GO lines.
+    Returns (version, description, batches) sorted by version.
+    """
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("V*__*.sql"):
+        version, description = path.stem[1:].split("__", 1)
+        batches = split_batches(path.read_text(encoding="utf-8"))
+        migrations.append((int(version), description.replace("_", " "), batches))
+    return sorted(migrations)
+
+
+def latest_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def _ensure_version_table(conn):
+    conn.execute(
+        text(
+            """
+            IF OBJECT_ID('dbo.SchemaVersion', 'U') IS NULL
+            CREATE TABLE SchemaVersion (
+                version INT NOT NULL PRIMARY KEY,
+                description NVARCHAR(200) NOT NULL,
+                applied_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+            );
+            """
+        )
+    )
+
+
+def current_version(engine: Engine | None = None) -> int:
+    sql = text(
+        """
+        SELECT CASE WHEN OBJECT_ID('dbo.SchemaVersion', 'U') IS NULL THEN 0
+                    ELSE (SELECT ISNULL(MAX(version), 0) FROM SchemaVersion) END AS version
+        """
+    )
+    with (engine or get_engine()).connect() as conn:
+        return int(conn.execute(sql).scalar() or 0)
+
+
+def migrate(engine: Engine | None = None) -> list[int]:
+    """
+    Apply pending migrations in order, each in its own transaction together with its SchemaVersion row.
+    Returns the versions that were applied.
+    """
+    engine = engine or get_engine()
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+    applied = []
+    current = current_version(engine)
+    for version, description, batches in load_migrations():
+        if version <= current:
+            continue
+        with engine.begin() as conn:
+            for batch in batches:
+                conn.execute(text(batch))
+            conn.execute(
+                text("INSERT INTO SchemaVersion (version, description) VALUES (:version, :description)"),
+                {"version": version, "description": description},
+            )
+        applied.append(version)
+    return applied
+
+
+def missing_indexes(engine: Engine | None = None) -> list[str]:
+    sql = text(
+        """
+        SELECT t.name AS table_name, i.name AS index_name
+        FROM sys.indexes i
+        JOIN sys.tables t ON t.object_id = i.object_id
+        WHERE i.name IS NOT NULL
+        """
+    )
+    with (engine or get_engine()).connect() as conn:
+        present = {(r.table_name.lower(), r.index_name.lower()) for r in conn.execute(sql)}
+    return [f"{table}.{index}" for table, index in REQUIRED_INDEXES if (table.lower(), index.lower()) not in present]
+
+
+def verify_schema(engine: Engine | None = None):
+    """
+    Fail fast when the database is behind the migrations or lacks an index the DAOs rely on.
+    """
+    engine = engine or get_engine()
+    current, latest = current_version(engine), latest_version()
+    if current < latest:
+        raise RuntimeError(f"Schema is at version {current}, expected {latest}; run `python -m infra.migrations`")
+    missing = missing_indexes(engine)
+    if missing:
+        raise RuntimeError(f"Missing required indexes: {', '.join(missing)}; run `python -m infra.migrations`")
+
+
+if __name__ == "__main__":
+    versions = migrate()
+    print(f"Applied migrations: {versions}" if versions else "Schema already up to date")
+    verify_schema()
+    print(f"Schema version {current_version()}; all required indexes present")
@@ -0,0 +1,77 @@
+"""
+Minimal streaming PDF writer for plain-text documents (statements), with no third-party dependency.
+
+Lines are set in Courier on A4 pages; each page is written to the file as soon as it fills, so
+memory stays at one page however long the document is. The output carries no timestamps or
+random IDs: the same lines always produce the same bytes.
+"""
+from typing import BinaryIO
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 36
+FONT_SIZE = 8
+LEADING = 10
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+
+def _escape(line: str) -> bytes:
+    line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return line.encode("latin-1", errors="replace")
+
+
+class TextPDF:
+    # Object numbers: 1 catalog, 2 page tree, 3 font; pages take two each (content, page) from 4 on.
+    def __init__(self, fh: BinaryIO, title: str | None = None):
+        self.fh = fh
+        self.title = title
+        self.offsets: dict[int, int] = {}
+        self.page_ids: list[int] = []
+        self.lines: list[str] = []
+        self.next_id = 4
+        self.fh.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    def _object(self, number: int, body: bytes):
+        self.offsets[number] = self.fh.tell()
+        self.fh.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def line(self, text: str = ""):
+        self.lines.append(text)
+        if len(self.lines) == LINES_PER_PAGE:
+            self._flush_page()
+
+    def _flush_page(self):
+        stream = b"BT /F1 %d Tf %d TL %d %d Td\n" % (FONT_SIZE, LEADING, MARGIN, PAGE_HEIGHT - MARGIN - FONT_SIZE)
+        stream += b"".join(b"(" + _escape(text) + b") Tj T*\n" for text in self.lines) + b"ET"
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self._object(content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        self._object(
+            page_id,
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_id),
+        )
+        self.page_ids.append(page_id)
+        self.lines = []
+
+    def close(self):
+        """
+        Write the last page, the page tree, the catalog and the cross-reference table. Does not close the file.
+        """
+        if self.lines or not self.page_ids:
+            self._flush_page()
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        self._object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)))
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        info = b""
+        if self.title:
+            info_id = self.next_id
+            self._object(info_id, b"<< /Title (" + _escape(self.title) + b") >>")
+            info = b" /Info %d 0 R" % info_id
+        size = max(self.offsets) + 1
+        xref_at = self.fh.tell()
+        self.fh.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            self.fh.write(b"%010d 00000 n \n" % self.offsets[number])
+        self.fh.write(b"trailer\n<< /Size %d /Root 1 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (size, info, xref_at))
@@ -0,0 +1,41 @@
+"""
+Salted PIN hashes, stored as "pbkdf2_sha256$<iterations>$<salt>$<hash>" (salt and hash base64).
+"""
+import base64
+import hashlib
+import hmac
+import os
+
+
+ALGORITHM = "pbkdf2_sha256"
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def hash_pin(pin: str, iterations: int) -> str:
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", pin.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_pin(pin: str, encoded: str) -> bool:
+    """
+    True when `pin` matches the stored hash; malformed hashes never match.
+    """
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+        if algorithm != ALGORITHM:
+            return False
+        digest = hashlib.pbkdf2_hmac("sha256", pin.encode("utf-8"), base64.b64decode(salt), int(iterations))
+        return hmac.compare_digest(digest, base64.b64decode(expected))
+    except ValueError:  # wrong field count, bad base64 or iterations
+        return False
+
+
+def needs_rehash(encoded: str, iterations: int) -> bool:
+    """
+    True when the stored hash was made with another algorithm or work factor than the configured one.
+    """
+    return not encoded.startswith(f"{ALGORITHM}${iterations}$")
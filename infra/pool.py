@@ -0,0 +1,153 @@
+"""
+Connection pool that honors POOL_MIN_IDLE and POOL_IDLE_TIMEOUT_MS on top of QueuePool.
+
+`warm_up()` opens connections in parallel until `min_idle` sit idle, so the first requests after a
+deploy do not pay for ODBC connection setup and the TLS handshake. A background sweeper closes
+connections idle longer than `idle_timeout`, oldest first, but never below the `min_idle` floor, and
+tops the floor back up when it can. Checkouts are LIFO, so under light load the same few
+connections stay busy and the rest age out.
+
+QueuePool has no hooks for either, so this works on its queue and overflow counter directly
+(`_pool`, `_inc_overflow`, `_dec_overflow`, `_create_connection`), as QueuePool._do_get does.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.pool import QueuePool
+
+
+log = logging.getLogger("infra.pool")
+
+
+class ManagedQueuePool(QueuePool):
+    def __init__(self, *args, **kw):
+        kw.setdefault("use_lifo", True)
+        super().__init__(*args, **kw)
+        self.min_idle = 0
+        self.idle_timeout = None
+        self._stats_lock = threading.Lock()
+        self._maintenance = {"opened": 0, "warmed": 0, "topped_up": 0, "evicted": 0, "warm_up_seconds": None}
+        self._stop = threading.Event()
+        self._sweeper = None
+
+    def configure(self, min_idle: int, idle_timeout: float | None):
+        """
+        Set the idle floor (capped at the pool size) and timeout; starts the sweeper when there is a timeout.
+        """
+        self.min_idle = max(0, min(min_idle, self._pool.maxsize) if self._pool.maxsize else min_idle)
+        self.idle_timeout = idle_timeout or None
+        if self.idle_timeout and self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="pool-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self._maintenance[key] += n
+
+    def _do_get(self):
+        record = super()._do_get()
+        record.info.pop("idle_since", None)
+        return record
+
+    def _do_return_conn(self, record):
+        record.info["idle_since"] = time.monotonic()
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        record = super()._create_connection()
+        self._count("opened")
+        return record
+
+    def _open_idle(self) -> bool:
+        # One new connection straight into the idle queue; False when the pool is already at capacity.
+        if not self._inc_overflow():
+            return False
+        try:
+            record = self._create_connection()
+        except Exception:
+            self._dec_overflow()
+            raise
+        record.info["idle_since"] = time.monotonic()
+        self._pool.put(record, False)
+        return True
+
+    def _idle_open(self) -> int:
+        with self._pool.mutex:
+            return sum(1 for record in self._pool.queue if record.dbapi_connection is not None)
+
+    def _fill(self, stat: str) -> int:
+        # Open the connections missing from the min_idle floor concurrently; setup latency dominates.
+        missing = self.min_idle - self._idle_open()
+        if missing <= 0:
+            return 0
+        opened = 0
+        if not self._maintenance["opened"]:
+            # SQLAlchemy serializes connects until the first one has run the connect hooks, so open it alone.
+            opened, missing = int(self._open_idle()), missing - 1
+        if missing > 0:
+            with ThreadPoolExecutor(missing, thread_name_prefix="pool-warm-up") as pool:
+                opened += sum(pool.map(lambda _: self._open_idle(), range(missing)))
+        self._count(stat, opened)
+        return opened
+
+    def warm_up(self) -> int:
+        """
+        Open connections until `min_idle` are idle; returns how many were opened.
+        """
+        started = time.perf_counter()
+        opened = self._fill("warmed")
+        with self._stats_lock:
+            self._maintenance["warm_up_seconds"] = round(time.perf_counter() - started, 6)
+        return opened
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """
+        Close connections idle longer than `idle_timeout`, oldest first, keeping `min_idle` open and idle.
+        """
+        if not self.idle_timeout:
+            return 0
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._pool.mutex:
+            queue = self._pool.queue
+            spare = sum(1 for record in queue if record.dbapi_connection is not None) - self.min_idle
+            # LIFO checkouts pop from the right, so the longest idle connections are on the left.
+            for record in list(queue):
+                stale = now - record.info.get("idle_since", now) > self.idle_timeout
+                if record.dbapi_connection is None or (stale and spare > 0):
+                    queue.remove(record)
+                    evicted.append(record)
+                    if record.dbapi_connection is not None:
+                        spare -= 1
+        for record in evicted:
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+        self._count("evicted", len(evicted))
+        return len(evicted)
+
+    def _sweep_loop(self):
+        interval = min(max(self.idle_timeout / 4, 0.05), 30.0)
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+                if self._maintenance["warm_up_seconds"] is not None:  # keep the floor only once warmed up
+                    self._fill("topped_up")
+            except Exception as exc:  # noqa: BLE001 - the sweeper must outlive a failed connect
+                log.warning("pool maintenance failed: %s", exc)
+
+    def maintenance_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._maintenance)
+        return {**stats, "min_idle": self.min_idle, "idle_timeout_s": self.idle_timeout, "idle_open": self._idle_open()}
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.configure(self.min_idle, self.idle_timeout)
+        return pool
+
+    def dispose(self):
+        self._stop.set()
+        super().dispose()
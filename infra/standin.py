@@ -0,0 +1,1286 @@
+"""
+Local SQLite stand-in for SQL Server (DB_BACKEND=sqlite), so benchmarks/ can run the DAOs and controllers
+without a server.
+
+The DAOs speak T-SQL only, and they run here unchanged: the DB-API cursor of this engine parses each
+statement it is handed into a small program (once per distinct SQL text) and runs its steps on SQLite.
+A single statement becomes one SQLite statement and streams like any other query; batches keep their T-SQL
+meaning step by step: scalar and table variables, IF / BEGIN ... END / RETURN, OUTPUT [INTO], UPDATE ...
+FROM, insert-only MERGE, OPENJSON, CROSS APPLY (VALUES ...), stored procedures and the catalog lookups the
+migrations make. Anything else raises sqlite3.NotSupportedError instead of being guessed at.
+
+Worth knowing when reading numbers from it:
+- One writer at a time. A connection takes the database write lock (BEGIN IMMEDIATE) at its first write or
+  locking hint (UPDLOCK, HOLDLOCK, TABLOCKX) and holds it until commit or rollback; reads outside a
+  transaction see committed rows only, much like READ COMMITTED.
+- DECIMAL columns are stored as REAL and come back as Decimal rounded to the cent, so sub-cent rounding
+  can differ from SQL Server; DATETIME2 columns are ISO text and come back as datetime.
+"""
+import hashlib
+import re
+import sqlite3
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+LOCK_TIMEOUT_SECONDS = 30
+PROCEDURES_TABLE = "__standin_procedures"
+
+_TOKEN = re.compile(
+    r"""
+      (?P<space>\s+|--[^\n]*|/\*.*?\*/)
+    | (?P<string>[Nn]?'(?:[^']|'')*')
+    | (?P<quoted>"(?:[^"]|"")*"|\[[^\]]*\])
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<param>:\w+)
+    | (?P<var>@@?\w+)
+    | (?P<temp>\#\#?\w+)
+    | (?P<word>[A-Za-z_]\w*)
+    | (?P<op><>|<=|>=|!=|\|\||[-+*/%=<>(),.;~&|^])
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# A statement ends at a depth-0 semicolon, at the END of its block, or where the next one starts (after IF).
+_STATEMENT_STARTS = {
+    "SELECT", "INSERT", "UPDATE", "DELETE", "MERGE", "WITH", "SET", "DECLARE", "IF", "BEGIN", "CREATE",
+    "DROP", "ALTER", "TRUNCATE", "EXEC", "EXECUTE", "RETURN", "PRINT", "COMMIT", "ROLLBACK",
+}
+_LOCK_HINTS = {"UPDLOCK", "HOLDLOCK", "ROWLOCK", "PAGLOCK", "TABLOCK", "TABLOCKX", "XLOCK", "READPAST", "NOLOCK", "SERIALIZABLE"}
+_JOINS = {"JOIN", "INNER", "CROSS", "LEFT", "RIGHT", "FULL", "ON", "WHERE", "GROUP", "ORDER"}
+_NOOP_SET = {"NOCOUNT", "XACT_ABORT", "IDENTITY_INSERT", "ANSI_NULLS", "QUOTED_IDENTIFIER", "ARITHABORT"}
+_TYPES = {
+    "INTEGER": ("INT", "INTEGER", "BIGINT", "SMALLINT", "TINYINT", "BIT"),
+    "REAL": ("DECIMAL", "NUMERIC", "MONEY", "SMALLMONEY", "FLOAT", "REAL"),
+    "TEXT": ("DATETIME2", "DATETIME", "SMALLDATETIME", "DATE", "TIME"),
+    "TEXT COLLATE NOCASE": ("NVARCHAR", "VARCHAR", "NCHAR", "CHAR", "NTEXT", "TEXT", "UNIQUEIDENTIFIER"),
+}
+_TYPE_OF = {name: sqlite_type for sqlite_type, names in _TYPES.items() for name in names}
+
+
+def _unsupported(what: str) -> sqlite3.NotSupportedError:
+    return sqlite3.NotSupportedError(f"{what} is not supported by the SQLite stand-in")
+
+
+class _Token:
+    __slots__ = ("kind", "text", "up", "start")
+
+    def __init__(self, kind: str, text: str, start: int = -1):
+        self.kind, self.text, self.start = kind, text, start
+        self.up = text.upper()
+
+
+def _tokenize(sql: str) -> list[_Token]:
+    return [_Token(m.lastgroup, m.group(), m.start()) for m in _TOKEN.finditer(sql) if m.lastgroup != "space"]
+
+
+def _join(tokens: list[_Token]) -> str:
+    parts, glued = [], True
+    for t in tokens:
+        if not glued and t.text != ".":
+            parts.append(" ")
+        parts.append(t.text)
+        glued = t.text == "."
+    return "".join(parts)
+
+
+def _is(tokens: list[_Token], i: int, *words: str) -> bool:
+    return i < len(tokens) and tokens[i].kind == "word" and tokens[i].up in words
+
+
+def _closing(tokens: list[_Token], i: int) -> int:
+    """
+    Index of the parenthesis closing the one at tokens[i].
+    """
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j].text == "(":
+            depth += 1
+        elif tokens[j].text == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+    raise sqlite3.OperationalError("unbalanced parentheses")
+
+
+def _find(tokens: list[_Token], words: set[str] | tuple[str, ...], start: int = 0) -> int:
+    """
+    Index of the first of `words` outside parentheses at or after `start`, else len(tokens).
+    """
+    depth = 0
+    for j in range(start, len(tokens)):
+        t = tokens[j]
+        if t.text == "(":
+            depth += 1
+        elif t.text == ")":
+            depth -= 1
+        elif depth == 0 and t.kind == "word" and t.up in words:
+            return j
+    return len(tokens)
+
+
+def _positions(tokens: list[_Token], word: str) -> list[int]:
+    """
+    Indexes of `word` outside parentheses.
+    """
+    found, depth = [], 0
+    for j, t in enumerate(tokens):
+        if t.text == "(":
+            depth += 1
+        elif t.text == ")":
+            depth -= 1
+        elif depth == 0 and t.up == word and t.kind == "word":
+            found.append(j)
+    return found
+
+
+def _split(tokens: list[_Token], separator: str = ",") -> list[list[_Token]]:
+    parts, depth, start = [], 0, 0
+    for j, t in enumerate(tokens):
+        if t.text == "(":
+            depth += 1
+        elif t.text == ")":
+            depth -= 1
+        elif depth == 0 and t.text == separator:
+            parts.append(tokens[start:j])
+            start = j + 1
+    parts.append(tokens[start:])
+    return parts
+
+
+def _literal(token: _Token) -> str:
+    text = token.text[1:] if token.text[0] in "Nn" else token.text
+    return text[1:-1].replace("''", "'")
+
+
+def _name_of(token: _Token) -> str:
+    return token.text[1:-1] if token.kind == "quoted" else token.text
+
+
+def _object_name(literal: str) -> tuple[str, bool]:
+    """
+    ('Accounts', False) for 'dbo.Accounts', ('#batch', True) for 'tempdb..#batch'.
+    """
+    name = literal.split(".")[-1].strip("[]")
+    return name, name.startswith("#")
+
+
+def _sqlite_type(tokens: list[_Token]) -> str:
+    sqlite_type = _TYPE_OF.get(tokens[0].up) if tokens else None
+    if sqlite_type is None:
+        raise _unsupported(f"type {_join(tokens)}")
+    return sqlite_type
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ---------------------------------------------------------------------------------------------------------
+# Parsing: T-SQL text -> nested statements (token lists, IF and BEGIN ... END blocks, procedure definitions)
+
+
+class _Parser:
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.tokens = _tokenize(sql)
+        self.pos = 0
+
+    def block(self, until_end: bool) -> list:
+        nodes = []
+        while True:
+            while self.pos < len(self.tokens) and self.tokens[self.pos].text == ";":
+                self.pos += 1
+            if self.pos >= len(self.tokens):
+                if until_end:
+                    raise sqlite3.OperationalError("BEGIN without END")
+                return nodes
+            if until_end and _is(self.tokens, self.pos, "END"):
+                self.pos += 1
+                return nodes
+            nodes.append(self.statement())
+
+    def statement(self):
+        tokens, i = self.tokens, self.pos
+        if _is(tokens, i, "IF"):
+            self.pos += 1
+            condition = self.until_next_statement()
+            then = self.body()
+            while self.pos < len(tokens) and tokens[self.pos].text == ";":
+                self.pos += 1
+            otherwise = []
+            if _is(tokens, self.pos, "ELSE"):
+                self.pos += 1
+                otherwise = self.body()
+            return ("if", condition, then, otherwise)
+        if _is(tokens, i, "BEGIN") and not _is(tokens, i + 1, "TRAN", "TRANSACTION"):
+            self.pos += 1
+            return ("block", self.block(until_end=True))
+        if _is(tokens, i, "CREATE"):
+            j = i + 1
+            if _is(tokens, j, "OR") and _is(tokens, j + 1, "ALTER"):
+                j += 2
+            if _is(tokens, j, "PROC", "PROCEDURE"):
+                as_at = _find(tokens, ("AS",), j + 2)
+                if as_at >= len(tokens) - 1:
+                    raise _unsupported("a procedure with parameters or without a body")
+                self.pos = len(tokens)  # the rest of the batch is the procedure
+                return ("procedure", _name_of(tokens[as_at - 1]), self.sql[tokens[as_at + 1].start :])
+        return ("statement", self.simple())
+
+    def body(self) -> list:
+        if _is(self.tokens, self.pos, "BEGIN") and not _is(self.tokens, self.pos + 1, "TRAN", "TRANSACTION"):
+            self.pos += 1
+            return self.block(until_end=True)
+        return [self.statement()]
+
+    def until_next_statement(self) -> list[_Token]:
+        start, depth = self.pos, 0
+        while self.pos < len(self.tokens):
+            t = self.tokens[self.pos]
+            if t.text == "(":
+                depth += 1
+            elif t.text == ")":
+                depth -= 1
+            elif depth == 0 and t.kind == "word" and t.up in _STATEMENT_STARTS:
+                break
+            self.pos += 1
+        return self.tokens[start : self.pos]
+
+    def simple(self) -> list[_Token]:
+        start, depth, cases = self.pos, 0, 0
+        while self.pos < len(self.tokens):
+            t = self.tokens[self.pos]
+            if t.text == "(":
+                depth += 1
+            elif t.text == ")":
+                depth -= 1
+            elif depth == 0 and t.text == ";":
+                break
+            elif depth == 0 and t.kind == "word":
+                if t.up == "CASE":
+                    cases += 1
+                elif t.up == "END":
+                    if not cases:
+                        break  # END of the enclosing block
+                    cases -= 1
+            self.pos += 1
+        return self.tokens[start : self.pos]
+
+
+# ---------------------------------------------------------------------------------------------------------
+# Steps of a compiled program. run() returns True to stop the program (RETURN).
+
+
+class _Run:
+    """
+    State of one execution: the connection, its raw cursor, bind values (parameters plus variables as
+    __v_<name> and @@ROWCOUNT as __rowcount) and the first result set produced.
+    """
+
+    def __init__(self, conn: "StandinConnection", cursor: sqlite3.Cursor, params: dict):
+        self.conn, self.cursor = conn, cursor
+        self.params = {**params, "__rowcount": 0}
+        self.description, self.rows, self.rowcount = None, None, -1
+
+    def count(self, n: int):
+        self.rowcount = self.params["__rowcount"] = n
+
+    def emit(self, description, rows: list):
+        if self.description is None:
+            self.description, self.rows = description, rows
+
+    def scalar(self, sql: str):
+        row = self.cursor.execute(sql, self.params).fetchone()
+        return row[0] if row else None
+
+
+def _run_steps(steps: list, run: _Run) -> bool:
+    for step in steps:
+        if step.run(run):
+            return True
+    return False
+
+
+class _Sql:
+    """
+    One SQLite statement; its rows (RETURNING included) are the result set, or go to `into` when set.
+    `write` takes the write lock first.
+    """
+
+    __slots__ = ("sql", "write", "into")
+
+    def __init__(self, sql: str, write: bool, into: str | None = None):
+        self.sql, self.write, self.into = sql, write, into
+
+    def run(self, run: _Run):
+        if self.write:
+            run.conn.begin_write()
+        cursor = run.cursor.execute(self.sql, run.params)
+        if cursor.description is None:
+            run.count(cursor.rowcount)
+            return
+        description, rows = cursor.description, cursor.fetchall()
+        if self.into:
+            run.cursor.executemany(self.into, rows)
+        else:
+            run.emit(description, rows)
+        run.count(len(rows))
+
+
+class _Assign:
+    """
+    SELECT @a = ..., @b = ... / SET @a = ...: the last row wins; no rows leave the variables as they were.
+    """
+
+    __slots__ = ("sql", "names", "write")
+
+    def __init__(self, sql: str, names: list[str], write: bool):
+        self.sql, self.names, self.write = sql, names, write
+
+    def run(self, run: _Run):
+        if self.write:
+            run.conn.begin_write()
+        rows = run.cursor.execute(self.sql, run.params).fetchall()
+        if rows:
+            run.params.update(zip(self.names, rows[-1]))
+        run.count(len(rows))
+
+
+class _Declare:
+    __slots__ = ("name", "sql")
+
+    def __init__(self, name: str, sql: str | None):
+        self.name, self.sql = name, sql
+
+    def run(self, run: _Run):
+        run.params[self.name] = run.scalar(self.sql) if self.sql else None
+
+
+class _DeclareTable:
+    """
+    A table variable is a connection-local temp table, emptied at its DECLARE.
+    """
+
+    __slots__ = ("create", "reset")
+
+    def __init__(self, create: str, reset: str):
+        self.create, self.reset = create, reset
+
+    def run(self, run: _Run):
+        run.cursor.execute(self.create)
+        run.cursor.execute(self.reset)
+
+
+class _If:
+    __slots__ = ("condition", "then", "otherwise")
+
+    def __init__(self, condition: str, then: list, otherwise: list):
+        self.condition, self.then, self.otherwise = condition, then, otherwise
+
+    def run(self, run: _Run):
+        return _run_steps(self.then if run.scalar(self.condition) else self.otherwise, run)
+
+
+class _Return:
+    def run(self, run: _Run):
+        return True
+
+
+class _BeginTransaction:
+    def run(self, run: _Run):
+        run.conn.begin_write()
+
+
+class _MergeInsert:
+    """
+    MERGE ... ON 1 = 0 WHEN NOT MATCHED THEN INSERT ... OUTPUT: the source rows and the inserted rows are both
+    read in source rowid order, so the n-th new row (by rowid) belongs to the n-th source row.
+    """
+
+    __slots__ = ("source", "insert", "layout", "into")
+
+    def __init__(self, source: str, insert: str, layout: list[tuple[str, int]], into: str | None):
+        self.source, self.insert, self.layout, self.into = source, insert, layout, into
+
+    def run(self, run: _Run):
+        run.conn.begin_write()
+        source = run.cursor.execute(self.source, run.params).fetchall()
+        inserted = sorted(run.cursor.execute(self.insert, run.params).fetchall())
+        rows = [
+            tuple(src[i] if side == "source" else new[i] for side, i in self.layout) for src, new in zip(source, inserted)
+        ]
+        if self.into:
+            run.cursor.executemany(self.into, rows)
+        else:
+            run.emit(tuple((f"column{i}",) + (None,) * 6 for i in range(len(self.layout))), rows)
+        run.count(len(rows))
+
+
+class _CreateProcedure:
+    __slots__ = ("name", "body")
+
+    def __init__(self, name: str, body: str):
+        self.name, self.body = name, body
+
+    def run(self, run: _Run):
+        run.conn.begin_write()
+        run.cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {PROCEDURES_TABLE} (name TEXT PRIMARY KEY COLLATE NOCASE, body TEXT NOT NULL)"
+        )
+        run.cursor.execute(f"INSERT OR REPLACE INTO {PROCEDURES_TABLE} (name, body) VALUES (?, ?)", (self.name, self.body))
+
+
+class _Exec:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def run(self, run: _Run):
+        exists = run.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (PROCEDURES_TABLE,)).fetchone()
+        row = run.cursor.execute(f"SELECT body FROM {PROCEDURES_TABLE} WHERE name = ?", (self.name,)).fetchone() if exists else None
+        if row is None:
+            raise sqlite3.OperationalError(f"Could not find stored procedure '{self.name}'")
+        inner = _Run(run.conn, run.cursor, {})
+        _run_steps(_program(row[0]).steps, inner)
+        if inner.description is not None:
+            run.emit(inner.description, inner.rows)
+        run.count(inner.rowcount)
+
+
+class _Program:
+    __slots__ = ("steps", "native")
+
+    def __init__(self, steps: list):
+        self.steps = steps
+        # A lone statement without OUTPUT INTO runs straight on the SQLite cursor and streams its rows.
+        self.native = steps[0] if len(steps) == 1 and type(steps[0]) is _Sql and steps[0].into is None else None
+
+
+# ---------------------------------------------------------------------------------------------------------
+# Compiling: statements -> steps
+
+
+class _Compiler:
+    def __init__(self):
+        self.tables: dict[str, str] = {}  # table variable -> temp table
+        self.scalars: set[str] = set()
+
+    def program(self, nodes: list) -> list:
+        steps = []
+        for node in nodes:
+            kind = node[0]
+            if kind == "if":
+                condition, locking = self.rewrite(node[1])
+                sql = f"SELECT CASE WHEN ({condition}) THEN 1 ELSE 0 END"
+                if locking:
+                    steps.append(_BeginTransaction())
+                steps.append(_If(sql, self.program(node[2]), self.program(node[3])))
+            elif kind == "block":
+                steps.extend(self.program(node[1]))
+            elif kind == "procedure":
+                steps.append(_CreateProcedure(node[1], node[2]))
+            else:
+                step = self.statement(node[1])
+                if isinstance(step, list):
+                    steps.extend(step)
+                elif step is not None:
+                    steps.append(step)
+        return steps
+
+    # -- expressions ----------------------------------------------------------------------------------
+
+    def rewrite(self, tokens: list[_Token]) -> tuple[str, bool]:
+        out, locking = self.rewrite_tokens(tokens)
+        return _join(out), locking
+
+    def rewrite_tokens(self, tokens: list[_Token]) -> tuple[list[_Token], bool]:
+        """
+        Translate T-SQL expressions and table references to SQLite: dbo./[x]/N'' /#temp names, variables,
+        ISNULL, DATEADD units, CAST types, OBJECT_ID, COL_LENGTH, sys.* catalog views, TOP (n), OPENJSON and
+        CROSS APPLY (VALUES ...). Table hints are dropped and reported as `locking`.
+        """
+        tokens = self.cross_apply(tokens)
+        out: list[_Token] = []
+        pending: dict[int, list[_Token]] = {}  # token index -> LIMIT clause to insert before it
+        locking = False
+        i, n = 0, len(tokens)
+        while i < n:
+            if i in pending:
+                out.extend(pending.pop(i))
+            t = tokens[i]
+            following = tokens[i + 1] if i + 1 < n else None
+            if t.kind == "word":
+                up = t.up
+                if up == "DBO" and following is not None and following.text == ".":
+                    i += 2
+                    continue
+                if up == "SYS" and following is not None and following.text == "." and i + 2 < n:
+                    out.extend(_tokenize(self.catalog_view(tokens[i + 2].up, tokens)))
+                    i += 3
+                    continue
+                if up == "WITH" and following is not None and following.text == "(":
+                    close = _closing(tokens, i + 1)
+                    inner = tokens[i + 2 : close]
+                    if inner and inner[0].up in _LOCK_HINTS:
+                        locking = True
+                        i = close + 1
+                        continue
+                    if len(inner) > 1 and inner[1].text == "=":  # table options such as DATA_COMPRESSION
+                        i = close + 1
+                        continue
+                if following is not None and following.text == "(":
+                    close = _closing(tokens, i + 1)
+                    args = tokens[i + 2 : close]
+                    if up == "ISNULL":
+                        out.append(_Token("word", "IFNULL"))
+                        i += 1
+                        continue
+                    if up == "DATEADD" and args and args[0].kind == "word":
+                        out += [t, following, _Token("string", f"'{args[0].text.lower()}'")]
+                        i += 3
+                        continue
+                    if up == "OBJECT_ID":
+                        name, temp = _object_name(_literal(args[0]))
+                        catalog = "sqlite_temp_master" if temp else "sqlite_master"
+                        out.extend(_tokenize(f"(SELECT name FROM {catalog} WHERE type = 'table' AND name = '{name}' COLLATE NOCASE)"))
+                        i = close + 1
+                        continue
+                    if up == "COL_LENGTH":
+                        table, column = _object_name(_literal(args[0]))[0], _literal(args[2])
+                        out.extend(_tokenize(f"(SELECT 1 FROM pragma_table_info('{table}') WHERE name = '{column}' COLLATE NOCASE)"))
+                        i = close + 1
+                        continue
+                    if up == "CAST":
+                        as_at = _positions(args, "AS")[-1]
+                        expr, inner_locking = self.rewrite_tokens(args[:as_at])
+                        locking |= inner_locking
+                        sqlite_type = _sqlite_type(args[as_at + 1 :]).split()[0]
+                        out += [t, following, *expr, _Token("word", "AS"), _Token("word", sqlite_type), tokens[close]]
+                        i = close + 1
+                        continue
+                    if up == "TOP":
+                        limit, _ = self.rewrite_tokens(args)
+                        end, depth = close + 1, 0
+                        while end < n:
+                            e = tokens[end]
+                            if e.text == "(":
+                                depth += 1
+                            elif e.text == ")":
+                                if depth == 0:
+                                    break
+                                depth -= 1
+                            elif depth == 0 and e.up in ("UNION", "EXCEPT", "INTERSECT"):
+                                raise _unsupported("TOP in a compound SELECT")
+                            end += 1
+                        pending[end] = [_Token("word", "LIMIT"), *limit]
+                        i = close + 1
+                        continue
+                    if up == "OPENJSON":
+                        out.extend(self.openjson(tokens, i))
+                        i = _closing(tokens, close + 2) + 1
+                        continue
+                out.append(t)
+            elif t.kind == "var":
+                out.append(self.variable(t))
+            elif t.kind == "temp":
+                out.append(_Token("quoted", _quote(t.text)))
+            elif t.kind == "quoted" and t.text[0] == "[":
+                out.append(_Token("quoted", _quote(t.text[1:-1])))
+            elif t.kind == "string" and t.text[0] in "Nn":
+                out.append(_Token("string", t.text[1:]))
+            else:
+                out.append(t)
+            i += 1
+        if n in pending:
+            out.extend(pending.pop(n))
+        return out, locking
+
+    def variable(self, token: _Token) -> _Token:
+        name = token.text.lower()
+        if name == "@@rowcount":
+            return _Token("param", ":__rowcount")
+        if name in self.tables:
+            return _Token("quoted", _quote(self.tables[name]))
+        if name in self.scalars:
+            return _Token("param", f":__v_{name[1:]}")
+        raise sqlite3.OperationalError(f'Must declare the variable "{token.text}"')
+
+    def catalog_view(self, view: str, statement: list[_Token]) -> str:
+        if view == "INDEXES":
+            return "(SELECT name, tbl_name AS object_id FROM sqlite_master WHERE type = 'index')"
+        if view == "TABLES":
+            return "(SELECT name, name AS object_id FROM sqlite_master WHERE type = 'table')"
+        if view == "PARTITIONS":
+            # One heap/clustered partition per table the statement names through OBJECT_ID, counted exactly.
+            tables = [
+                _object_name(_literal(statement[j + 2]))[0]
+                for j in range(len(statement) - 2)
+                if statement[j].up == "OBJECT_ID" and statement[j + 2].kind == "string"
+            ]
+            if not tables:
+                raise _unsupported("sys.partitions without OBJECT_ID")
+            rows = " UNION ALL ".join(
+                f"SELECT '{name}' AS object_id, 1 AS index_id, (SELECT COUNT(*) FROM {_quote(name)}) AS rows"
+                for name in dict.fromkeys(tables)
+            )
+            return f"({rows})"
+        raise _unsupported(f"sys.{view.lower()}")
+
+    def openjson(self, tokens: list[_Token], i: int) -> list[_Token]:
+        close = _closing(tokens, i + 1)
+        if not (_is(tokens, close + 1, "WITH") and tokens[close + 2].text == "("):
+            raise _unsupported("OPENJSON without a WITH clause")
+        source, _ = self.rewrite(tokens[i + 2 : close])
+        columns = []
+        for column in _split(tokens[close + 3 : _closing(tokens, close + 2)]):
+            name = _name_of(column[0])
+            path = _literal(column[-1]) if column[-1].kind == "string" else f"$.{name}"
+            sqlite_type = _sqlite_type(column[1:]).split()[0]
+            columns.append(f"CAST(json_extract(value, '{path}') AS {sqlite_type}) AS {_quote(name)}")
+        return _tokenize(f"(SELECT {', '.join(columns)} FROM json_each({source}))")
+
+    def cross_apply(self, tokens: list[_Token]) -> list[_Token]:
+        """
+        CROSS APPLY (VALUES (...), (...)) alias (columns) -> a join with one row per VALUES row, each alias.column
+        replaced by a CASE over the row number.
+        """
+        at = next((j for j in range(len(tokens) - 3) if tokens[j].up == "CROSS" and tokens[j + 1].up == "APPLY"), None)
+        if at is None:
+            return tokens
+        if not (tokens[at + 2].text == "(" and _is(tokens, at + 3, "VALUES")):
+            raise _unsupported("CROSS APPLY other than over VALUES")
+        close = _closing(tokens, at + 2)
+        rows = [row[1:-1] for row in _split(tokens[at + 4 : close])]
+        j = close + 1 + _is(tokens, close + 1, "AS")
+        alias = tokens[j]
+        names = [c[0].up for c in _split(tokens[j + 2 : _closing(tokens, j + 1)])]
+        end = _closing(tokens, j + 1) + 1
+        values = {name: [_split(row)[k] for row in rows] for k, name in enumerate(names)}
+        numbered = " UNION ALL ".join(f"SELECT {k} AS __row" if k == 0 else f"SELECT {k}" for k in range(len(rows)))
+        joined = _tokenize(f"CROSS JOIN ({numbered}) AS {alias.text}")
+        return self.replace_columns(tokens[:at], alias, values) + joined + self.replace_columns(tokens[end:], alias, values)
+
+    @staticmethod
+    def replace_columns(tokens: list[_Token], alias: _Token, values: dict[str, list[list[_Token]]]) -> list[_Token]:
+        out, i = [], 0
+        while i < len(tokens):
+            if tokens[i].up == alias.up and i + 2 < len(tokens) and tokens[i + 1].text == "." and tokens[i + 2].up in values:
+                case = [_Token("op", "("), _Token("word", "CASE"), alias, _Token("op", "."), _Token("word", "__row")]
+                for k, value in enumerate(values[tokens[i + 2].up]):
+                    case += [_Token("word", "WHEN"), _Token("number", str(k)), _Token("word", "THEN"), *value]
+                out += case + [_Token("word", "END"), _Token("op", ")")]
+                i += 3
+            else:
+                out.append(tokens[i])
+                i += 1
+        return out
+
+    # -- statements -----------------------------------------------------------------------------------
+
+    def statement(self, tokens: list[_Token]):
+        head = tokens[0].up if tokens[0].kind == "word" else ""
+        if head == "SELECT":
+            return self.select(tokens)
+        if head == "WITH":
+            return self.common_table_expression(tokens)
+        if head == "INSERT":
+            return self.insert(tokens)
+        if head == "UPDATE":
+            return self.update(tokens)
+        if head == "DELETE":
+            return self.delete(tokens)
+        if head == "MERGE":
+            return self.merge(tokens)
+        if head == "DECLARE":
+            return self.declare(tokens)
+        if head == "SET":
+            return self.assign(tokens)
+        if head == "CREATE":
+            return self.create(tokens)
+        if head in ("DROP", "ALTER", "TRUNCATE"):
+            return self.alter(tokens)
+        if head in ("EXEC", "EXECUTE"):
+            name, end = _take_name(tokens, 1)
+            if end != len(tokens):
+                raise _unsupported("EXEC with arguments")
+            return _Exec(_name_of(name[-1]))
+        if head == "BEGIN":
+            return _BeginTransaction()
+        if head in ("COMMIT", "PRINT"):
+            return None  # the caller's transaction commits
+        if head == "RETURN":
+            return _Return()
+        if head in ("ROLLBACK", "USE", "GOTO", "WHILE", "THROW", "RAISERROR"):
+            raise _unsupported(head)
+        return _Sql(_join(tokens), write=False)  # SQLite's own statements (PRAGMA ...) pass through
+
+    def is_local(self, name: list[_Token]) -> bool:
+        """
+        True for #temp tables and table variables, which need no database write lock.
+        """
+        last = name[-1]
+        return last.kind == "temp" or (last.kind == "var" and last.text.lower() in self.tables)
+
+    def scalar_param(self, token: _Token) -> str:
+        name = token.text.lower()
+        if name not in self.scalars:
+            raise sqlite3.OperationalError(f'Must declare the scalar variable "{token.text}"')
+        return f"__v_{name[1:]}"
+
+    def select(self, tokens: list[_Token]):
+        if len(tokens) > 2 and tokens[1].kind == "var" and tokens[2].text == "=":
+            from_at = _find(tokens, ("FROM",))
+            names, columns = [], [tokens[0]]
+            for item in _split(tokens[1:from_at]):
+                if not (item[0].kind == "var" and item[1].text == "="):
+                    raise _unsupported("a SELECT that both assigns variables and returns rows")
+                names.append(self.scalar_param(item[0]))
+                columns += ([_Token("op", ",")] if len(columns) > 1 else []) + item[2:]
+            sql, locking = self.rewrite(columns + tokens[from_at:])
+            return _Assign(sql, names, locking)
+        sql, locking = self.rewrite(tokens)
+        return _Sql(sql, locking)
+
+    def assign(self, tokens: list[_Token]):
+        if tokens[1].kind == "var" and tokens[2].text == "=":
+            sql, locking = self.rewrite([_Token("word", "SELECT"), *tokens[3:]])
+            return _Assign(sql, [self.scalar_param(tokens[1])], locking)
+        if tokens[1].up in _NOOP_SET:
+            return None
+        raise _unsupported(f"SET {tokens[1].text}")
+
+    def declare(self, tokens: list[_Token]):
+        if _is(tokens, 2, "TABLE"):
+            definition = tokens[3:]
+            name = tokens[1].text.lower()
+            # Named after the definition too, so batches declaring the same name with other columns do not collide.
+            physical = f"{name}__{hashlib.sha1(_join(definition).encode()).hexdigest()[:10]}"
+            columns = self.column_definitions(definition[1:-1])
+            self.tables[name] = physical
+            return _DeclareTable(f"CREATE TEMP TABLE IF NOT EXISTS {_quote(physical)} ({columns})", f"DELETE FROM {_quote(physical)}")
+        steps = []
+        for part in _split(tokens[1:]):
+            equals = next((j for j, t in enumerate(part) if t.text == "="), None)
+            initial = self.rewrite([_Token("word", "SELECT"), *part[equals + 1 :]])[0] if equals is not None else None
+            self.scalars.add(part[0].text.lower())
+            steps.append(_Declare(self.scalar_param(part[0]), initial))
+        return steps
+
+    def column_definitions(self, tokens: list[_Token]) -> str:
+        return ", ".join(self.column_definition(part) for part in _split(tokens))
+
+    def column_definition(self, part: list[_Token]) -> str:
+        if part[0].up in ("PRIMARY", "CONSTRAINT", "FOREIGN", "UNIQUE", "CHECK"):
+            return self.rewrite([t for t in part if t.up not in ("CLUSTERED", "NONCLUSTERED")])[0]
+        end = _closing(part, 2) + 1 if len(part) > 2 and part[2].text == "(" else 2
+        sqlite_type, rest, identity, k = _sqlite_type(part[1:end]), [], False, end
+        while k < len(part):
+            t = part[k]
+            if t.up == "IDENTITY":
+                identity = True
+                k = _closing(part, k + 1) + 1 if k + 1 < len(part) and part[k + 1].text == "(" else k + 1
+            elif t.up in ("CLUSTERED", "NONCLUSTERED"):
+                k += 1
+            elif t.up == "FOREIGN" and _is(part, k + 1, "KEY"):
+                k += 2  # column-level FOREIGN KEY REFERENCES is plain REFERENCES in SQLite
+            elif t.up == "DEFAULT" and k + 2 < len(part) and part[k + 1].kind == "word" and part[k + 2].text == "(":
+                close = _closing(part, k + 2)
+                rest += [t, _Token("op", "("), *part[k + 1 : close + 1], _Token("op", ")")]
+                k = close + 1
+            else:
+                rest.append(t)
+                if identity and t.up == "KEY" and rest[-2].up == "PRIMARY":
+                    rest.append(_Token("word", "AUTOINCREMENT"))
+                k += 1
+        if identity:
+            if not any(t.up == "AUTOINCREMENT" for t in rest):
+                raise _unsupported("IDENTITY outside the primary key")
+            sqlite_type = "INTEGER"
+        name = self.rewrite(part[:1])[0]
+        return f"{name} {sqlite_type} {self.rewrite(rest)[0]}".rstrip()
+
+    def create(self, tokens: list[_Token]):
+        if _is(tokens, 1, "TABLE"):
+            name, k = _take_name(tokens, 2)
+            close = _closing(tokens, k)
+            temp = name[-1].kind == "temp"
+            table = self.rewrite(name)[0]
+            return _Sql(f"CREATE {'TEMP ' if temp else ''}TABLE {table} ({self.column_definitions(tokens[k + 1 : close])})", not temp)
+        kept = [t for t in tokens if t.up not in ("CLUSTERED", "NONCLUSTERED")]
+        if not (_is(kept, 1, "INDEX") or (_is(kept, 1, "UNIQUE") and _is(kept, 2, "INDEX"))):
+            raise _unsupported(f"CREATE {tokens[1].text}")
+        out, k = [], 0
+        while k < len(kept):
+            if kept[k].up == "INCLUDE" and k + 1 < len(kept) and kept[k + 1].text == "(":
+                k = _closing(kept, k + 1) + 1  # every column is reachable from a SQLite index entry's rowid anyway
+                continue
+            out.append(kept[k])
+            k += 1
+        return _Sql(self.rewrite(out)[0], not any(t.kind == "temp" for t in out))
+
+    def alter(self, tokens: list[_Token]):
+        temp = any(t.kind == "temp" for t in tokens)
+        if tokens[0].up == "TRUNCATE":
+            return _Sql(f"DELETE FROM {self.rewrite(tokens[2:])[0]}", not temp)
+        if tokens[0].up == "ALTER":
+            name, k = _take_name(tokens, 2)
+            if not _is(tokens, k, "ADD") or len(_split(tokens[k + 1 :])) > 1:
+                raise _unsupported("ALTER TABLE other than adding one column")
+            return _Sql(f"ALTER TABLE {self.rewrite(name)[0]} ADD COLUMN {self.column_definition(tokens[k + 1 :])}", True)
+        return _Sql(self.rewrite(tokens)[0], not temp)
+
+    # -- DML with OUTPUT ------------------------------------------------------------------------------
+
+    def with_output(self, sql: str, output: list[_Token] | None, write: bool, pseudo: str, correlate=None) -> _Sql:
+        """
+        `sql` plus a RETURNING clause for `output` (OUTPUT <pseudo>.column, ... [INTO target [(columns)]]).
+        `correlate` turns an item naming another table of an UPDATE ... FROM into a subquery.
+        """
+        if output is None:
+            return _Sql(sql, write)
+        into_at = _find(output, ("INTO",))
+        items = _split(output[:into_at])
+        returning = ", ".join(self.returning_item(item, pseudo, correlate) for item in items)
+        into = None
+        if into_at < len(output):
+            name, k = _take_name(output, into_at + 1)
+            columns = f" {self.rewrite(output[k:])[0]}" if k < len(output) else ""
+            into = f"INSERT INTO {self.rewrite(name)[0]}{columns} VALUES ({', '.join('?' * len(items))})"
+            write = write or not self.is_local(name)
+        return _Sql(f"{sql} RETURNING {returning}", write, into)
+
+    def returning_item(self, item: list[_Token], pseudo: str, correlate) -> str:
+        stripped, foreign, k = [], False, 0
+        while k < len(item):
+            t = item[k]
+            dotted = k + 1 < len(item) and item[k + 1].text == "."
+            if dotted and t.up in ("INSERTED", "DELETED"):
+                if t.up != pseudo:
+                    raise _unsupported(f"{t.up} in this OUTPUT clause")
+                k += 2
+                continue
+            foreign |= dotted
+            stripped.append(t)
+            k += 1
+        if not foreign:
+            return self.rewrite(stripped)[0]
+        if correlate is None:
+            raise _unsupported("OUTPUT of another table's columns")
+        return correlate(item)
+
+    def insert(self, tokens: list[_Token]) -> _Sql:
+        name, i = _take_name(tokens, 2 if _is(tokens, 1, "INTO") else 1)
+        locking = False
+        if _is(tokens, i, "WITH") and tokens[i + 1].text == "(":
+            i, locking = _closing(tokens, i + 1) + 1, True
+        columns = ""
+        if i < len(tokens) and tokens[i].text == "(":
+            close = _closing(tokens, i)
+            columns = f" {self.rewrite(tokens[i : close + 1])[0]}"
+            i = close + 1
+        output = None
+        if _is(tokens, i, "OUTPUT"):
+            end = _find(tokens, ("VALUES", "SELECT", "DEFAULT"), i)
+            output, i = tokens[i + 1 : end], end
+        source, source_locking = self.rewrite(tokens[i:])
+        sql = f"INSERT INTO {self.rewrite(name)[0]}{columns} {source}"
+        return self.with_output(sql, output, locking or source_locking or not self.is_local(name), "INSERTED")
+
+    def update(self, tokens: list[_Token]) -> _Sql:
+        name, i = _take_name(tokens, 1)
+        locking = False
+        if _is(tokens, i, "WITH") and tokens[i + 1].text == "(":
+            i, locking = _closing(tokens, i + 1) + 1, True
+        if not _is(tokens, i, "SET"):
+            raise _unsupported("UPDATE without SET")
+        output_at, from_at, where_at = (_find(tokens, (word,), i) for word in ("OUTPUT", "FROM", "WHERE"))
+        assignments = []
+        for assignment in _split(tokens[i + 1 : min(output_at, from_at, where_at)]):
+            equals = next(j for j, t in enumerate(assignment) if t.text == "=")
+            assignments.append(self.rewrite([assignment[equals - 1], *assignment[equals:]])[0])  # SET s.x = ... -> x = ...
+        output = tokens[output_at + 1 : min(from_at, where_at)] if output_at < len(tokens) else None
+        conditions = []
+        if where_at < len(tokens):
+            where, where_locking = self.rewrite(tokens[where_at + 1 :])
+            conditions.append(where)
+            locking |= where_locking
+        if from_at == len(tokens):
+            sql = f"UPDATE {self.rewrite(name)[0]} SET {', '.join(assignments)}"
+            if conditions:
+                sql += f" WHERE {conditions[0]}"
+            return self.with_output(sql, output, locking or not self.is_local(name), "INSERTED")
+
+        # UPDATE alias SET ... FROM Table alias JOIN ... ON ...: SQLite names the target table itself and takes
+        # the other tables in FROM, with the join conditions in WHERE (inner joins only).
+        items = self.from_items(tokens[from_at + 1 : where_at])
+        wanted = _name_of(name[-1]).upper()
+        target = next((it for it in items if it["alias"] is not None and _name_of(it["alias"]).upper() == wanted), None)
+        if target is None:
+            target = next((it for it in items if it["name"] and _name_of(it["name"][-1]).upper() == wanted), None)
+        if target is None or not target["name"]:
+            raise _unsupported(f"UPDATE of {name[-1].text} through a derived table")
+        others = [it for it in items if it is not target]
+        table, target_locking = self.rewrite(target["name"] + target["hints"])
+        sources = []
+        for it in others:
+            source, source_locking = self.rewrite((it["name"] or it["source"]) + it["hints"])
+            sources.append(f"{source} AS {it['alias'].text}" if it["alias"] is not None else source)
+            locking |= source_locking
+        joins = [self.rewrite(it["on"]) for it in items if it["on"]]
+        locking |= target_locking or any(j[1] for j in joins)
+        sql = f"UPDATE {table}"
+        if target["alias"] is not None:
+            sql += f" AS {target['alias'].text}"
+        sql += f" SET {', '.join(assignments)}"
+        if sources:
+            sql += f" FROM {', '.join(sources)}"
+        where = [f"({c})" for c in [j[0] for j in joins] + conditions]
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+
+        def correlate(item: list[_Token]) -> str:
+            # RETURNING may only name the target, so another table's column is looked up through the joins,
+            # with the target referred to by its table name.
+            aliases = {"INSERTED"} | ({target["alias"].up} if target["alias"] is not None else set())
+            retarget = lambda ts: [
+                tok
+                for j, t in enumerate(ts)
+                for tok in (target["name"] if t.up in aliases and j + 1 < len(ts) and ts[j + 1].text == "." else [t])
+            ]
+            on = " AND ".join(f"({self.rewrite(retarget(it['on']))[0]})" for it in items if it["on"])
+            return f"(SELECT {self.rewrite(retarget(item))[0]} FROM {', '.join(sources)} WHERE {on or '1 = 1'} LIMIT 1)"
+
+        return self.with_output(sql, output, locking or not self.is_local(target["name"]), "INSERTED", correlate)
+
+    def from_items(self, tokens: list[_Token]) -> list[dict]:
+        items, k = [], 0
+        while k < len(tokens):
+            if tokens[k].text == "(":
+                close = _closing(tokens, k)
+                name, source, k = [], tokens[k : close + 1], close + 1
+            else:
+                name, k = _take_name(tokens, k)
+                source = name
+            hints = []
+            if _is(tokens, k, "WITH") and k + 1 < len(tokens) and tokens[k + 1].text == "(":
+                close = _closing(tokens, k + 1)
+                hints, k = tokens[k : close + 1], close + 1
+            k += _is(tokens, k, "AS")
+            alias = None
+            if k < len(tokens) and tokens[k].kind in ("word", "quoted") and tokens[k].up not in _JOINS:
+                alias, k = tokens[k], k + 1
+            on = None
+            if _is(tokens, k, "ON"):
+                end = min(_find(tokens, ("JOIN", "INNER", "CROSS", "LEFT", "RIGHT", "FULL"), k + 1), len(tokens))
+                on, k = tokens[k + 1 : end], end
+            items.append({"name": name, "source": source, "hints": hints, "alias": alias, "on": on})
+            if k >= len(tokens):
+                break
+            if tokens[k].text == ",":
+                k += 1
+                continue
+            if _is(tokens, k, "LEFT", "RIGHT", "FULL"):
+                raise _unsupported("an outer join in UPDATE ... FROM")
+            k += _is(tokens, k, "INNER", "CROSS")
+            if not _is(tokens, k, "JOIN"):
+                raise _unsupported(f"{tokens[k].text} in UPDATE ... FROM")
+            k += 1
+        return items
+
+    def delete(self, tokens: list[_Token]) -> _Sql:
+        name, i = _take_name(tokens, 2 if _is(tokens, 1, "FROM") else 1)
+        locking = False
+        if _is(tokens, i, "WITH") and tokens[i + 1].text == "(":
+            i, locking = _closing(tokens, i + 1) + 1, True
+        where_at = _find(tokens, ("WHERE",), i)
+        output = None
+        if _is(tokens, i, "OUTPUT"):
+            output = tokens[i + 1 : where_at]
+        elif i < where_at:
+            raise _unsupported("DELETE ... FROM with joins")
+        sql = f"DELETE FROM {self.rewrite(name)[0]}"
+        if where_at < len(tokens):
+            where, where_locking = self.rewrite(tokens[where_at + 1 :])
+            sql += f" WHERE {where}"
+            locking |= where_locking
+        return self.with_output(sql, output, locking or not self.is_local(name), "DELETED")
+
+    def common_table_expression(self, tokens: list[_Token]):
+        k, ctes = 1, []
+        while True:
+            name, k = tokens[k], k + 1
+            if tokens[k].text == "(":
+                k = _closing(tokens, k) + 1
+            if not _is(tokens, k, "AS"):
+                raise _unsupported("this WITH clause")
+            close = _closing(tokens, k + 1)
+            ctes.append((name, tokens[k + 2 : close]))
+            k = close + 1
+            if k < len(tokens) and tokens[k].text == ",":
+                k += 1
+                continue
+            break
+        if _is(tokens, k, "SELECT"):
+            sql, locking = self.rewrite(tokens)
+            return _Sql(sql, locking)
+        if not (_is(tokens, k, "DELETE") and len(ctes) == 1):
+            raise _unsupported(f"WITH ... {tokens[k].text}")
+        # DELETE FROM cte deletes the base-table rows the CTE selects: select their rowids instead of *.
+        name, body = ctes[0]
+        from_at = _find(body, ("FROM",))
+        stars = [j for j in range(from_at) if body[j].text == "*"]
+        if len(stars) != 1:
+            raise _unsupported("DELETE through a CTE that does not select *")
+        base, _ = _take_name(body, from_at + 1)
+        body_sql, locking = self.rewrite(body[: stars[0]] + _tokenize("rowid AS __rowid") + body[stars[0] + 1 :])
+        i = k + 1 + _is(tokens, k + 1, "FROM")
+        if tokens[i].up != name.up:
+            raise _unsupported("DELETE of another table than the CTE")
+        output = tokens[i + 2 :] if _is(tokens, i + 1, "OUTPUT") else None
+        if output is None and i + 1 < len(tokens):
+            raise _unsupported("DELETE FROM a CTE with a WHERE clause")
+        sql = f"WITH {name.text} AS ({body_sql}) DELETE FROM {self.rewrite(base)[0]} WHERE rowid IN (SELECT __rowid FROM {name.text})"
+        return self.with_output(sql, output, True, "DELETED")
+
+    def merge(self, tokens: list[_Token]) -> _MergeInsert:
+        name, i = _take_name(tokens, 2 if _is(tokens, 1, "INTO") else 1)
+        i += _is(tokens, i, "AS")
+        if not _is(tokens, i, "USING"):
+            i += 1  # target alias
+        source, i = _take_name(tokens, i + 1)
+        i += _is(tokens, i, "AS")
+        alias, i = tokens[i], i + 1
+        when_at = _find(tokens, ("WHEN",), i)
+        if not _is(tokens, i, "ON") or [t.text for t in tokens[i + 1 : when_at]] != ["1", "=", "0"]:
+            raise _unsupported("MERGE other than ON 1 = 0 (insert only)")
+        j = when_at + 3 if _is(tokens, when_at + 1, "NOT") and _is(tokens, when_at + 2, "MATCHED") else None
+        if j is not None and _is(tokens, j, "BY"):
+            j += 2
+        if j is None or not (_is(tokens, j, "THEN") and _is(tokens, j + 1, "INSERT") and tokens[j + 2].text == "("):
+            raise _unsupported("MERGE other than WHEN NOT MATCHED THEN INSERT")
+        columns_end = _closing(tokens, j + 2)
+        values_end = _closing(tokens, columns_end + 2)
+        columns = [self.rewrite(c)[0] for c in _split(tokens[j + 3 : columns_end])]
+        values = self.rewrite(tokens[columns_end + 3 : values_end])[0]
+        rest = tokens[values_end + 1 :]
+        if rest and not _is(rest, 0, "OUTPUT"):
+            raise _unsupported(f"MERGE ... {rest[0].text}")
+        output = rest[1:]
+        into_at = _find(output, ("INTO",))
+        layout, selected, inserted = [], [], []
+        for item in _split(output[:into_at]) if output else []:
+            if len(item) == 3 and item[0].up == "INSERTED" and item[1].text == ".":
+                inserted.append(self.rewrite(item[2:])[0])
+                layout.append(("inserted", len(inserted)))  # 0 is the rowid
+            else:
+                selected.append(self.rewrite(item)[0])
+                layout.append(("source", len(selected) - 1))
+        table, source_table = self.rewrite(name)[0], self.rewrite(source)[0]
+        order = f"ORDER BY {alias.text}.rowid"
+        source_sql = f"SELECT {', '.join(selected) or '1'} FROM {source_table} AS {alias.text} {order}"
+        insert_sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {values} FROM {source_table} AS {alias.text} {order} "
+            f"RETURNING {', '.join(['rowid'] + inserted)}"
+        )
+        into = None
+        if into_at < len(output):
+            target, k = _take_name(output, into_at + 1)
+            target_columns = f" {self.rewrite(output[k:])[0]}" if k < len(output) else ""
+            into = f"INSERT INTO {self.rewrite(target)[0]}{target_columns} VALUES ({', '.join('?' * len(layout))})"
+        return _MergeInsert(source_sql, insert_sql, layout, into)
+
+
+def _take_name(tokens: list[_Token], i: int) -> tuple[list[_Token], int]:
+    """
+    The (possibly schema-qualified) object name starting at tokens[i] and the index after it.
+    """
+    j = i + 1
+    while j + 1 < len(tokens) and tokens[j].text == ".":
+        j += 2
+    return tokens[i:j], j
+
+
+@lru_cache(maxsize=1024)
+def _program(sql: str) -> _Program:
+    return _Program(_Compiler().program(_Parser(sql).block(until_end=False)))
+
+
+# ---------------------------------------------------------------------------------------------------------
+# DB-API layer
+
+
+def _sysutcdatetime() -> str:
+    return datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+
+
+_DATEADD_UNITS = {"day": "days", "dd": "days", "hour": "hours", "hh": "hours", "minute": "minutes", "mi": "minutes", "second": "seconds", "ss": "seconds"}
+
+
+def _dateadd(unit: str, amount, value: str | None) -> str | None:
+    if value is None or amount is None:
+        return None
+    return (datetime.fromisoformat(value) + timedelta(**{_DATEADD_UNITS[unit]: amount})).strftime(TIMESTAMP_FORMAT)
+
+
+_TO_SQLITE = {
+    Decimal: float,
+    datetime: lambda v: v.strftime(TIMESTAMP_FORMAT),
+    date: lambda v: v.strftime("%Y-%m-%d 00:00:00.000000"),
+    bool: int,
+}
+
+
+def _from_text(value: str):
+    if len(value) in (19, 26) and value[4] == "-" and value[10] == " " and value[13] == ":":
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+_FROM_SQLITE = {float: lambda v: Decimal(f"{v:.2f}"), str: _from_text}
+
+
+def _bind(parameters) -> dict | list:
+    if not parameters:
+        return {}
+    if isinstance(parameters, Mapping):
+        return {k: v if (adapt := _TO_SQLITE.get(type(v))) is None else adapt(v) for k, v in parameters.items()}
+    return [v if (adapt := _TO_SQLITE.get(type(v))) is None else adapt(v) for v in parameters]
+
+
+def _convert(row) -> tuple:
+    return tuple([v if (convert := _FROM_SQLITE.get(type(v))) is None else convert(v) for v in row])
+
+
+class StandinCursor:
+    """
+    DB-API cursor that runs T-SQL (named :parameters) through the compiled programs above.
+    """
+
+    arraysize = 1
+
+    def __init__(self, connection: "StandinConnection"):
+        self.connection = connection
+        self._cursor = sqlite3.Cursor(connection)
+        self._rows: list | None = None  # buffered result of a batch; None while streaming from _cursor
+        self._pos = 0
+        self.description = None
+        self.rowcount = -1
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, sql: str, parameters=None):
+        program, params = _program(sql), _bind(parameters)
+        self._rows, self._pos = None, 0
+        step = program.native
+        if step is not None:
+            if step.write:
+                self.connection.begin_write()
+            self._cursor.execute(step.sql, params)
+            self.description, self.rowcount = self._cursor.description, self._cursor.rowcount
+            return self
+        run = _Run(self.connection, self._cursor, params)
+        _run_steps(program.steps, run)
+        self.description, self.rowcount, self._rows = run.description, run.rowcount, run.rows or []
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters):
+        step = _program(sql).native
+        if step is None:
+            raise _unsupported("executemany of a batch")
+        if step.write:
+            self.connection.begin_write()
+        self._cursor.executemany(step.sql, (_bind(p) for p in seq_of_parameters))
+        self._rows, self.description, self.rowcount = None, None, self._cursor.rowcount
+        return self
+
+    def fetchone(self):
+        if self._rows is None:
+            row = self._cursor.fetchone()
+        elif self._pos < len(self._rows):
+            row, self._pos = self._rows[self._pos], self._pos + 1
+        else:
+            row = None
+        return None if row is None else _convert(row)
+
+    def fetchmany(self, size: int | None = None) -> list:
+        size = size or self.arraysize
+        if self._rows is None:
+            rows = self._cursor.fetchmany(size)
+        else:
+            rows, self._pos = self._rows[self._pos : self._pos + size], min(self._pos + size, len(self._rows))
+        return [_convert(r) for r in rows]
+
+    def fetchall(self) -> list:
+        if self._rows is None:
+            rows = self._cursor.fetchall()
+        else:
+            rows, self._pos = self._rows[self._pos :], len(self._rows)
+        return [_convert(r) for r in rows]
+
+    def close(self):
+        self._cursor.close()
+
+    def setinputsizes(self, *args):
+        pass
+
+    def setoutputsize(self, *args):
+        pass
+
+
+class StandinConnection(sqlite3.Connection):
+    """
+    sqlite3 connection with the T-SQL functions the DAOs call, whose cursors run T-SQL (StandinCursor).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Deterministic, so SQLite evaluates it once per statement, as SQL Server does.
+        self.create_function("SYSUTCDATETIME", 0, _sysutcdatetime, deterministic=True)
+        self.create_function("GETUTCDATE", 0, _sysutcdatetime, deterministic=True)
+        self.create_function("DATEADD", 3, _dateadd, deterministic=True)
+        cursor = sqlite3.Cursor(self)
+        for pragma in ("journal_mode = WAL", "synchronous = NORMAL", "foreign_keys = ON", "temp_store = MEMORY"):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    def cursor(self, factory=None) -> StandinCursor:
+        return StandinCursor(self)
+
+    def begin_write(self):
+        """
+        Take the database write lock for the rest of the transaction (waiting up to LOCK_TIMEOUT_SECONDS).
+        """
+        if not self.in_transaction:
+            sqlite3.Cursor(self).execute("BEGIN IMMEDIATE")
+
+
+def create_standin_engine(path: str, **pool_args) -> Engine:
+    """
+    Engine on the SQLite database file at `path` whose connections run T-SQL; `pool_args` (poolclass,
+    pool_size, ...) are passed to create_engine as for the SQL Server engine.
+    """
+
+    def connect() -> StandinConnection:
+        return sqlite3.connect(
+            path,
+            timeout=LOCK_TIMEOUT_SECONDS,
+            isolation_level=None,  # transactions are begun by begin_write, committed by SQLAlchemy
+            check_same_thread=False,
+            factory=StandinConnection,
+            cached_statements=256,
+        )
+
+    return create_engine("sqlite://", creator=connect, paramstyle="named", **pool_args)
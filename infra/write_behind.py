@@ -0,0 +1,214 @@
+"""
+Write-behind buffer: records are acknowledged once appended to a local spill file and held in memory,
+then written to the database in batches by a background thread when `max_events` are pending or
+`max_delay` seconds have passed, whichever comes first.
+
+Spill files are segments (<name>-<seq>.jsonl). Each flush seals the current segment and starts a new
+one; a sealed segment is deleted only after the batch containing its records has committed, so a
+crash loses nothing that was acknowledged. Segments left by a crashed process are read back at
+startup and handed to `replay` (which must tolerate records that already reached the database,
+since the crash may have come between the commit and the delete). One process per spill directory.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from infra.metrics import Histogram
+
+
+log = logging.getLogger("infra.write_behind")
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[list], None],
+        replay: Callable[[list], None],
+        encode: Callable[[object], dict],
+        decode: Callable[[dict], object],
+        spill_dir: Path,
+        max_events: int = 500,
+        max_delay: float = 1.0,
+        fsync: bool = True,
+    ):
+        self.name = name
+        self._flush, self._replay, self._encode, self._decode = flush, replay, encode, decode
+        self.spill_dir = Path(spill_dir)
+        self.max_events = max_events
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()  # one flush at a time, whoever triggers it
+        self._pending: list = []
+        self._sealed: list[Path] = []
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "recovered": 0,
+            "failures": 0,
+            "flushes": {"replay": 0, "size": 0, "time": 0, "manual": 0, "close": 0},
+            "max_batch": 0,
+            "last_error": None,
+        }
+        self._flush_seconds = Histogram()
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        leftovers = sorted(self.spill_dir.glob(f"{name}-*.jsonl"))
+        self._recovered = [self._decode(json.loads(line)) for path in leftovers for line in path.read_text("utf-8").splitlines() if line.strip()]
+        self._recovered_segments = leftovers
+        self._stats["recovered"] = len(self._recovered)
+        self._seq = max((int(p.stem.rsplit("-", 1)[1]) for p in leftovers), default=0)
+        self._segment_path, self._segment = self._open_segment()
+
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _open_segment(self):
+        self._seq += 1
+        path = self.spill_dir / f"{self.name}-{self._seq:08d}.jsonl"
+        return path, open(path, "a", encoding="utf-8")
+
+    def add(self, record):
+        """
+        Append `record` to the spill file and queue it; returns once it is durable locally.
+        """
+        line = json.dumps(self._encode(record), separators=(",", ":"))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} buffer is closed")
+            self._segment.write(line + "\n")
+            self._segment.flush()
+            if self.fsync:
+                os.fsync(self._segment.fileno())
+            self._pending.append(record)
+            self._stats["enqueued"] += 1
+            if len(self._pending) >= self.max_events:
+                self._wake.notify()
+
+    def _run(self):
+        while True:
+            with self._wake:
+                full = self._wake.wait_for(lambda: self._closed or len(self._pending) >= self.max_events, timeout=self.max_delay)
+                if self._closed:
+                    return
+            if full or self._pending or self._recovered:
+                self.flush("size" if full else "time")
+
+    def flush(self, trigger: str = "manual") -> int:
+        """
+        Write everything pending (and anything recovered from a previous crash) to the database now.
+        Returns the number of records handed to the database; on failure they stay queued and on disk for
+        the next flush.
+        """
+        with self._flush_lock:
+            written = 0
+            if self._recovered:
+                started = time.perf_counter()
+                try:
+                    self._replay(self._recovered)
+                except Exception as exc:  # noqa: BLE001 - kept for the next flush
+                    self._failed(exc, time.perf_counter() - started)
+                    return 0
+                written += len(self._recovered)
+                self._unlink(self._recovered_segments)
+                with self._lock:
+                    self._flush_seconds.observe(time.perf_counter() - started)
+                    self._stats["flushes"]["replay"] += 1
+                self._recovered, self._recovered_segments = [], []
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if batch or self._closed:
+                    self._segment.close()
+                    self._sealed.append(self._segment_path)
+                    if not self._closed:
+                        self._segment_path, self._segment = self._open_segment()
+            if not batch:
+                self._unlink(self._sealed if self._closed else [])
+                return written
+            started = time.perf_counter()
+            try:
+                self._flush(batch)
+            except Exception as exc:  # noqa: BLE001 - kept for the next flush
+                with self._lock:
+                    self._pending[:0] = batch
+                self._failed(exc, time.perf_counter() - started)
+                return written
+            elapsed = time.perf_counter() - started
+            sealed, self._sealed = self._sealed, []
+            self._unlink(sealed)
+            with self._lock:
+                self._flush_seconds.observe(elapsed)
+                self._stats["flushes"][trigger] += 1
+                self._stats["flushed"] += len(batch)
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            return written + len(batch)
+
+    def _failed(self, exc: Exception, seconds: float):
+        log.warning("%s flush failed, records kept for retry: %s", self.name, exc)
+        with self._lock:
+            self._flush_seconds.observe(seconds)
+            self._stats["failures"] += 1
+            self._stats["last_error"] = str(exc)
+
+    @staticmethod
+    def _unlink(paths: list[Path]):
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def close(self):
+        """
+        Stop the flusher and write what is left; records that still fail stay in the spill files.
+        """
+        with self._wake:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+        self._thread.join()
+        self.flush("close")
+        self._segment.close()
+        atexit.unregister(self.close)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "flushes": dict(self._stats["flushes"]),
+                "pending": len(self._pending) + len(self._recovered),
+                "flush_seconds": self._flush_seconds.to_dict(),
+            }
+
+
+def write_behind_prometheus_text(name: str, stats: dict) -> str:
+    """
+    Prometheus exposition of WriteBehindBuffer.stats() for buffer `name`.
+    """
+    label = f'buffer="{name}"'
+    lines = [
+        "# HELP bank_write_behind_pending Records queued or recovered and not yet written.",
+        "# TYPE bank_write_behind_pending gauge",
+        f"bank_write_behind_pending{{{label}}} {stats['pending']}",
+        "# HELP bank_write_behind_records_total Records by stage.",
+        "# TYPE bank_write_behind_records_total counter",
+    ]
+    lines += [f'bank_write_behind_records_total{{{label},stage="{stage}"}} {stats[stage]}' for stage in ("enqueued", "flushed", "recovered")]
+    lines += ["# HELP bank_write_behind_flushes_total Successful flushes by trigger.", "# TYPE bank_write_behind_flushes_total counter"]
+    lines += [f'bank_write_behind_flushes_total{{{label},trigger="{trigger}"}} {n}' for trigger, n in stats["flushes"].items()]
+    lines += ["# HELP bank_write_behind_flush_failures_total Flushes that failed and were kept for retry.", "# TYPE bank_write_behind_flush_failures_total counter"]
+    lines.append(f"bank_write_behind_flush_failures_total{{{label}}} {stats['failures']}")
+    lines += ["# HELP bank_write_behind_flush_seconds Flush duration.", "# TYPE bank_write_behind_flush_seconds histogram"]
+    flush_seconds = stats["flush_seconds"]
+    lines += [f'bank_write_behind_flush_seconds_bucket{{{label},le="{bound}"}} {n}' for bound, n in flush_seconds["buckets"].items()]
+    lines += [
+        f"bank_write_behind_flush_seconds_sum{{{label}}} {flush_seconds['sum_seconds']:.6f}",
+        f"bank_write_behind_flush_seconds_count{{{label}}} {flush_seconds['count']}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,31 @@
+"""
+Monthly interest accrual for SAVINGS accounts; safe to rerun, an interrupted period resumes
+after its last committed chunk and a completed one posts nothing.
+
+    python -m jobs.accrue_interest --period 2026-10
+"""
+import argparse
+from decimal import Decimal
+
+from controllers import InterestController
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--period", help="YYYY-MM (default: current month)")
+    parser.add_argument("--rate", type=Decimal, help="annual %% (default: SAVINGS_INTEREST_RATE)")
+    parser.add_argument("--chunk-size", type=int, help="accounts per transaction (default: INTEREST_CHUNK_SIZE)")
+    parser.add_argument("--max-chunks", type=int, help="stop after this many chunks; rerun to continue")
+    args = parser.parse_args()
+
+    stats = InterestController().accrue(args.period, args.rate, args.chunk_size, max_chunks=args.max_chunks)
+    state = "completed" if stats["completed"] else "paused (rerun to resume)"
+    print(
+        f"{stats['period']} @ {stats['rate']}%: {stats['accounts_posted']} of {stats['accounts_scanned']} accounts credited, "
+        f"{stats['interest_posted']} posted in {stats['chunks']} chunks, {stats['seconds']}s "
+        f"({stats['accounts_per_sec']} accounts/s); {state}"
+    )
+
+
+if __name__ == "__main__":
+    main()
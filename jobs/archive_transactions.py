@@ -0,0 +1,30 @@
+"""
+Hot/cold tiering: move transactions older than --hot-days to TransactionsArchive in short chunks;
+safe to interrupt and rerun. History queries read the archive only for ranges that reach it.
+
+    python -m jobs.archive_transactions --hot-days 365 --chunk-size 5000
+"""
+import argparse
+
+from controllers import TieringController
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hot-days", type=int, help="default: TRANSACTION_HOT_DAYS")
+    parser.add_argument("--chunk-size", type=int, help="rows moved per transaction (default: TIERING_CHUNK_SIZE)")
+    parser.add_argument("--max-chunks", type=int, help="stop after this many chunks (the next run resumes)")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(f"\r{stats['moved']} moved in {stats['chunks']} chunks, {stats['seconds']}s", end="", flush=True)
+
+    stats = TieringController().archive_transactions(args.hot_days, args.chunk_size, progress=report, max_chunks=args.max_chunks)
+    print(
+        f"\nolder than {stats['cutoff']:%Y-%m-%d}: {stats['moved']} moved to TransactionsArchive "
+        f"in {stats['chunks']} chunks, {stats['seconds']}s ({stats['rows_per_sec']} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
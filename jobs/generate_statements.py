@@ -0,0 +1,31 @@
+"""
+Monthly account statements (CSV and/or PDF, one file per account) rendered by a process pool;
+safe to rerun, an interrupted period skips the accounts whose files are already complete.
+
+    python -m jobs.generate_statements --period 2026-09 --workers 8
+"""
+import argparse
+
+from controllers import StatementController
+from controllers.statement_controller import FORMATS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--period", help="YYYY-MM (default: previous month)")
+    parser.add_argument("--out-dir", help="root directory (default: STATEMENT_DIR)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--workers", type=int, help="processes (default: STATEMENT_WORKERS, 0 = one per CPU)")
+    parser.add_argument("--range-size", type=int, help="accounts per task (default: STATEMENT_RANGE_SIZE)")
+    args = parser.parse_args()
+
+    stats = StatementController().generate(args.period, args.out_dir, tuple(args.formats), args.workers, args.range_size)
+    print(
+        f"{stats['period']}: {stats['rendered']} statements rendered, {stats['skipped']} already present, "
+        f"{stats['accounts']} accounts in {stats['ranges']} ranges, {stats['rows']} rows, {stats['seconds']}s "
+        f"({stats['accounts_per_sec']} accounts/s) -> {stats['out_dir']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
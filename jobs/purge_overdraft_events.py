@@ -0,0 +1,35 @@
+"""
+Retention purge for OverDraftEvents: archive rows older than --days to Parquet, then delete them
+in short batches; safe to interrupt and rerun.
+
+    python -m jobs.purge_overdraft_events --days 365 --batch-size 1000 --pause-ms 50
+"""
+import argparse
+
+from controllers import RetentionController
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, required=True)
+    parser.add_argument("--batch-size", type=int, help="rows per delete transaction (default: RETENTION_BATCH_SIZE)")
+    parser.add_argument("--pause-ms", type=int, help="sleep between batches (default: RETENTION_PAUSE_MS)")
+    parser.add_argument("--rows-per-file", type=int, help="rows per archive file (default: RETENTION_ROWS_PER_FILE)")
+    parser.add_argument("--archive-dir", help="default: RETENTION_ARCHIVE_DIR")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(f"\r{stats['deleted']} / ~{stats['total']} deleted, {stats['archived']} archived, {stats['seconds']}s", end="", flush=True)
+
+    stats = RetentionController().purge_overdraft_events(
+        args.days, args.batch_size, args.pause_ms, args.rows_per_file, args.archive_dir, progress=report
+    )
+    print(
+        f"\nolder than {stats['cutoff']:%Y-%m-%d %H:%M:%S}: {stats['deleted']} deleted in {stats['batches']} batches, "
+        f"{stats['archived']} archived to {len(stats['files'])} file(s) ({stats['archive_bytes']} bytes), "
+        f"{stats['seconds']}s ({stats['rows_per_sec']} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
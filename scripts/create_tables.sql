@@ -9,6 +9,11 @@ GO
 USE BankDB;
 GO
 
+IF OBJECT_ID('dbo.SchemaVersion', 'U') IS NOT NULL DROP TABLE dbo.SchemaVersion;
+IF OBJECT_ID('dbo.TierWatermarks', 'U') IS NOT NULL DROP TABLE dbo.TierWatermarks;
+IF OBJECT_ID('dbo.TransactionsArchive', 'U') IS NOT NULL DROP TABLE dbo.TransactionsArchive;
+IF OBJECT_ID('dbo.InterestAccrualRuns', 'U') IS NOT NULL DROP TABLE dbo.InterestAccrualRuns;
+IF OBJECT_ID('dbo.AccountSummary', 'U') IS NOT NULL DROP TABLE dbo.AccountSummary;
 IF OBJECT_ID('dbo.Transactions', 'U') IS NOT NULL DROP TABLE dbo.Transactions;
 IF OBJECT_ID('dbo.Transfers', 'U') IS NOT NULL DROP TABLE dbo.Transfers;
 IF OBJECT_ID('dbo.Loans', 'U') IS NOT NULL DROP TABLE dbo.Loans;
@@ -0,0 +1,48 @@
+-- Covering indexes for every DAO lookup path; applied by `python -m infra.migrations`.
+
+-- AccountDAO.get_by_customer
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Accounts_customer_opened' AND object_id = OBJECT_ID('dbo.Accounts'))
+    CREATE INDEX IX_Accounts_customer_opened
+    ON Accounts (customer_id, date_opened DESC)
+    INCLUDE (account_type, balance, currency, status);
+GO
+
+-- TransactionDAO.list_for_account / list_page / iter_for_account
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transactions_account_timestamp' AND object_id = OBJECT_ID('dbo.Transactions'))
+    CREATE INDEX IX_Transactions_account_timestamp
+    ON Transactions (account_number, timestamp DESC, transaction_id DESC)
+    INCLUDE (transaction_type, amount, performed_by, note, balance_after, reference_code);
+GO
+
+-- TransferDAO.list_for_account (one seek per side of the UNION ALL)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transfers_from_account' AND object_id = OBJECT_ID('dbo.Transfers'))
+    CREATE INDEX IX_Transfers_from_account
+    ON Transfers (from_account, timestamp DESC)
+    INCLUDE (to_account, amount, status, note);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transfers_to_account' AND object_id = OBJECT_ID('dbo.Transfers'))
+    CREATE INDEX IX_Transfers_to_account
+    ON Transfers (to_account, timestamp DESC)
+    INCLUDE (from_account, amount, status, note);
+GO
+
+-- LoanDAO.list_for_account
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Loans_account_start' AND object_id = OBJECT_ID('dbo.Loans'))
+    CREATE INDEX IX_Loans_account_start
+    ON Loans (account_number, start_date DESC)
+    INCLUDE (principal, balance_remaining, rate, term_months, status, next_due_date);
+GO
+
+-- OverDraftEventDAO.list_for_account
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_OverDraftEvents_account_occurred' AND object_id = OBJECT_ID('dbo.OverDraftEvents'))
+    CREATE INDEX IX_OverDraftEvents_account_occurred
+    ON OverDraftEvents (account_number, occurred_at DESC)
+    INCLUDE (amount, note, balance_after);
+GO
+
+-- OverDraftEventDAO.delete_older_than_days
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_OverDraftEvents_occurred' AND object_id = OBJECT_ID('dbo.OverDraftEvents'))
+    CREATE INDEX IX_OverDraftEvents_occurred
+    ON OverDraftEvents (occurred_at);
+GO
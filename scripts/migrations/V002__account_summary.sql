@@ -0,0 +1,49 @@
+-- Per-account running totals, maintained by every posting path in the same transaction.
+-- ReportingDAO.account_summary reads this instead of joining Transactions x OverDraftEvents.
+
+IF OBJECT_ID('dbo.AccountSummary', 'U') IS NULL
+    CREATE TABLE AccountSummary (
+        account_number NVARCHAR(20) NOT NULL PRIMARY KEY FOREIGN KEY REFERENCES Accounts(account_number),
+        total_in DECIMAL(18,2) NOT NULL DEFAULT 0,
+        total_out DECIMAL(18,2) NOT NULL DEFAULT 0,
+        overdraft_events INT NOT NULL DEFAULT 0,
+        last_activity DATETIME2 NULL
+    );
+GO
+
+-- One-shot backfill; also run after bulk loads that bypass the DAOs (e.g. seed_data.sql).
+-- Run while postings are quiesced: it recomputes every row from the base tables.
+CREATE OR ALTER PROCEDURE dbo.RebuildAccountSummary
+AS
+BEGIN
+    SET NOCOUNT ON;
+    BEGIN TRANSACTION;
+    DELETE FROM AccountSummary WITH (TABLOCKX);
+    INSERT INTO AccountSummary (account_number, total_in, total_out, overdraft_events, last_activity)
+    SELECT
+        a.account_number,
+        ISNULL(t.total_in, 0),
+        ISNULL(t.total_out, 0),
+        ISNULL(o.events, 0),
+        CASE WHEN t.last_txn IS NULL OR o.last_event > t.last_txn THEN o.last_event ELSE t.last_txn END
+    FROM Accounts a
+    LEFT JOIN (
+        SELECT
+            account_number,
+            SUM(CASE WHEN transaction_type IN ('DEPOSIT','TRANSFER_IN') THEN amount ELSE 0 END) AS total_in,
+            SUM(CASE WHEN transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN amount ELSE 0 END) AS total_out,
+            MAX(timestamp) AS last_txn
+        FROM Transactions
+        GROUP BY account_number
+    ) t ON t.account_number = a.account_number
+    LEFT JOIN (
+        SELECT account_number, COUNT(*) AS events, MAX(occurred_at) AS last_event
+        FROM OverDraftEvents
+        GROUP BY account_number
+    ) o ON o.account_number = a.account_number;
+    COMMIT TRANSACTION;
+END
+GO
+
+EXEC dbo.RebuildAccountSummary;
+GO
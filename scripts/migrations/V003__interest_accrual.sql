@@ -0,0 +1,47 @@
+-- Monthly interest accrual on SAVINGS accounts (InterestController.accrue).
+-- One row per accrual period; last_account_number is the checkpoint a rerun resumes after.
+
+IF OBJECT_ID('dbo.InterestAccrualRuns', 'U') IS NULL
+    CREATE TABLE InterestAccrualRuns (
+        period NVARCHAR(7) NOT NULL PRIMARY KEY,  -- YYYY-MM
+        rate DECIMAL(5,2) NOT NULL,
+        last_account_number NVARCHAR(20) NULL,
+        accounts_posted INT NOT NULL DEFAULT 0,
+        interest_total DECIMAL(18,2) NOT NULL DEFAULT 0,
+        started_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+        completed_at DATETIME2 NULL
+    );
+GO
+
+-- INTEREST postings count as inflows in AccountSummary.
+CREATE OR ALTER PROCEDURE dbo.RebuildAccountSummary
+AS
+BEGIN
+    SET NOCOUNT ON;
+    BEGIN TRANSACTION;
+    DELETE FROM AccountSummary WITH (TABLOCKX);
+    INSERT INTO AccountSummary (account_number, total_in, total_out, overdraft_events, last_activity)
+    SELECT
+        a.account_number,
+        ISNULL(t.total_in, 0),
+        ISNULL(t.total_out, 0),
+        ISNULL(o.events, 0),
+        CASE WHEN t.last_txn IS NULL OR o.last_event > t.last_txn THEN o.last_event ELSE t.last_txn END
+    FROM Accounts a
+    LEFT JOIN (
+        SELECT
+            account_number,
+            SUM(CASE WHEN transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN amount ELSE 0 END) AS total_in,
+            SUM(CASE WHEN transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN amount ELSE 0 END) AS total_out,
+            MAX(timestamp) AS last_txn
+        FROM Transactions
+        GROUP BY account_number
+    ) t ON t.account_number = a.account_number
+    LEFT JOIN (
+        SELECT account_number, COUNT(*) AS events, MAX(occurred_at) AS last_event
+        FROM OverDraftEvents
+        GROUP BY account_number
+    ) o ON o.account_number = a.account_number;
+    COMMIT TRANSACTION;
+END
+GO
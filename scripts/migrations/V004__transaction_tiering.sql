@@ -0,0 +1,74 @@
+-- Hot/cold tiering of Transactions (TieringController.archive_transactions).
+-- Rows older than the tier watermark may live in TransactionsArchive instead of Transactions; a row
+-- is in exactly one of the two. Rows at or after the watermark are never moved, so history reads
+-- whose range starts at or after it only touch the hot table.
+
+IF OBJECT_ID('dbo.TransactionsArchive', 'U') IS NULL
+    CREATE TABLE TransactionsArchive (
+        transaction_id BIGINT NOT NULL PRIMARY KEY,  -- keeps the id it had in Transactions
+        account_number NVARCHAR(20) NOT NULL,
+        transaction_type NVARCHAR(20) NOT NULL,
+        amount DECIMAL(18,2) NOT NULL,
+        timestamp DATETIME2 NOT NULL,
+        performed_by NVARCHAR(100) NOT NULL,
+        note NVARCHAR(255) NULL,
+        balance_after DECIMAL(18,2) NOT NULL,
+        reference_code NVARCHAR(50) NULL
+    ) WITH (DATA_COMPRESSION = PAGE);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TransactionsArchive_account_timestamp' AND object_id = OBJECT_ID('dbo.TransactionsArchive'))
+    CREATE INDEX IX_TransactionsArchive_account_timestamp
+    ON TransactionsArchive (account_number, timestamp DESC, transaction_id DESC)
+    WITH (DATA_COMPRESSION = PAGE);
+GO
+
+-- Moving walks Transactions oldest first.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Transactions_timestamp' AND object_id = OBJECT_ID('dbo.Transactions'))
+    CREATE INDEX IX_Transactions_timestamp ON Transactions (timestamp, transaction_id);
+GO
+
+IF OBJECT_ID('dbo.TierWatermarks', 'U') IS NULL
+    CREATE TABLE TierWatermarks (
+        table_name NVARCHAR(50) NOT NULL PRIMARY KEY,
+        archived_before DATETIME2 NOT NULL,
+        updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+    );
+GO
+
+-- Summaries cover both tiers.
+CREATE OR ALTER PROCEDURE dbo.RebuildAccountSummary
+AS
+BEGIN
+    SET NOCOUNT ON;
+    BEGIN TRANSACTION;
+    DELETE FROM AccountSummary WITH (TABLOCKX);
+    INSERT INTO AccountSummary (account_number, total_in, total_out, overdraft_events, last_activity)
+    SELECT
+        a.account_number,
+        ISNULL(t.total_in, 0),
+        ISNULL(t.total_out, 0),
+        ISNULL(o.events, 0),
+        CASE WHEN t.last_txn IS NULL OR o.last_event > t.last_txn THEN o.last_event ELSE t.last_txn END
+    FROM Accounts a
+    LEFT JOIN (
+        SELECT
+            account_number,
+            SUM(CASE WHEN transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN amount ELSE 0 END) AS total_in,
+            SUM(CASE WHEN transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN amount ELSE 0 END) AS total_out,
+            MAX(timestamp) AS last_txn
+        FROM (
+            SELECT account_number, transaction_type, amount, timestamp FROM Transactions
+            UNION ALL
+            SELECT account_number, transaction_type, amount, timestamp FROM TransactionsArchive
+        ) all_txns
+        GROUP BY account_number
+    ) t ON t.account_number = a.account_number
+    LEFT JOIN (
+        SELECT account_number, COUNT(*) AS events, MAX(occurred_at) AS last_event
+        FROM OverDraftEvents
+        GROUP BY account_number
+    ) o ON o.account_number = a.account_number;
+    COMMIT TRANSACTION;
+END
+GO
@@ -0,0 +1,23 @@
+-- Salted PIN hashes (AuthController.login). pin_hash holds "pbkdf2_sha256$<iterations>$<salt>$<hash>";
+-- rows still carrying a plaintext pin are upgraded on their next successful login, which blanks pin.
+
+IF COL_LENGTH('dbo.Customers', 'pin_hash') IS NULL
+    ALTER TABLE Customers ADD pin_hash NVARCHAR(200) NULL;
+GO
+
+IF COL_LENGTH('dbo.Employees', 'pin_hash') IS NULL
+    ALTER TABLE Employees ADD pin_hash NVARCHAR(200) NULL;
+GO
+
+-- AuthDAO.lookup_principals: username seeks that cover the login columns.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Customers_username' AND object_id = OBJECT_ID('dbo.Customers'))
+    CREATE UNIQUE INDEX IX_Customers_username
+    ON Customers (username)
+    INCLUDE (status, pin, pin_hash);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Employees_username' AND object_id = OBJECT_ID('dbo.Employees'))
+    CREATE UNIQUE INDEX IX_Employees_username
+    ON Employees (username)
+    INCLUDE (status, pin, pin_hash);
+GO
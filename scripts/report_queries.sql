@@ -2,7 +2,7 @@
 SELECT
   a.account_number,
   c.name AS customer_name,
-  SUM(CASE WHEN t.transaction_type IN ('DEPOSIT','TRANSFER_IN') THEN t.amount ELSE 0 END) AS total_in,
+  SUM(CASE WHEN t.transaction_type IN ('DEPOSIT','TRANSFER_IN','INTEREST') THEN t.amount ELSE 0 END) AS total_in,
   SUM(CASE WHEN t.transaction_type IN ('WITHDRAWAL','TRANSFER_OUT') THEN t.amount ELSE 0 END) AS total_out,
   COUNT(DISTINCT o.event_id) AS overdraft_events
 FROM Accounts a
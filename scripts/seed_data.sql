@@ -2,6 +2,7 @@ USE BankDB;
 GO
 
 -- Clear existing data
+IF OBJECT_ID('dbo.AccountSummary', 'U') IS NOT NULL DELETE FROM AccountSummary;
 DELETE FROM OverDraftEvents;
 DELETE FROM Transfers;
 DELETE FROM Transactions;
@@ -168,3 +169,7 @@ SELECT
     CAST(100 - rn * 1.1 AS DECIMAL(18,2))
 FROM ods;
 GO
+
+-- Rebuild per-account totals (created by migration V002) for the rows inserted above
+IF OBJECT_ID('dbo.RebuildAccountSummary', 'P') IS NOT NULL EXEC dbo.RebuildAccountSummary;
+GO
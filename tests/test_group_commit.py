@@ -0,0 +1,124 @@
+import threading
+import time
+import pytest
+from infra.group_commit import GroupCommitter
+
+
+class FakeCommit:
+    """
+    Stand-in for a DAO commit: records each batch and the thread that committed it. The first batch
+    blocks until `release` is set, so callers arriving meanwhile queue up behind it; batches listed
+    in `fail` raise instead of committing.
+    """
+
+    def __init__(self, fail=()):
+        self.batches: list[list] = []
+        self.leaders: list[str] = []
+        self.fail = set(fail)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, key, items):
+        number = len(self.batches)
+        self.batches.append(list(items))
+        self.leaders.append(threading.current_thread().name)
+        if number == 0:
+            self.started.set()
+            assert self.release.wait(5)
+        if number in self.fail:
+            raise RuntimeError(f"batch {number} failed")
+        return [f"{key}:{item}" for item in items]
+
+
+def _submit_all(committer, commit, items, key="acct"):
+    """
+    Submit items[0] first and the rest while its commit is in flight; returns {item: result or exception}.
+    """
+    outcomes = {}
+
+    def run(item):
+        try:
+            outcomes[item] = committer.submit(key, item)
+        except Exception as exc:  # noqa: BLE001
+            outcomes[item] = exc
+
+    threads = [threading.Thread(target=run, args=(item,), name=f"caller-{item}") for item in items]
+    threads[0].start()
+    assert commit.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while committer.stats()["waiting"] < len(items) - 1:
+        assert time.monotonic() < deadline, "callers never queued"
+        time.sleep(0.001)
+    commit.release.set()
+    for thread in threads:
+        thread.join(5)
+        assert not thread.is_alive()
+    return outcomes
+
+
+def test_idle_key_commits_straight_away():
+    committer = GroupCommitter("test", lambda key, items: [item * 2 for item in items])
+    assert committer.submit("acct", 21) == 42
+    stats = committer.stats()
+    assert (stats["commits"], stats["committed"], stats["waiting"]) == (1, 1, 0)
+
+
+def test_queued_callers_commit_as_one_batch_led_by_the_oldest():
+    commit = FakeCommit()
+    committer = GroupCommitter("test", commit)
+    outcomes = _submit_all(committer, commit, [0, 1, 2, 3])
+    assert commit.batches[0] == [0]
+    assert sorted(commit.batches[1]) == [1, 2, 3]
+    assert commit.leaders[1] == f"caller-{commit.batches[1][0]}"
+    assert outcomes == {item: f"acct:{item}" for item in range(4)}
+    assert committer.stats()["waiting"] == 0
+    assert committer.submit("acct", 4) == "acct:4"
+
+
+def test_max_batch_hands_leadership_down_the_queue():
+    commit = FakeCommit()
+    committer = GroupCommitter("test", commit, max_batch=2)
+    outcomes = _submit_all(committer, commit, [0, 1, 2, 3])
+    assert [len(batch) for batch in commit.batches] == [1, 2, 1]
+    for batch, leader in zip(commit.batches, commit.leaders):
+        assert leader == f"caller-{batch[0]}"
+    assert all(outcomes[item] == f"acct:{item}" for item in range(4))
+    assert committer.stats()["max_batch"] == 2
+
+
+def test_failed_batch_raises_in_every_caller():
+    commit = FakeCommit(fail={1})
+    committer = GroupCommitter("test", commit)
+    outcomes = _submit_all(committer, commit, [0, 1, 2, 3])
+    assert outcomes[0] == "acct:0"
+    errors = [outcomes[item] for item in (1, 2, 3)]
+    assert all(isinstance(error, RuntimeError) and str(error) == "batch 1 failed" for error in errors)
+    stats = committer.stats()
+    assert (stats["commits"], stats["failures"], stats["committed"], stats["waiting"]) == (2, 1, 1, 0)
+
+
+def test_failed_leader_still_hands_over_to_its_successor():
+    commit = FakeCommit(fail={0})
+    committer = GroupCommitter("test", commit)
+    outcomes = _submit_all(committer, commit, [0, 1, 2])
+    assert isinstance(outcomes[0], RuntimeError)
+    assert (outcomes[1], outcomes[2]) == ("acct:1", "acct:2")
+    assert commit.leaders[1] == f"caller-{commit.batches[1][0]}"
+
+
+def test_keys_commit_independently():
+    committer = GroupCommitter("test", lambda key, items: [key for _ in items])
+    assert [committer.submit(key, None) for key in ("a", "b", "a")] == ["a", "b", "a"]
+    assert committer.stats()["commits"] == 3
+
+
+def test_failure_from_a_single_caller_is_raised():
+    def commit(key, items):
+        raise ValueError("Insufficient funds")
+
+    committer = GroupCommitter("test", commit)
+    with pytest.raises(ValueError, match="Insufficient funds"):
+        committer.submit("acct", 1)
+    assert committer.stats()["waiting"] == 0
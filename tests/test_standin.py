@@ -0,0 +1,112 @@
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import text
+from infra.db import reset_engine
+from infra.standin import create_standin_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_standin_engine(str(tmp_path / "standin.db"))
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE dbo.Balances (account NVARCHAR(20) NOT NULL PRIMARY KEY, "
+                "balance DECIMAL(18,2) NOT NULL, updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME())"
+            )
+        )
+        conn.execute(text("INSERT INTO Balances (account, balance) VALUES ('A', 10.00), ('B', 0.00)"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench(tmp_path, monkeypatch):
+    """
+    The seeded benchmark database on a stand-in file, as benchmarks/ use it.
+    """
+    from benchmarks.database import configure, seed
+
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("DB_SQLITE_PATH", str(tmp_path / "bench.db"))
+    monkeypatch.setenv("OVERDRAFT_BUFFER_ENABLED", "false")
+    configure(str(tmp_path / "bench.db"))
+    seed([10])
+    yield
+    reset_engine()
+
+
+def test_values_round_trip_as_decimal_and_datetime(engine):
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT balance, updated_at FROM dbo.[Balances] WHERE account = N'a'")).one()
+    assert row.balance == Decimal("10.00")
+    assert isinstance(row.updated_at, datetime)
+
+
+def test_batch_with_variables_branches_and_output(engine):
+    batch = text(
+        """
+        SET NOCOUNT ON;
+        DECLARE @moved TABLE (account NVARCHAR(20), balance DECIMAL(18,2));
+        DECLARE @available DECIMAL(18,2);
+        SELECT @available = balance FROM Balances WITH (UPDLOCK) WHERE account = :source;
+        IF @available IS NULL OR @available < :amount
+        BEGIN
+            SELECT CAST(0 AS BIT) AS ok, NULL AS balance;
+            RETURN;
+        END
+        UPDATE Balances SET balance = balance - :amount OUTPUT INSERTED.account, INSERTED.balance INTO @moved
+        WHERE account = :source;
+        UPDATE Balances SET balance = balance + :amount OUTPUT INSERTED.account, INSERTED.balance INTO @moved
+        WHERE account = :target;
+        SELECT CAST(1 AS BIT) AS ok, SUM(balance) AS balance FROM @moved;
+        """
+    )
+    with engine.begin() as conn:
+        assert tuple(conn.execute(batch, {"source": "A", "target": "B", "amount": Decimal("4.00")}).one()) == (1, Decimal("10.00"))
+    with engine.begin() as conn:
+        assert conn.execute(batch, {"source": "A", "target": "B", "amount": Decimal("7.00")}).one().ok == 0
+    with engine.connect() as conn:
+        balances = dict(conn.execute(text("SELECT account, balance FROM Balances ORDER BY account")).all())
+    assert balances == {"A": Decimal("6.00"), "B": Decimal("4.00")}
+
+
+def test_unsupported_statement_is_refused(engine):
+    with pytest.raises(Exception) as raised:
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE b SET balance = 0 FROM Balances b LEFT JOIN Balances c ON c.account = b.account"))
+    assert isinstance(raised.value.orig, sqlite3.NotSupportedError)
+
+
+def test_daos_run_on_the_stand_in(bench):
+    from controllers import TransactionController, TransferController
+
+    transactions, transfers = TransactionController(), TransferController()
+    deposit = transactions.deposit("0000011", Decimal("2.50"), performed_by="test")
+    assert deposit.balance_after == Decimal("1000002.50")
+    result = transfers.transfer_batch(
+        [("0000011", "0000012", Decimal("1.00"), "rent"), ("0000021", "0000012", Decimal("9999999.00"), None)],
+        performed_by="test",
+    )
+    assert [(t.from_account, t.note) for t in result.transfers] == [("0000011", "rent")]
+    assert [index for index, _ in result.failures] == [1]
+    assert [t.transaction_type for t in transactions.history("0000012")] == ["TRANSFER_IN"]
+    assert len(transactions.history("HIST10")) == 10
+
+
+def test_create_schema_refuses_a_database_it_did_not_create(tmp_path, monkeypatch):
+    from benchmarks.database import configure, create_schema
+
+    path = tmp_path / "app.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE Customers (customer_id INTEGER PRIMARY KEY)")
+    monkeypatch.setenv("DB_BACKEND", "sqlite")
+    monkeypatch.setenv("DB_SQLITE_PATH", str(path))
+    configure(str(path))
+    try:
+        with pytest.raises(ValueError):
+            create_schema()
+    finally:
+        reset_engine()
@@ -0,0 +1,153 @@
+import json
+import time
+import pytest
+from infra.write_behind import WriteBehindBuffer
+
+
+class FakeTable:
+    """
+    Stand-in for OverDraftEventDAO.insert_events: `insert` appends every record, `replay` skips records
+    whose id is already stored. `fail` makes the next call raise.
+    """
+
+    def __init__(self):
+        self.rows: list[dict] = []
+        self.calls: list[list[dict]] = []
+        self.fail = 0
+
+    def insert(self, records):
+        self.calls.append(list(records))
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        self.rows += records
+
+    def replay(self, records):
+        self.calls.append(list(records))
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unavailable")
+        stored = {row["id"] for row in self.rows}
+        self.rows += [record for record in records if record["id"] not in stored]
+
+
+@pytest.fixture
+def table():
+    return FakeTable()
+
+
+@pytest.fixture
+def open_buffer(tmp_path, table):
+    buffers = []
+
+    def open_buffer(**kwargs):
+        # Large limits so the background thread never flushes on its own; tests flush explicitly.
+        buffer = WriteBehindBuffer(
+            "events",
+            flush=table.insert,
+            replay=table.replay,
+            encode=dict,
+            decode=dict,
+            spill_dir=tmp_path,
+            **{"max_events": 1000, "max_delay": 60, "fsync": False, **kwargs},
+        )
+        buffers.append(buffer)
+        return buffer
+
+    yield open_buffer
+    for buffer in buffers:
+        buffer.close()
+
+
+def _spilled(tmp_path) -> dict[str, list[dict]]:
+    return {
+        path.name: [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+        for path in sorted(tmp_path.glob("events-*.jsonl"))
+    }
+
+
+def test_flush_writes_batch_and_drops_its_segment(tmp_path, table, open_buffer):
+    buffer = open_buffer()
+    for i in range(3):
+        buffer.add({"id": i})
+    assert _spilled(tmp_path) == {"events-00000001.jsonl": [{"id": 0}, {"id": 1}, {"id": 2}]}
+    assert buffer.flush() == 3
+    assert table.rows == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert _spilled(tmp_path) == {"events-00000002.jsonl": []}
+    assert buffer.stats()["pending"] == 0
+
+
+def test_failed_flush_keeps_records_and_segment(tmp_path, table, open_buffer):
+    buffer = open_buffer()
+    buffer.add({"id": 0})
+    buffer.add({"id": 1})
+    table.fail = 1
+    assert buffer.flush() == 0
+    assert table.rows == []
+    assert _spilled(tmp_path)["events-00000001.jsonl"] == [{"id": 0}, {"id": 1}]
+    stats = buffer.stats()
+    assert (stats["pending"], stats["failures"], stats["last_error"]) == (2, 1, "database unavailable")
+
+    buffer.add({"id": 2})
+    assert buffer.flush() == 3
+    assert table.calls[-1] == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert table.rows == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert _spilled(tmp_path) == {"events-00000003.jsonl": []}
+
+
+def test_records_still_failing_at_close_stay_on_disk(tmp_path, table, open_buffer):
+    buffer = open_buffer()
+    buffer.add({"id": 0})
+    table.fail = 1
+    buffer.close()
+    assert table.rows == []
+    assert [record for records in _spilled(tmp_path).values() for record in records] == [{"id": 0}]
+    with pytest.raises(RuntimeError, match="closed"):
+        buffer.add({"id": 1})
+
+
+def test_crash_between_commit_and_delete_replays_without_duplicates(tmp_path, table, open_buffer):
+    crashed = open_buffer()
+    crashed._unlink = lambda paths: None  # the process dies after the commit, before deleting the segment
+    for i in range(3):
+        crashed.add({"id": i})
+    crashed.flush()
+    crashed.add({"id": 3})  # acknowledged, never written
+    table.fail = 1
+    crashed.close()
+    assert table.rows == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+    buffer = open_buffer()
+    assert buffer.stats()["recovered"] == 4
+    assert buffer.flush() == 4
+    assert table.calls[-1] == [{"id": 0}, {"id": 1}, {"id": 2}, {"id": 3}]
+    assert table.rows == [{"id": 0}, {"id": 1}, {"id": 2}, {"id": 3}]
+    assert _spilled(tmp_path) == {"events-00000003.jsonl": []}
+    assert buffer.stats()["flushes"]["replay"] == 1
+
+
+def test_failed_replay_keeps_recovered_segments(tmp_path, table, open_buffer):
+    crashed = open_buffer()
+    crashed.add({"id": 0})
+    table.fail = 1
+    crashed.close()
+
+    buffer = open_buffer()
+    table.fail = 1
+    assert buffer.flush() == 0
+    assert "events-00000001.jsonl" in _spilled(tmp_path)
+    assert buffer.stats()["pending"] == 1
+    assert buffer.flush() == 1
+    assert table.rows == [{"id": 0}]
+    assert list(_spilled(tmp_path)) == ["events-00000002.jsonl"]
+
+
+def test_background_flush_when_max_events_reached(table, open_buffer):
+    buffer = open_buffer(max_events=2)
+    buffer.add({"id": 0})
+    buffer.add({"id": 1})
+    for _ in range(500):
+        if buffer.stats()["flushes"]["size"]:
+            break
+        time.sleep(0.01)
+    assert table.rows == [{"id": 0}, {"id": 1}]